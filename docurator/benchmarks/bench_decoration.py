@@ -0,0 +1,172 @@
+"""Microbenchmarks of the per-decoration cost of `document_me`.
+
+In doc mode the cost per decorated function, classmethod, class and method
+is reported for capturing the object, building the documentation tree, and
+materializing the signatures and parents which are computed on first access.
+In production mode the decorator is compared to an identity function.
+
+Every cost is held to a budget, several times the cost measured on a
+development machine, so regressions in the order of magnitude are caught
+without failing on noisy machines. The benchmark exits with status 1 if a
+cost is over its budget. The behaviour is checked by `tests/test_decoration.py`.
+"""
+import logging
+import sys
+import types
+from typing import Callable
+
+from common import best_time, load_module, module_source
+
+import docurator as docurator_module
+from docurator import decorator_factory
+
+MEMBERS = 10_000
+CALLS = 1_000_000
+
+# The budgets in seconds per decorated object, by stage.
+CAPTURE_BUDGET = 10e-6
+FINALIZE_BUDGET = 50e-6
+MATERIALIZE_BUDGET = 500e-6
+# Production decoration may cost this many identity function calls.
+PRODUCTION_RATIO = 3
+
+
+def members_by_kind(module: types.ModuleType) -> dict[str, list[Callable]]:
+    """The members of a module grouped by the kind of object decorated.
+
+    Args:
+        module (ModuleType): A module created from `module_source`.
+
+    Returns:
+        dict[str, list[Callable]]: The members by kind, in decoration order.
+    """
+    functions = [
+        obj for name, obj in vars(module).items() if name.startswith('function_')
+    ]
+    classes = [
+        obj for name, obj in vars(module).items() if name.startswith('Class')
+    ]
+    methods = [
+        method for class_ in classes
+        for name, method in vars(class_).items() if name.startswith('method_')
+    ]
+    return {
+        'function': functions,
+        'classmethod': [classmethod(method) for method in methods],
+        'class': classes,
+        'method': methods,
+    }
+
+
+def decorate(document_me: Callable, members: list[Callable]) -> None:
+    """Decorates the members with an empty docurator."""
+    docurator_module.docurator.clear()
+    for member in members:
+        document_me(member)
+
+
+def finalize(document_me: Callable, members: list[Callable]) -> None:
+    """Decorates the members and builds the documentation tree."""
+    decorate(document_me, members)
+    docurator_module.docurator.finalize()
+
+
+def materialize(document_me: Callable, members: list[Callable]) -> None:
+    """Decorates the members, builds the tree and accesses all lazy fields."""
+    finalize(document_me, members)
+    for module_docs in docurator_module.docurator.docs.values():
+        for doc in module_docs.contents:
+            doc.f_signature
+            getattr(doc, 'parents', None)
+    for methods in docurator_module.docurator.unattached_methods.values():
+        for doc in methods:
+            doc.f_signature
+
+
+def identity(func: Callable) -> Callable:
+    """Returns the function, the least a decorator can do."""
+    return func
+
+
+def bench_doc_mode() -> list[str]:
+    """Prints the cost per decoration by kind in doc mode.
+
+    Returns:
+        list[str]: The costs over their budget.
+    """
+    document_me = decorator_factory('doc')
+    module = load_module(
+        'bench_decoration', module_source(MEMBERS, MEMBERS // 10, 10)
+    )
+    stages = (
+        (decorate, CAPTURE_BUDGET),
+        (finalize, FINALIZE_BUDGET),
+        (materialize, MATERIALIZE_BUDGET),
+    )
+    over_budget = []
+    print(f'{"doc mode":<12} {"capture":>10} {"finalize":>10} {"materialize":>12}')
+    for kind, members in members_by_kind(module).items():
+        timings = [
+            best_time(lambda stage=stage: stage(document_me, members)) / len(members)
+            for stage, _ in stages
+        ]
+        print(
+            f'{kind:<12}'
+            + ''.join(
+                f' {timing * 1e6:>{width}.2f}us'
+                for timing, width in zip(timings, (8, 8, 10))
+            )
+        )
+        over_budget.extend(
+            f'{stage.__name__} {kind}: {timing * 1e6:.2f}us, '
+            f'budget {budget * 1e6:.0f}us'
+            for timing, (stage, budget) in zip(timings, stages) if timing > budget
+        )
+    docurator_module.docurator.clear()
+    return over_budget
+
+
+def bench_production_mode() -> list[str]:
+    """Prints the cost per decoration in production mode.
+
+    Returns:
+        list[str]: The cost if it is over its budget.
+    """
+    document_me = decorator_factory('production')
+
+    def call(decorator: Callable) -> Callable[[], None]:
+        def run() -> None:
+            for _ in range(CALLS):
+                decorator(identity)
+        return run
+
+    production = best_time(call(document_me)) / CALLS
+    baseline = best_time(call(identity)) / CALLS
+    print(
+        f'{"production":<12} {production * 1e9:>8.1f}ns '
+        f'(identity {baseline * 1e9:.1f}ns)'
+    )
+    if production > PRODUCTION_RATIO * baseline:
+        return [
+            f'production: {production / baseline:.1f} identity calls, '
+            f'budget {PRODUCTION_RATIO}'
+        ]
+    return []
+
+
+def main() -> int:
+    """Runs the microbenchmarks.
+
+    Returns:
+        int: The exit status, 1 if a cost is over its budget.
+    """
+    # Methods are decorated without their class, silence the warnings.
+    logging.disable(logging.WARNING)
+    over_budget = bench_doc_mode() + bench_production_mode()
+    for cost in over_budget:
+        print(f'Over budget: {cost}', file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
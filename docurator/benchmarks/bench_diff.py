@@ -0,0 +1,76 @@
+"""Benchmark diffing the documented API of two large registries.
+
+Collects a synthetic package of 50k members with the 'ast' engine, then
+changes a few modules: a docstring, a signature, an added and a removed
+member, an added and a removed module. Times diffing the registries with
+cold and warm hashes, and diffing their snapshot files.
+"""
+import os
+import tempfile
+import time
+from typing import Callable
+
+from synthetic import PackageSpec, generate_package
+
+from api_diff import diff_docs, diff_snapshots, format_change
+from ast_collector import collect_module
+from docurator import docurator
+from module_traverser import invoke_modules, walk_modules
+from snapshot import load_snapshot, write_snapshot
+
+SPEC = PackageSpec(modules=1250)
+EDITS = (
+    ('Line 1 describing', 'Line 1 now describing'),
+    ('def method_0(self, x: int)', 'def method_0(self, x: float)'),
+    ('@document_me\ndef function_0(', 'def function_0('),
+)
+
+
+def edit_module(path: str, old: str, new: str) -> None:
+    """Replaces the first occurrence of text in a source file."""
+    with open(path) as file:
+        source = file.read()
+    assert old in source, old
+    with open(path, 'w') as file:
+        file.write(source.replace(old, new, 1))
+
+
+def timed(label: str, func: Callable[[], object]) -> object:
+    """Runs func once and prints its wall time."""
+    start = time.perf_counter()
+    result = func()
+    print(f'{label:>24} {(time.perf_counter() - start) * 1e3:>9.1f} ms')
+    return result
+
+
+def main() -> None:
+    """Runs the benchmark and prints the changes found."""
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        invoke_modules(root, 'ast')
+        old = dict(docurator.docs)
+        old_path = os.path.join(root, 'old.snapshot')
+        write_snapshot(old_path, old.values())
+        print(f'{len(old)} modules, {SPEC.members} members')
+
+        modules = [mod for mod in walk_modules(root) if not mod.is_package]
+        new = dict(old)
+        for mod, (old_text, new_text) in zip(modules, EDITS):
+            edit_module(mod.path, old_text, new_text)
+            new[mod.name] = collect_module(mod.name, mod.path)
+        removed = modules[-1].name
+        new[f'{removed}_renamed'] = new.pop(removed)
+        new_path = os.path.join(root, 'new.snapshot')
+        write_snapshot(new_path, new.values())
+
+        cold_old = load_snapshot(old_path)
+        cold_new = load_snapshot(new_path)
+        timed('registries, cold hashes', lambda: diff_docs(cold_old, cold_new))
+        changes = timed('registries, warm hashes', lambda: diff_docs(old, new))
+        timed('snapshots', lambda: diff_snapshots(old_path, new_path))
+        for change in changes:
+            print(format_change(change))
+
+
+if __name__ == '__main__':
+    main()
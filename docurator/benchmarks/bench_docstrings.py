@@ -0,0 +1,121 @@
+"""Benchmark parsing docstrings into sections.
+
+Parses the docstrings of `test_src` and synthetic docstrings in the Google,
+NumPy and reST styles, with an empty cache and with the cache warmed by a
+previous pass. The synthetic docstrings repeat, like the docstrings shared
+by inherited and overridden methods.
+"""
+import os
+
+from common import PACKAGE_DIR, best_time
+
+from ast_collector import collect_module
+from docstring_sections import parse_sections
+from module_traverser import walk_modules
+
+DOCSTRINGS = 20_000
+DISTINCT = 2_000
+TEST_SRC = os.path.join(os.path.dirname(PACKAGE_DIR), 'test_src')
+
+GOOGLE = '''Summary {i}.
+
+Description of docstring {i}.
+
+Args:
+    a (int): The first value.
+    b (str, optional): The second value. Defaults to "b".
+
+Returns:
+    int: The result.
+
+Raises:
+    ValueError: If a is negative.
+'''
+NUMPY = '''Summary {i}.
+
+Description of docstring {i}.
+
+Parameters
+----------
+a : int
+    The first value.
+b : str, optional
+    The second value.
+
+Returns
+-------
+int
+    The result.
+
+Raises
+------
+ValueError
+    If a is negative.
+'''
+REST = '''Summary {i}.
+
+Description of docstring {i}.
+
+:param int a: The first value.
+:param str b: The second value.
+:returns: The result.
+:rtype: int
+:raises ValueError: If a is negative.
+'''
+
+
+def test_src_docstrings() -> list[str]:
+    """The docstrings of the documented members of `test_src`."""
+    docstrings = []
+
+    def collect(docs: object) -> None:
+        if docs.docstring:
+            docstrings.append(docs.docstring)
+        for child in getattr(docs, 'contents', ()):
+            collect(child)
+
+    for module in walk_modules(TEST_SRC):
+        module_docs = collect_module(module.name, module.path)
+        if module_docs is not None:
+            collect(module_docs)
+    return docstrings
+
+
+def parse_all(docstrings: list[str], style: str = 'auto') -> None:
+    """Parses every docstring, using the cache."""
+    for docstring in docstrings:
+        parse_sections(docstring, style)
+
+
+def report(label: str, docstrings: list[str], style: str = 'auto') -> None:
+    """Prints the parse throughput with a cold and a warm cache."""
+    def cold() -> None:
+        parse_sections.cache_clear()
+        parse_all(docstrings, style)
+
+    cold_time = best_time(cold, repeat=3)
+    warm_time = best_time(lambda: parse_all(docstrings, style))
+    info = parse_sections.cache_info()
+    print(
+        f'{label:>10} {len(docstrings):>7} docstrings '
+        f'{len(docstrings) / cold_time:>10.0f}/s cold '
+        f'{len(docstrings) / warm_time:>10.0f}/s warm '
+        f'{info.currsize:>5} cached'
+    )
+
+
+def main() -> None:
+    """Runs the benchmark and prints the docstrings parsed per second."""
+    report('test_src', test_src_docstrings())
+    for label, style, template in (
+        ('google', 'google', GOOGLE),
+        ('numpy', 'numpy', NUMPY),
+        ('rest', 'rest', REST),
+        ('auto', 'auto', GOOGLE),
+    ):
+        docstrings = [template.format(i=i % DISTINCT) for i in range(DOCSTRINGS)]
+        report(label, docstrings, style)
+
+
+if __name__ == '__main__':
+    main()
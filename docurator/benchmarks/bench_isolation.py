@@ -0,0 +1,88 @@
+"""Benchmark collecting a package with faulty modules in a worker pool.
+
+Generates a synthetic package, adds modules which hang, exit, raise and
+crash the interpreter, and collects it in an isolated `WorkerPool`. The
+documentation of every other module must equal the documentation collected
+in this process, and every faulty module must be reported. The pool is then
+reused to collect the package again after a docstring changed, which must
+be reflected without starting new workers.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import PackageSpec, generate_package
+
+from docurator import docurator
+from module_traverser import ModuleFilter, invoke_modules, walk_modules
+from serialization import docs_to_dict
+from worker_pool import CRASH, ERROR, TIMEOUT, WorkerPool
+
+SPEC = PackageSpec(modules=200)
+WORKERS = 2
+TIMEOUT_SECONDS = 1.0
+FAULTY = {
+    'hangs': ('import time\ntime.sleep(1000)\n', TIMEOUT),
+    'exits': ('import sys\nsys.exit(3)\n', ERROR),
+    'raises': ('raise RuntimeError("boom")\n', ERROR),
+    'crashes': ('import os\nos._exit(7)\n', CRASH),
+}
+
+
+def snapshot() -> dict[str, dict]:
+    """The documentation in the registry as plain data, by module name."""
+    return {name: docs_to_dict(docs) for name, docs in docurator.docs.items()}
+
+
+def main() -> None:
+    """Runs the benchmark and fails if any documentation or report differs."""
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        sys.path.insert(0, root)
+        package = os.path.join(root, SPEC.name)
+        for name, (source, _) in FAULTY.items():
+            with open(os.path.join(package, f'{name}.py'), 'w') as file:
+                file.write(source)
+        skip = tuple(f'*.{name}' for name in FAULTY)
+        faulty = tuple(f'.{name}' for name in FAULTY)
+
+        # Faulty modules would hang or end this process.
+        start = time.perf_counter()
+        invoke_modules(root, 'import', module_filter=ModuleFilter(exclude=skip))
+        print(f'in process        {time.perf_counter() - start:>6.2f}s')
+        expected = snapshot()
+
+        with WorkerPool(WORKERS, TIMEOUT_SECONDS) as pool:
+            # Workers import the modules for the first time.
+            docurator.clear()
+            report = invoke_modules(root, 'import', pool=pool)
+            print(f'pool, cold        {report.seconds:>6.2f}s')
+            print(report.summary())
+            reasons = {
+                failure.name.rpartition('.')[2]: failure.reason
+                for failure in report.failures
+            }
+            assert reasons == {name: reason for name, (_, reason) in FAULTY.items()}
+            assert snapshot() == expected
+
+            edited = next(
+                mod for mod in walk_modules(root)
+                if not mod.is_package and not mod.name.endswith(faulty)
+            )
+            with open(edited.path) as file:
+                source = file.read()
+            with open(edited.path, 'w') as file:
+                file.write(source.replace('Line 1 describing', 'Line 1 now describing'))
+            docurator.clear()
+            modules = [
+                mod for mod in walk_modules(root) if not mod.name.endswith(faulty)
+            ]
+            report = pool.collect(modules)
+            print(f'pool, warm        {report.seconds:>6.2f}s')
+            assert not report.failures
+            assert 'now describing' in str(snapshot()[edited.name])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark the memory used by a registry of documentation containers.
+
+Reports the memory allocated while building and materializing the tree
+for a large module, and the figures from `Docurator.memory_report`.
+"""
+import gc
+import tracemalloc
+
+from common import decoration_order, load_module, module_source
+
+from docurator import Docurator
+
+MEMBERS = 20_000
+METHODS_PER_CLASS = 9
+
+
+def main() -> None:
+    """Runs the benchmark and prints the memory used per member."""
+    classes = MEMBERS // (METHODS_PER_CLASS + 2)
+    functions = MEMBERS - classes * (METHODS_PER_CLASS + 1)
+    module = load_module(
+        'bench_memory', module_source(functions, classes, METHODS_PER_CLASS)
+    )
+    members = decoration_order(module)
+
+    gc.collect()
+    tracemalloc.start()
+    docurator = Docurator()
+    for member in members:
+        docurator.add(member)
+    docurator.finalize()
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{len(members)} members')
+    print(f'{"allocated":>10} {allocated / len(members):>8.1f} bytes/member')
+
+    if hasattr(docurator, 'memory_report'):
+        report = docurator.memory_report()
+        assert sum(report.kinds.values()) == report.total
+        assert sum(report.modules.values()) == report.total
+        print(f'{"reported":>10} {report.total / len(members):>8.1f} bytes/member')
+        for kind, size in report.kinds.items():
+            print(f'{kind:>10} {size:>10} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark documenting a monorepo of many source roots in one process.
+
+Generates a monorepo whose projects each have their own source root, all
+contributing a subpackage to the namespace package `company`. The roots
+are walked together with the monorepo directory itself, which overlaps
+every one of them. Every module must be found once, by the dotted name it
+imports as. Times the walk and collecting the monorepo with both engines.
+"""
+import os
+import tempfile
+import time
+
+from synthetic import PackageSpec, generate_package
+
+from docurator import docurator
+from module_traverser import invoke_modules, walk_modules
+
+PROJECTS = 24
+SPEC = PackageSpec(modules=50, depth=1)
+
+
+def main() -> None:
+    """Runs the benchmark and fails if a module is missing or found twice."""
+    with tempfile.TemporaryDirectory() as monorepo:
+        roots = []
+        expected = set()
+        for i in range(PROJECTS):
+            root = os.path.join(monorepo, 'libs', f'project_{i}', 'src')
+            spec = PackageSpec(
+                name=f'company.project_{i}', modules=SPEC.modules, depth=SPEC.depth
+            )
+            expected.update(generate_package(root, spec))
+            roots.append(root)
+        # The monorepo directory overlaps every root.
+        roots.append(monorepo)
+
+        start = time.perf_counter()
+        modules = list(walk_modules(roots))
+        walk_seconds = time.perf_counter() - start
+        names = [mod.name for mod in modules]
+        paths = [mod.path for mod in modules if mod.path is not None]
+        assert len(names) == len(set(names)), 'a module was found twice'
+        assert len(paths) == len(set(paths)), 'a file was found twice'
+        assert {mod.name for mod in modules if not mod.is_package} == expected
+        print(
+            f'{len(roots)} roots, {len(modules)} modules walked '
+            f'in {walk_seconds * 1e3:.1f} ms'
+        )
+
+        for engine in ('ast', 'import'):
+            docurator.clear()
+            start = time.perf_counter()
+            invoke_modules(roots, engine)
+            seconds = time.perf_counter() - start
+            documented = {
+                name for name in docurator.docs if name.startswith('company.')
+            }
+            assert expected <= documented, sorted(expected - documented)[:5]
+            print(f'{engine:>6} collected {len(documented)} modules in {seconds:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
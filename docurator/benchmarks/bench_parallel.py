@@ -0,0 +1,61 @@
+"""Benchmark collecting a package serially and across worker processes.
+
+Every configuration runs in a fresh interpreter, so no module is already
+imported and the docurator starts empty.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from common import module_source, write_package
+
+MODULES = 200
+WORKERS = (None, 2, 4, 8)
+ENGINES = ('import', 'ast')
+
+
+def collect(root: str, engine: str, workers: int|None) -> tuple[float, int]:
+    """Collects the package at root in this process.
+
+    Returns:
+        tuple[float, int]: The wall time in seconds and the number of modules.
+    """
+    sys.path.insert(0, root)
+    from docurator import docurator
+    from module_traverser import invoke_modules
+
+    start = time.perf_counter()
+    invoke_modules(root, engine, workers=workers)
+    return time.perf_counter() - start, len(docurator.docs)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the speedup against the serial path."""
+    context = multiprocessing.get_context('spawn')
+    source = module_source(20, 10, 8, decorated=True)
+    with tempfile.TemporaryDirectory() as root:
+        write_package(root, 'bench_parallel', MODULES, source)
+        print(f'{MODULES} modules, {os.cpu_count()} cpus')
+        print(
+            f'{"engine":>6} {"workers":>7} {"modules":>7} '
+            f'{"seconds":>8} {"speedup":>7}'
+        )
+        for engine in ENGINES:
+            serial = None
+            for workers in WORKERS:
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    seconds, modules = executor.submit(
+                        collect, root, engine, workers
+                    ).result()
+                serial = serial or seconds
+                print(
+                    f'{engine:>6} {workers or 1:>7} {modules:>7} {seconds:>8.3f} '
+                    f'{serial / seconds:>6.2f}x'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark registering documented members with the Docurator.
+
+Registration time per member should stay flat as the number of
+documented members in a module grows.
+"""
+from typing import Callable
+
+from common import best_time, decoration_order, load_module, module_source
+
+from docurator import Docurator
+
+SIZES = (1_000, 2_000, 4_000, 8_000)
+METHODS_PER_CLASS = 9
+
+
+def register(members: list[Callable]) -> None:
+    """Registers the members with a fresh Docurator and builds the tree."""
+    docurator = Docurator()
+    for member in members:
+        docurator.add(member)
+    docurator.finalize()
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time per registered member."""
+    print(f'{"members":>8} {"total ms":>10} {"us/member":>10}')
+    for size in SIZES:
+        classes = size // (METHODS_PER_CLASS + 2)
+        functions = size - classes * (METHODS_PER_CLASS + 1)
+        module = load_module(
+            f'bench_registration_{size}',
+            module_source(functions, classes, METHODS_PER_CLASS),
+        )
+        members = decoration_order(module)
+        seconds = best_time(lambda: register(members))
+        print(
+            f'{len(members):>8} {seconds * 1e3:>10.2f} '
+            f'{seconds / len(members) * 1e6:>10.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
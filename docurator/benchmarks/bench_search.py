@@ -0,0 +1,56 @@
+"""Benchmark building, updating and querying the search index.
+
+Indexes a synthetic package collected with the 'ast' engine, then times
+an incremental update after one module changed, loading the index file
+and answering queries from it.
+"""
+import os
+import tempfile
+import time
+
+from common import best_time
+from synthetic import PackageSpec, generate_package
+
+from docurator import docurator
+from module_traverser import invoke_modules
+from search_index import SearchIndex
+
+SPEC = PackageSpec(modules=200)
+QUERIES = ('function', 'method detail', 'cla', 'describing member', 'missing')
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time of every step."""
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        invoke_modules(root, 'ast')
+        docs = docurator.docs
+        path = os.path.join(root, 'search_index.json')
+        print(f'{len(docs)} modules, {SPEC.members} members')
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.update(docs.values())
+        print(f'{"build":>18} {(time.perf_counter() - start) * 1e3:>9.1f} ms')
+        index.save(path)
+        print(f'{"size":>18} {os.path.getsize(path) / 1024:>9.0f} KiB')
+
+        start = time.perf_counter()
+        index.update(docs.values())
+        print(f'{"update unchanged":>18} {(time.perf_counter() - start) * 1e3:>9.1f} ms') # noqa: E501
+        changed = next(iter(docs.values()))
+        index.remove(changed.name)
+        start = time.perf_counter()
+        index.update(docs.values())
+        print(f'{"update one":>18} {(time.perf_counter() - start) * 1e3:>9.1f} ms')
+
+        load = best_time(lambda: SearchIndex.load(path))
+        print(f'{"load":>18} {load * 1e3:>9.1f} ms')
+        index = SearchIndex.load(path)
+        for query in QUERIES:
+            seconds = best_time(lambda: index.search(query))
+            print(f'{query!r:>18} {seconds * 1e3:>9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark loading documentation from a snapshot against collecting it.
+
+Collects a package with both engines in a fresh interpreter, then loads the
+same documentation from a snapshot: all modules, and a single module.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from common import module_source, write_package
+
+MODULES = 200
+ENGINES = ('import', 'ast')
+
+
+def collect(root: str, engine: str, snapshot_path: str) -> tuple[float, int]:
+    """Collects the package at root in this process and exports a snapshot.
+
+    Returns:
+        tuple[float, int]: The wall time in seconds and the number of modules.
+    """
+    sys.path.insert(0, root)
+    from docurator import docurator
+    from module_traverser import invoke_modules
+
+    start = time.perf_counter()
+    invoke_modules(root, engine)
+    seconds = time.perf_counter() - start
+    docurator.export_snapshot(snapshot_path)
+    return seconds, len(docurator.docs)
+
+
+def load(snapshot_path: str, name: str|None) -> tuple[float, int]:
+    """Loads all modules, or one module, from a snapshot in this process.
+
+    Returns:
+        tuple[float, int]: The wall time in seconds and the number of modules.
+    """
+    from docurator import docurator
+
+    start = time.perf_counter()
+    docurator.load_snapshot(snapshot_path, None if name is None else [name])
+    return time.perf_counter() - start, len(docurator.docs)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the speedup against the fastest collection."""
+    context = multiprocessing.get_context('spawn')
+    source = module_source(20, 10, 8, decorated=True)
+    with tempfile.TemporaryDirectory() as root:
+        write_package(root, 'bench_snapshot', MODULES, source)
+        snapshot_path = os.path.join(root, 'docs.snapshot')
+        print(f'{MODULES} modules')
+        print(f'{"step":>14} {"modules":>7} {"seconds":>8} {"speedup":>7}')
+        fastest = None
+        for engine in ENGINES:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                collected, modules = executor.submit(
+                    collect, root, engine, snapshot_path
+                ).result()
+            print(f'{"collect " + engine:>14} {modules:>7} {collected:>8.3f}')
+            fastest = min(fastest or collected, collected)
+
+        print(f'{"snapshot size":>14} {os.path.getsize(snapshot_path):>7} bytes')
+        for step, name in (
+            ('load all', None),
+            ('load one', f'bench_snapshot.module_{MODULES // 2}'),
+        ):
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                seconds, modules = executor.submit(
+                    load, snapshot_path, name
+                ).result()
+            print(
+                f'{step:>14} {modules:>7} {seconds:>8.3f} '
+                f'{fastest / seconds:>6.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
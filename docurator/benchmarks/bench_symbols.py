@@ -0,0 +1,65 @@
+"""Benchmark resolving references with the symbol index.
+
+Resolution time per reference should stay flat as the number of documented
+symbols grows. Every module documents the same names, so the short names are
+resolved through the referencing module.
+"""
+from common import best_time
+
+from doc_containers import ClassDocs, ModuleDocs, ObjectDocs
+from symbol_index import SymbolIndex
+
+SIZES = (10, 100, 1_000)
+FUNCTIONS = 20
+CLASSES = 10
+METHODS = 9
+REFERENCES = 100_000
+
+
+def registry(modules: int) -> dict[str, ModuleDocs]:
+    """Documentation of modules which all document the same names."""
+    docs = {}
+    for m in range(modules):
+        module_docs = ModuleDocs(f'package.module_{m}', None)
+        for i in range(FUNCTIONS):
+            module_docs.add(ObjectDocs(f'function_{i}', None, f'function_{i}', 'function')) # noqa: E501
+        for i in range(CLASSES):
+            class_docs = ClassDocs(f'Class{i}', None, f'Class{i}', 'type')
+            for j in range(METHODS):
+                class_docs.add(ObjectDocs(
+                    f'method_{j}', None, f'Class{i}.method_{j}', 'function'
+                ))
+            module_docs.add(class_docs)
+        docs[module_docs.name] = module_docs
+    return docs
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time per resolved reference."""
+    print(f'{"symbols":>8} {"build ms":>10} {"ns/reference":>13}')
+    for size in SIZES:
+        docs = registry(size)
+        build = best_time(lambda: SymbolIndex(docs), repeat=3)
+        index = SymbolIndex(docs)
+        references = [
+            (f'package.module_{i % size}.Class{i % CLASSES}', None)
+            if i % 3 == 0 else
+            (f'Class{i % CLASSES}.method_{i % METHODS}', f'package.module_{i % size}')
+            if i % 3 == 1 else
+            (f'function_{i % FUNCTIONS}', f'package.module_{i % size}')
+            for i in range(REFERENCES)
+        ]
+
+        def resolve_all() -> None:
+            for reference, module in references:
+                assert index.resolve(reference, module) is not None
+
+        seconds = best_time(resolve_all)
+        print(
+            f'{len(index.symbols):>8} {build * 1e3:>10.2f} '
+            f'{seconds / REFERENCES * 1e9:>13.0f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark rendering several audiences from one collection pass.
+
+Collects a synthetic package once, then projects and renders it through
+several views, timing the projection and the render of every view against
+the collection.
+"""
+import os
+import tempfile
+import time
+
+from synthetic import PackageSpec, generate_package
+
+from content_parser import write_docs
+from docurator import docurator
+from module_traverser import invoke_modules
+from views import View
+
+SPEC = PackageSpec(modules=200)
+VIEWS = (
+    View('maintainers'),
+    View('users', public_only=True, kinds=('class', 'function')),
+    View('methods', kinds=('class', 'method')),
+)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time of every step."""
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        start = time.perf_counter()
+        invoke_modules(root, 'ast')
+        docs = docurator.docs
+        collected = time.perf_counter() - start
+        print(f'{len(docs)} modules, {SPEC.members} members')
+        print(f'{"collect":>12} {collected * 1e3:>9.1f} ms')
+
+        for view in VIEWS:
+            start = time.perf_counter()
+            projected = view.project(docs)
+            projection = time.perf_counter() - start
+            start = time.perf_counter()
+            write_docs(projected, os.path.join(root, 'docs', view.name))
+            render = time.perf_counter() - start
+            print(
+                f'{view.name:>12} {projection * 1e3:>9.1f} ms projection '
+                f'{render * 1e3:>9.1f} ms render'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark the latency of watch mode, from saving a file to updated docs.
+
+Builds the documentation of a synthetic package, then edits the docstrings
+of a module while a watcher runs, timing how long it takes until the edit
+appears in the Markdown file of the module. Every engine runs in a fresh
+interpreter.
+"""
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from synthetic import PackageSpec, generate_package
+
+SPEC = PackageSpec(modules=200)
+ENGINES = ('ast', 'import')
+EDITS = 10
+TIMEOUT = 5.0
+
+
+def measure(root: str, engine: str) -> list[float]:
+    """Edits a module while watching the package, in this process.
+
+    Returns:
+        list[float]: The seconds from saving every edit to the updated docs.
+    """
+    sys.path.insert(0, root)
+    from module_traverser import invoke_modules
+    from watch import Watcher
+
+    target = os.path.join(root, f'docs_{engine}')
+    invoke_modules(root, engine)
+    watcher = Watcher(root, target, engine)
+    watcher.build()
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.watch, args=(stop,))
+    thread.start()
+
+    name = f'{SPEC.name}.module_0'
+    source_path = os.path.join(root, SPEC.name, 'module_0.py')
+    docs_path = os.path.join(target, f'{name}.md')
+    with open(source_path) as file:
+        source = file.read()
+    latencies = []
+    try:
+        for edit in range(EDITS):
+            marker = f'edit {engine} {edit}'
+            with open(source_path, 'w') as file:
+                file.write(source.replace('describing', marker, 1))
+            saved = time.perf_counter()
+            modified = os.stat(docs_path).st_mtime_ns
+            while os.stat(docs_path).st_mtime_ns == modified:
+                if time.perf_counter() - saved > TIMEOUT:
+                    raise TimeoutError(f'{marker!r} not rendered')
+                time.sleep(0.005)
+            latencies.append(time.perf_counter() - saved)
+            with open(docs_path) as file:
+                assert marker in file.read(), marker
+            # Let the watcher finish updating the search index.
+            time.sleep(0.5)
+    finally:
+        stop.set()
+        thread.join()
+    return latencies
+
+
+def main() -> None:
+    """Runs the benchmark and prints the latencies per engine."""
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        print(f'{SPEC.modules} modules, {SPEC.members} members')
+        print(f'{"engine":>8} {"median ms":>10} {"max ms":>8}')
+        for engine in ENGINES:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                latencies = executor.submit(measure, root, engine).result()
+            print(
+                f'{engine:>8} {statistics.median(latencies) * 1e3:>10.0f} '
+                f'{max(latencies) * 1e3:>8.0f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Shared helpers for the docurator benchmarks.
+
+The benchmarks are plain scripts run from the project directory,
+e.g. `python benchmarks/bench_registration.py`. Importing this module
+makes the flat docurator modules importable.
+
+Functions:
+    module_source(functions: int, classes: int, methods: int): Creates the source
+        of a module with the given number of members.
+    load_module(name: str, source: str): Executes source as a registered module.
+    decoration_order(module: ModuleType): The members of a module in the order
+        `document_me` registers them.
+    write_package(directory: str, name: str, modules: int, source: str): Writes
+        a package of identical modules to disk.
+    best_time(func: Callable, repeat: int): The best wall time of several runs.
+""" # noqa: E501
+import inspect
+import os
+import sys
+import time
+import types
+from typing import Callable
+
+PACKAGE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'docurator')
+)
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+
+def module_source(
+        functions: int,
+        classes: int,
+        methods: int,
+        decorated: bool = False,
+        docstring_lines: int = 1
+    ) -> str:
+    """Creates the source of a module with the given number of members.
+
+    Args:
+        functions (int): The number of module level functions.
+        classes (int): The number of classes.
+        methods (int): The number of methods per class.
+        decorated (bool): Decorate all members with `document_me` if True.
+        docstring_lines (int): The number of lines in every docstring.
+
+    Returns:
+        str: The source of the module.
+    """
+    decorator = ['@document_me'] if decorated else []
+
+    def docstring(summary: str, indent: str) -> list[str]:
+        body = [
+            f'{indent}Line {line} describing the member in more detail.'
+            for line in range(1, docstring_lines)
+        ]
+        if not body:
+            return [f'{indent}"""{summary}"""']
+        return [f'{indent}"""{summary}', '', *body, f'{indent}"""']
+
+    lines = ['"""Synthetic benchmark module."""']
+    if decorated:
+        lines.append('from docurator import document_me')
+    for i in range(functions):
+        lines.extend([
+            *decorator,
+            f'def function_{i}(a: int, b: str = "b") -> int:',
+            *docstring(f'Function {i}.', '    '),
+            '    return a',
+        ])
+    for i in range(classes):
+        lines.extend([
+            *decorator,
+            f'class Class{i}:',
+            *docstring(f'Class {i}.', '    '),
+        ])
+        for j in range(methods):
+            lines.extend([
+                *(f'    {line}' for line in decorator),
+                f'    def method_{j}(self, x: int) -> int:',
+                *docstring(f'Method {j}.', '        '),
+                '        return x',
+            ])
+    return '\n'.join(lines) + '\n'
+
+
+def load_module(name: str, source: str) -> types.ModuleType:
+    """Executes source as a module registered in `sys.modules`.
+
+    Args:
+        name (str): The name of the module.
+        source (str): The source of the module.
+
+    Returns:
+        ModuleType: The executed module.
+    """
+    module = types.ModuleType(name)
+    sys.modules[name] = module
+    exec(compile(source, f'<{name}>', 'exec'), module.__dict__)
+    return module
+
+
+def decoration_order(module: types.ModuleType) -> list[Callable]:
+    """The members of a module in the order `document_me` registers them.
+
+    Methods are decorated before the class containing them.
+
+    Args:
+        module (ModuleType): The module to get the members of.
+
+    Returns:
+        list[Callable]: The functions, methods and classes of the module.
+    """
+    members = []
+    for _, obj in inspect.getmembers(module):
+        if inspect.isfunction(obj):
+            members.append(obj)
+        elif inspect.isclass(obj):
+            members.extend(
+                method for _, method in inspect.getmembers(obj, inspect.isfunction)
+            )
+            members.append(obj)
+    return members
+
+
+def write_package(directory: str, name: str, modules: int, source: str) -> str:
+    """Writes a package of identical modules to disk.
+
+    Args:
+        directory (str): The directory to create the package in.
+        name (str): The name of the package.
+        modules (int): The number of modules in the package.
+        source (str): The source of every module.
+
+    Returns:
+        str: The path of the package.
+    """
+    package = os.path.join(directory, name)
+    os.makedirs(package, exist_ok=True)
+    with open(os.path.join(package, '__init__.py'), 'w') as file:
+        file.write('"""Synthetic benchmark package."""\n')
+    for i in range(modules):
+        with open(os.path.join(package, f'module_{i}.py'), 'w') as file:
+            file.write(source)
+    return package
+
+
+def best_time(func: Callable[[], object], repeat: int = 5) -> float:
+    """The best wall time of several runs of a function.
+
+    Args:
+        func (Callable): The function to time.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The best wall time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
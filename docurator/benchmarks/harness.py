@@ -0,0 +1,127 @@
+"""End to end benchmark harness on synthetic packages.
+
+Generates a synthetic package, then times and memory profiles each stage of
+a documentation build in a fresh interpreter:
+
+    traversal: `invoke_modules` walking and importing or parsing the package.
+    registration: `Docurator.finalize` building the documentation tree.
+    rendering: `write_docs` writing the Markdown files.
+
+The results are written as JSON, so runs can be compared over time.
+
+Usage:
+    python benchmarks/harness.py --modules 500 --depth 3 --output results.json
+"""
+import argparse
+import dataclasses
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from synthetic import PackageSpec, generate_package
+
+SCHEMA_VERSION = 1
+
+
+def measure(stage: Callable[[], object]) -> dict[str, float]:
+    """Times a stage and measures the peak memory allocated during it.
+
+    Args:
+        stage (Callable): The stage to run.
+
+    Returns:
+        dict[str, float]: The wall time, cpu time and peak allocated bytes.
+    """
+    tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    stage()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'wall_seconds': wall, 'cpu_seconds': cpu, 'peak_bytes': peak}
+
+
+def run_stages(root: str, engine: str, workers: int|None) -> dict[str, Any]:
+    """Runs the stages of a documentation build on the package at root.
+
+    Meant to run in a fresh interpreter, with nothing imported or collected.
+    """
+    sys.path.insert(0, root)
+    from content_parser import write_docs
+    from docurator import docurator
+    from module_traverser import invoke_modules
+
+    with tempfile.TemporaryDirectory() as target:
+        stages = {
+            'traversal': measure(
+                lambda: invoke_modules(root, engine, workers=workers)
+            ),
+            'registration': measure(docurator.finalize),
+            'rendering': measure(lambda: write_docs(docurator.docs, target)),
+        }
+    return {
+        'stages': stages,
+        'collected_modules': len(docurator.docs),
+        'registry_bytes': docurator.memory_report().total,
+    }
+
+
+def main() -> None:
+    """Runs the harness with the configuration from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for field in dataclasses.fields(PackageSpec):
+        parser.add_argument(
+            f'--{field.name.replace("_", "-")}',
+            type=type(field.default),
+            default=field.default,
+        )
+    parser.add_argument('--engine', choices=('import', 'ast'), default='import')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', help='The JSON file to write, stdout if not given.') # noqa: E501
+    args = parser.parse_args()
+    spec = PackageSpec(**{
+        field.name: getattr(args, field.name)
+        for field in dataclasses.fields(PackageSpec)
+    })
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, spec)
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            results = executor.submit(
+                run_stages, root, args.engine, args.workers
+            ).result()
+
+    report = {
+        'schema_version': SCHEMA_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'config': {
+            'package': dataclasses.asdict(spec),
+            'members': spec.members,
+            'engine': args.engine,
+            'workers': args.workers,
+        },
+        **results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Generate synthetic packages of configurable size.
+
+The generated packages contain modules whose functions, classes and methods
+are all decorated with `document_me`, spread over a tree of subpackages.
+
+Classes:
+    PackageSpec: The shape of a synthetic package.
+
+Functions:
+    generate_package(directory: str, spec: PackageSpec): Writes a synthetic
+        package to disk.
+"""
+import os
+from dataclasses import dataclass
+
+from common import module_source
+
+
+@dataclass(frozen=True)
+class PackageSpec:
+    """The shape of a synthetic package.
+
+    Attributes:
+        name (str): The name of the top level package.
+        modules (int): The number of modules, spread over all packages.
+        depth (int): The number of subpackage levels below the top level package.
+        branching (int): The number of subpackages within each package.
+        functions (int): The number of functions per module.
+        classes (int): The number of classes per module.
+        methods (int): The number of methods per class.
+        docstring_lines (int): The number of lines in every docstring.
+    """ # noqa: E501
+    name: str = 'generated_package'
+    modules: int = 100
+    depth: int = 2
+    branching: int = 2
+    functions: int = 10
+    classes: int = 5
+    methods: int = 5
+    docstring_lines: int = 5
+
+    @property
+    def members(self) -> int:
+        """The number of documented members in the package."""
+        per_module = self.functions + self.classes * (self.methods + 1)
+        return self.modules * per_module
+
+
+def generate_package(directory: str, spec: PackageSpec) -> list[str]:
+    """Writes a synthetic package to disk.
+
+    Args:
+        directory (str): The directory to create the package in,
+            which should be on `sys.path` when importing it.
+        spec (PackageSpec): The shape of the package.
+
+    Returns:
+        list[str]: The dotted names of the modules, without the packages.
+    """
+    packages = [[spec.name]]
+    for _ in range(spec.depth):
+        packages.append([
+            f'{parent}.sub_{i}'
+            for parent in packages[-1] for i in range(spec.branching)
+        ])
+    packages = [package for level in packages for package in level]
+
+    for package in packages:
+        package_dir = os.path.join(directory, *package.split('.'))
+        os.makedirs(package_dir, exist_ok=True)
+        with open(os.path.join(package_dir, '__init__.py'), 'w') as file:
+            file.write(f'"""Synthetic package {package}."""\n')
+
+    source = module_source(
+        spec.functions,
+        spec.classes,
+        spec.methods,
+        decorated=True,
+        docstring_lines=spec.docstring_lines,
+    )
+    names = []
+    for i in range(spec.modules):
+        package = packages[i % len(packages)]
+        path = os.path.join(directory, *package.split('.'), f'module_{i}.py')
+        with open(path, 'w') as file:
+            file.write(source)
+        names.append(f'{package}.module_{i}')
+    return names
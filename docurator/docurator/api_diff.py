@@ -0,0 +1,174 @@
+"""Compare the documented API of two registries or snapshots.
+
+Entries are compared by their content hashes. Modules and classes whose
+content hashes are equal are skipped with a single comparison, only subtrees
+which differ are walked. Snapshots store the content hash of every module in
+their header, so unchanged modules are not even loaded.
+
+An entry is changed when its own hash differs, i.e. its signature, docstring
+or parents, or its kind. Changes within a class or module are reported for
+the entries within it, not for the container.
+
+Classes:
+    ApiChange: An added, removed or changed documented entry.
+
+Functions:
+    diff_docs(old: Mapping[str, ModuleDocs], new: Mapping[str, ModuleDocs]): Compares
+        the documentation of two registries.
+    diff_snapshots(old_path: str, new_path: str): Compares two snapshot files.
+    format_change(change: ApiChange): Formats a change as a line of text.
+""" # noqa: E501
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+from doc_containers import ClassDocs, Docs, DocsContainer, ModuleDocs, parent_name
+from snapshot import Snapshot
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+_MARKERS = {ADDED: '+', REMOVED: '-', CHANGED: '~'}
+
+
+@dataclass(frozen=True)
+class ApiChange:
+    """An added, removed or changed documented entry.
+
+    Attributes:
+        name (str): The fully qualified name of the entry.
+        change (str): 'added', 'removed' or 'changed'.
+        kind (str): 'module', 'class' or 'object', the new kind if it changed.
+        fields (tuple[str, ...]): The fields of a changed entry which differ:
+            'kind', 'signature', 'docstring' or 'parents'.
+    """
+    name: str
+    change: str
+    kind: str
+    fields: tuple[str, ...] = ()
+
+
+def diff_docs(
+        old: Mapping[str, ModuleDocs],
+        new: Mapping[str, ModuleDocs]
+    ) -> list[ApiChange]:
+    """Compares the documentation of two registries.
+
+    Args:
+        old (Mapping[str, ModuleDocs]): The old documentation by module name,
+            e.g. `Docurator.docs` or a loaded snapshot.
+        new (Mapping[str, ModuleDocs]): The new documentation by module name.
+
+    Returns:
+        list[ApiChange]: The changes, sorted by module, then by name within it.
+    """
+    changes = []
+    # Every subtree is hashed once, not again for each of its ancestors.
+    hashes = {}
+    for name in sorted(old.keys() | new.keys()):
+        _diff_entry(name, old.get(name), new.get(name), changes, hashes)
+    return changes
+
+
+def diff_snapshots(old_path: str, new_path: str) -> list[ApiChange]:
+    """Compares two snapshot files, loading only the modules which differ.
+
+    Args:
+        old_path (str): The path of the old snapshot file.
+        new_path (str): The path of the new snapshot file.
+
+    Returns:
+        list[ApiChange]: The changes, sorted by module, then by name within it.
+
+    Raises:
+        ValueError: If a file is not a snapshot this version can read.
+    """
+    changes = []
+    hashes = {}
+    with Snapshot(old_path) as old, Snapshot(new_path) as new:
+        for name in sorted(set(old.modules) | set(new.modules)):
+            if name not in new:
+                changes.append(ApiChange(name, REMOVED, 'module'))
+            elif name not in old:
+                changes.append(ApiChange(name, ADDED, 'module'))
+            else:
+                old_hash = old.content_hash(name)
+                if old_hash is not None and old_hash == new.content_hash(name):
+                    continue
+                _diff_entry(name, old.load(name), new.load(name), changes, hashes)
+    return changes
+
+
+def format_change(change: ApiChange) -> str:
+    """Formats a change as a line of text.
+
+    Args:
+        change (ApiChange): The change.
+
+    Returns:
+        str: A marker, '+', '-' or '~', the kind and name of the entry,
+            and the fields which changed.
+    """
+    line = f'{_MARKERS[change.change]} {change.kind} {change.name}'
+    if change.fields:
+        line = f'{line} ({", ".join(change.fields)})'
+    return line
+
+
+def _diff_entry(
+        name: str,
+        old: Docs|None,
+        new: Docs|None,
+        changes: list[ApiChange],
+        hashes: dict[int, str]
+    ) -> None:
+    if old is None:
+        changes.append(ApiChange(name, ADDED, _kind(new)))
+        return
+    if new is None:
+        changes.append(ApiChange(name, REMOVED, _kind(old)))
+        return
+    # Equal subtrees are skipped without looking into them.
+    if old._content_hash(hashes) == new._content_hash(hashes):
+        return
+    if old.own_hash != new.own_hash:
+        old_fields, new_fields = _fields(old), _fields(new)
+        changes.append(ApiChange(name, CHANGED, _kind(new), tuple(
+            field for field in new_fields
+            if old_fields[field] != new_fields[field]
+        )))
+
+    old_contents = _contents(old)
+    new_contents = _contents(new)
+    for child in sorted(old_contents.keys() | new_contents.keys()):
+        _diff_entry(
+            f'{name}.{child}',
+            old_contents.get(child),
+            new_contents.get(child),
+            changes,
+            hashes,
+        )
+
+
+def _contents(doc: Docs) -> dict[str, Docs]:
+    if not isinstance(doc, DocsContainer):
+        return {}
+    return {child.name: child for child in doc.contents}
+
+
+def _kind(doc: Docs) -> str:
+    if isinstance(doc, ModuleDocs):
+        return 'module'
+    return 'class' if isinstance(doc, ClassDocs) else 'object'
+
+
+def _fields(doc: Docs) -> dict[str, str|None]:
+    signature = getattr(doc, 'f_signature', None)
+    parents = getattr(doc, 'parents', None)
+    return {
+        'kind': _kind(doc),
+        'signature': None if signature is None else str(signature),
+        'docstring': doc.docstring,
+        'parents': None if parents is None else ', '.join(map(parent_name, parents)),
+    }
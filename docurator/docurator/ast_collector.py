@@ -0,0 +1,267 @@
+"""Collect documentation from source files without importing them.
+
+This module provides an alternative to importing modules for triggering the
+`document_me` decorators. The source of a module is parsed with `ast`, and the
+decorated functions, classes and methods are turned into the same documentation
+containers as the import based collection produces.
+
+As nothing is executed, values which only exist at runtime are rebuilt from the
+source text. Annotations, default values and parent classes are stored as
+`SourceText`, which displays exactly as written in the source.
+
+Classes:
+    SourceText: A string which represents itself as the source it was read from.
+
+Functions:
+    collect_module(name: str, path: str): Parses a source file and returns
+        the documentation of its decorated objects.
+    collect_tree(name: str, tree: ast.Module): Returns the documentation of
+        the decorated objects in an already parsed module.
+""" # noqa: E501
+from __future__ import annotations
+
+import ast
+import inspect
+from typing import Iterable
+
+from doc_containers import ClassDocs, ModuleDocs, ObjectDocs
+
+DECORATOR_NAME = 'document_me'
+
+FunctionNode = ast.FunctionDef | ast.AsyncFunctionDef
+
+
+class SourceText(str):
+    """A string which represents itself as the source it was read from.
+
+    `inspect.Signature` displays annotations and defaults through `repr`,
+    which would add quotes around plain strings.
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        """Represent the source text without quotes."""
+        return str(self)
+
+
+def collect_module(name: str, path: str) -> ModuleDocs|None:
+    """Parses a source file and returns the documentation of its decorated objects.
+
+    Args:
+        name (str): The dotted name of the module.
+        path (str): The path of the module source file.
+
+    Returns:
+        ModuleDocs|None: The documentation of the module,
+            None if the module contains no decorated objects.
+    """ # noqa: E501
+    with open(path, 'rb') as source:
+        tree = ast.parse(source.read(), filename=path)
+    return collect_tree(name, tree)
+
+
+def collect_tree(name: str, tree: ast.Module) -> ModuleDocs|None:
+    """Returns the documentation of the decorated objects in a parsed module.
+
+    Args:
+        name (str): The dotted name of the module.
+        tree (ast.Module): The parsed source of the module.
+
+    Returns:
+        ModuleDocs|None: The documentation of the module,
+            None if the module contains no decorated objects.
+    """
+    module_docs = ModuleDocs(name, ast.get_docstring(tree, clean=False))
+    collector = _ModuleCollector(tree)
+    collector.collect(tree.body, '', module_docs)
+    if not collector.found:
+        return None
+    return module_docs
+
+
+class _ModuleCollector:
+    """Walks the body of a parsed module and collects decorated objects."""
+    def __init__(self, tree: ast.Module) -> None:
+        self.found = False
+        self.__decorator_names = {DECORATOR_NAME}
+        self.__stringified = False
+        for node in tree.body:
+            if not isinstance(node, ast.ImportFrom):
+                continue
+            for alias in node.names:
+                if node.module == '__future__' and alias.name == 'annotations':
+                    self.__stringified = True
+                elif alias.name == DECORATOR_NAME and alias.asname:
+                    self.__decorator_names.add(alias.asname)
+
+    def collect(
+            self,
+            body: Iterable[ast.stmt],
+            prefix: str,
+            container: ModuleDocs|ClassDocs|None
+        ) -> None:
+        """Collects the decorated objects in a module or class body.
+
+        Children of undocumented classes are visited, but not stored,
+        the same way the import based collection can not attach them.
+        """
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                qualname = f'{prefix}{node.name}'
+                doc = None
+                if self.__is_decorated(node):
+                    self.found = True
+                    doc = self.__create_class_doc(node, qualname)
+                    if container is not None:
+                        container.add(doc)
+                self.collect(node.body, f'{qualname}.', doc)
+            elif isinstance(node, FunctionNode) and self.__is_decorated(node):
+                self.found = True
+                if container is not None:
+                    container.add(self.__create_function_doc(node, prefix))
+
+    def __is_decorated(self, node: ast.ClassDef|FunctionNode) -> bool:
+        return any(
+            self.__decorator_name(decorator) in self.__decorator_names
+            for decorator in node.decorator_list
+        )
+
+    @staticmethod
+    def __decorator_name(decorator: ast.expr) -> str|None:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Name):
+            return decorator.id
+        if isinstance(decorator, ast.Attribute):
+            return decorator.attr
+        return None
+
+    def __create_function_doc(self, node: FunctionNode, prefix: str) -> ObjectDocs: # noqa: E501
+        # Decorators below `document_me` are applied first, classmethods
+        # are unwrapped by the docurator while staticmethods are not.
+        inner = node.decorator_list[self.__decorator_index(node) + 1:]
+        is_static = any(
+            self.__decorator_name(decorator) == 'staticmethod'
+            for decorator in inner
+        )
+        return ObjectDocs(
+            name=node.name,
+            docstring=ast.get_docstring(node, clean=False),
+            qualname=f'{prefix}{node.name}',
+            type='staticmethod' if is_static else 'function',
+            f_signature=self.__create_signature(node.args, node.returns),
+            tags=self.__tags(node),
+        )
+
+    def __create_class_doc(self, node: ast.ClassDef, qualname: str) -> ClassDocs:
+        metaclass = next(
+            (kw.value for kw in node.keywords if kw.arg == 'metaclass'), None
+        )
+        parents = [
+            SourceText(ast.unparse(base)) for base in node.bases
+            if ast.unparse(base) != 'object'
+        ]
+        return ClassDocs(
+            name=node.name,
+            docstring=ast.get_docstring(node, clean=False),
+            qualname=qualname,
+            type='type' if metaclass is None else self.__last_name(metaclass),
+            f_signature=self.__create_class_signature(node),
+            parents=parents or None,
+            tags=self.__tags(node),
+        )
+
+    def __decorator_index(self, node: ast.ClassDef|FunctionNode) -> int:
+        for index, decorator in enumerate(node.decorator_list):
+            if self.__decorator_name(decorator) in self.__decorator_names:
+                return index
+        return -1
+
+    def __tags(self, node: ast.ClassDef|FunctionNode) -> list[str]:
+        # Tags are the string arguments of `document_me(...)`, other
+        # arguments can not be known without running the module.
+        decorator = node.decorator_list[self.__decorator_index(node)]
+        if not isinstance(decorator, ast.Call):
+            return []
+        return [
+            arg.value for arg in decorator.args
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+        ]
+
+    @staticmethod
+    def __last_name(node: ast.expr) -> str:
+        return ast.unparse(node).split('.')[-1]
+
+    def __create_class_signature(self, node: ast.ClassDef) -> inspect.Signature:
+        # A class is called through __init__, or __new__ if only that exists.
+        constructors = {
+            child.name: child for child in node.body
+            if isinstance(child, FunctionNode)
+            and child.name in ('__init__', '__new__')
+        }
+        constructor = constructors.get('__init__', constructors.get('__new__'))
+        if constructor is None:
+            return inspect.Signature()
+        signature = self.__create_signature(constructor.args, constructor.returns)
+        parameters = list(signature.parameters.values())[1:]
+        return signature.replace(parameters=parameters)
+
+    def __create_signature(
+            self,
+            arguments: ast.arguments,
+            returns: ast.expr|None
+        ) -> inspect.Signature:
+        parameter = inspect.Parameter
+        positional = [
+            *((arg, parameter.POSITIONAL_ONLY) for arg in arguments.posonlyargs),
+            *((arg, parameter.POSITIONAL_OR_KEYWORD) for arg in arguments.args),
+        ]
+        # Defaults belong to the last positional arguments.
+        defaults = [None] * (len(positional) - len(arguments.defaults))
+        defaults.extend(arguments.defaults)
+
+        parameters = [
+            self.__create_parameter(arg, kind, default)
+            for (arg, kind), default in zip(positional, defaults)
+        ]
+        if arguments.vararg is not None:
+            parameters.append(self.__create_parameter(
+                arguments.vararg, parameter.VAR_POSITIONAL, None
+            ))
+        parameters.extend(
+            self.__create_parameter(arg, parameter.KEYWORD_ONLY, default)
+            for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+        )
+        if arguments.kwarg is not None:
+            parameters.append(self.__create_parameter(
+                arguments.kwarg, parameter.VAR_KEYWORD, None
+            ))
+        return inspect.Signature(
+            parameters,
+            return_annotation=self.__annotation(returns),
+        )
+
+    def __create_parameter(
+            self,
+            arg: ast.arg,
+            kind: inspect._ParameterKind,
+            default: ast.expr|None
+        ) -> inspect.Parameter:
+        return inspect.Parameter(
+            arg.arg,
+            kind,
+            default=(
+                inspect.Parameter.empty if default is None
+                else SourceText(ast.unparse(default))
+            ),
+            annotation=self.__annotation(arg.annotation),
+        )
+
+    def __annotation(self, node: ast.expr|None) -> object:
+        if node is None:
+            return inspect.Signature.empty
+        source = ast.unparse(node)
+        # Postponed annotations are kept as strings by the interpreter.
+        if self.__stringified:
+            return source
+        return SourceText(source)
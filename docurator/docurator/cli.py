@@ -0,0 +1,399 @@
+"""Command line interface of the docurator.
+
+Commands:
+    build: Collects the documentation of a source tree, renders it to Markdown
+        and updates the search index next to it.
+    search: Queries the search index of rendered documentation, without
+        collecting the documentation again.
+    watch: Builds the documentation, then rebuilds it for modules whose
+        source changed until interrupted.
+    diff: Reports the documented API added, removed or changed between two
+        snapshots written by `build --snapshot`.
+    serve: Collects the documentation once and answers queries about it over
+        HTTP on localhost, refreshing changed modules when asked to.
+    coverage: Reports the public callables of a source tree which are not
+        documented, fails below a threshold when used as a pre-commit check.
+
+Usage:
+    python cli.py build src docs --engine ast
+    python cli.py build libs/a/src libs/b/src docs
+    python cli.py watch src docs --engine ast
+    python cli.py diff v1.snapshot v2.snapshot
+    python cli.py serve src --engine ast --port 8765
+    python cli.py coverage src --fail-under 80
+    python cli.py search docs "render module"
+""" # noqa: E501
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from search_index import INDEX_FILENAME, SearchIndex
+
+if TYPE_CHECKING:
+    from module_traverser import ModuleFilter
+    from worker_pool import WorkerPool
+
+
+def build(args: argparse.Namespace) -> int:
+    """Collects, renders and indexes the documentation of a source tree.
+
+    Args:
+        args (argparse.Namespace): The parsed `build` arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    # Collecting imports every module, only needed when building.
+    from content_parser import write_docs
+    from docurator import docurator
+    from search_index import write_search_index
+
+    with open_pool(args) as pool:
+        collect(args, pool)
+    docs = docurator.docs
+    for path in write_docs(docs, args.target):
+        print(path)
+    indexed = write_search_index(docs, args.target)
+    print(f'Indexed {len(indexed)} changed modules.')
+    if args.snapshot is not None:
+        docurator.export_snapshot(args.snapshot)
+        print(f'Wrote snapshot {args.snapshot}')
+    return 0
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Builds the documentation and rebuilds it while the source changes.
+
+    When isolated, changed modules are collected in the same worker pool.
+
+    Args:
+        args (argparse.Namespace): The parsed `watch` arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    from watch import Watcher
+
+    # Unset timings keep the defaults of the watcher.
+    timings = {
+        name: value
+        for name, value in (('interval', args.interval), ('debounce', args.debounce))
+        if value is not None
+    }
+    with open_pool(args) as pool:
+        module_filter = collect(args, pool)
+        watcher = Watcher(
+            args.source, args.target, args.engine, module_filter,
+            pool=pool, **timings
+        )
+        for path in watcher.build():
+            print(path)
+        print(f'Watching {", ".join(watcher.roots)}, press Ctrl+C to stop.')
+        try:
+            watcher.watch()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Serves the documentation of a source tree until interrupted.
+
+    When isolated, changed modules are refreshed in the same worker pool.
+
+    Args:
+        args (argparse.Namespace): The parsed `serve` arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    from server import DocServer, DocService
+
+    with open_pool(args) as pool:
+        module_filter = collect(args, pool)
+        service = DocService(args.source, args.engine, module_filter, pool)
+        service.load()
+        with DocServer(service, args.host, args.port) as server:
+            print(f'Serving {len(service.modules())} modules on {server.url}')
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+
+def open_pool(
+        args: argparse.Namespace
+    ) -> 'WorkerPool|contextlib.nullcontext[None]':
+    """The worker pool isolated modules are collected in.
+
+    Args:
+        args (argparse.Namespace): Arguments added by `add_collect_arguments`.
+
+    Returns:
+        WorkerPool|contextlib.nullcontext[None]: The pool to enter, a context
+            entering as None unless `--isolated` or `--timeout` was given.
+    """
+    if not args.isolated and args.timeout is None:
+        return contextlib.nullcontext()
+
+    from worker_pool import DEFAULT_TIMEOUT, WorkerPool
+
+    timeout = DEFAULT_TIMEOUT if args.timeout is None else args.timeout
+    return WorkerPool(args.workers, timeout)
+
+
+def collect(
+        args: argparse.Namespace,
+        pool: 'WorkerPool|None' = None
+    ) -> 'ModuleFilter':
+    """Collects the documentation of the source tree into the registry.
+
+    Args:
+        args (argparse.Namespace): Arguments added by `add_collect_arguments`.
+        pool (WorkerPool|None): Collects the modules in isolated workers,
+            see `open_pool`, in this process if None.
+
+    Returns:
+        ModuleFilter: The filter the modules were selected by.
+    """
+    from module_traverser import invoke_modules
+
+    module_filter = parse_filter(args)
+    if pool is None:
+        invoke_modules(
+            args.source, args.engine, args.cache_dir, args.workers,
+            module_filter=module_filter,
+        )
+        return module_filter
+
+    report = invoke_modules(
+        args.source, args.engine, args.cache_dir,
+        module_filter=module_filter, pool=pool,
+    )
+    print(report.summary(), file=sys.stderr)
+    return module_filter
+
+
+def parse_filter(args: argparse.Namespace) -> 'ModuleFilter':
+    """The module filter selected by the filter arguments.
+
+    Args:
+        args (argparse.Namespace): Arguments added by `add_filter_arguments`.
+
+    Returns:
+        ModuleFilter: The filter selecting the modules.
+    """
+    from module_traverser import ModuleFilter
+
+    return ModuleFilter(tuple(args.include), tuple(args.exclude), args.max_depth)
+
+
+def coverage(args: argparse.Namespace) -> int:
+    """Reports the public callables which are not documented.
+
+    Args:
+        args (argparse.Namespace): The parsed `coverage` arguments.
+
+    Returns:
+        int: The exit status, 1 if the coverage is below `--fail-under`.
+    """
+    from doc_coverage import analyze_coverage
+
+    start = time.perf_counter()
+    report = analyze_coverage(args.source, args.engine, parse_filter(args))
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps(report.report(), indent=2))
+    else:
+        print(report.summary(list_undocumented=not args.quiet))
+    print(
+        f'{report.percent:.1f}% of {report.public} public callables documented '
+        f'in {elapsed * 1e3:.1f} ms',
+        file=sys.stderr,
+    )
+    if args.fail_under is not None and report.percent < args.fail_under:
+        return 1
+    return 0
+
+
+def diff(args: argparse.Namespace) -> int:
+    """Prints the documented API which changed between two snapshots.
+
+    Args:
+        args (argparse.Namespace): The parsed `diff` arguments.
+
+    Returns:
+        int: The exit status, 1 if the API changed.
+    """
+    from api_diff import diff_snapshots, format_change
+
+    start = time.perf_counter()
+    changes = diff_snapshots(args.old, args.new)
+    elapsed = time.perf_counter() - start
+    for change in changes:
+        print(format_change(change))
+    print(f'{len(changes)} changes in {elapsed * 1e3:.1f} ms', file=sys.stderr)
+    return 1 if changes else 0
+
+
+def search(args: argparse.Namespace) -> int:
+    """Prints the documentation matching a query.
+
+    Args:
+        args (argparse.Namespace): The parsed `search` arguments.
+
+    Returns:
+        int: The exit status, 1 if nothing matched.
+    """
+    path = args.index
+    if os.path.isdir(path):
+        path = os.path.join(path, INDEX_FILENAME)
+    start = time.perf_counter()
+    results = SearchIndex.load(path).search(args.query, args.limit)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        summary = f'  {result.summary}' if result.summary else ''
+        print(f'{result.score:>6.1f}  {result.name}{summary}')
+    print(f'{len(results)} results in {elapsed * 1e3:.1f} ms', file=sys.stderr)
+    return 0 if results else 1
+
+
+def parser() -> argparse.ArgumentParser:
+    """The argument parser of the command line interface."""
+    root = argparse.ArgumentParser(prog='docurator', description=__doc__.splitlines()[0]) # noqa: E501
+    root.add_argument('-v', '--verbose', action='store_true', help='Log progress.')
+    commands = root.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help=build.__doc__.splitlines()[0])
+    add_collect_arguments(build_parser, target=True)
+    build_parser.add_argument(
+        '--snapshot', help='Also write a snapshot of the documentation, to diff.'
+    )
+    build_parser.set_defaults(func=build)
+
+    watch_parser = commands.add_parser('watch', help=watch.__doc__.splitlines()[0])
+    add_collect_arguments(watch_parser, target=True)
+    watch_parser.add_argument(
+        '--interval', type=float,
+        help='The seconds between polls of the source, 0.1 by default.',
+    )
+    watch_parser.add_argument(
+        '--debounce', type=float,
+        help='The seconds no file may change before rebuilding, 0.1 by default.',
+    )
+    watch_parser.set_defaults(func=watch)
+
+    diff_parser = commands.add_parser('diff', help=diff.__doc__.splitlines()[0])
+    diff_parser.add_argument('old', help='The snapshot of the old documentation.')
+    diff_parser.add_argument('new', help='The snapshot of the new documentation.')
+    diff_parser.set_defaults(func=diff)
+
+    serve_parser = commands.add_parser('serve', help=serve.__doc__.splitlines()[0])
+    add_collect_arguments(serve_parser)
+    serve_parser.add_argument(
+        '--host', default='127.0.0.1', help='The address to listen on.'
+    )
+    serve_parser.add_argument(
+        '--port', type=int, default=8765, help='The port to listen on.'
+    )
+    serve_parser.set_defaults(func=serve)
+
+    coverage_parser = commands.add_parser(
+        'coverage', help=coverage.__doc__.splitlines()[0]
+    )
+    coverage_parser.add_argument(
+        'source', nargs='+', help='The root directories of the modules to analyze.'
+    )
+    coverage_parser.add_argument('--engine', choices=('import', 'ast'), default='ast')
+    add_filter_arguments(coverage_parser)
+    coverage_parser.add_argument(
+        '--fail-under', type=float, metavar='PERCENT',
+        help='Exit with status 1 if less of the public callables are documented.',
+    )
+    coverage_parser.add_argument(
+        '--json', action='store_true', help='Print the report as JSON.'
+    )
+    coverage_parser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help='Do not list the undocumented callables.',
+    )
+    coverage_parser.set_defaults(func=coverage)
+
+    search_parser = commands.add_parser('search', help=search.__doc__.splitlines()[0])
+    search_parser.add_argument('index', help='The search index, or the docs directory.') # noqa: E501
+    search_parser.add_argument('query', help='The words to search for.')
+    search_parser.add_argument('--limit', type=int, default=10)
+    search_parser.set_defaults(func=search)
+    return root
+
+
+def add_collect_arguments(
+        command: argparse.ArgumentParser,
+        target: bool = False
+    ) -> None:
+    """Adds the arguments selecting and collecting the modules to document.
+
+    Args:
+        command (argparse.ArgumentParser): The parser of a command.
+        target (bool): Also adds the directory the docs are written to.
+    """
+    command.add_argument(
+        'source', nargs='+', help='The root directories of the modules to document.'
+    )
+    if target:
+        command.add_argument('target', help='The directory to write the docs to.')
+    command.add_argument('--engine', choices=('import', 'ast'), default='import')
+    command.add_argument('--cache-dir', help='Cache documentation per module.')
+    command.add_argument('--workers', type=int, help='Collect in parallel.')
+    command.add_argument(
+        '--isolated', action='store_true',
+        help='Import every module in a worker process which may fail, hang or crash.',
+    )
+    command.add_argument(
+        '--timeout', type=float, metavar='SECONDS',
+        help='The time an isolated module may take, 60 by default. Implies --isolated.',
+    )
+    add_filter_arguments(command)
+
+
+def add_filter_arguments(command: argparse.ArgumentParser) -> None:
+    """Adds the arguments selecting the modules, see `parse_filter`.
+
+    Args:
+        command (argparse.ArgumentParser): The parser of a command.
+    """
+    command.add_argument(
+        '--include', action='append', default=[], metavar='PATTERN',
+        help='Only collect modules whose name or path matches, glob or re:regex.',
+    )
+    command.add_argument(
+        '--exclude', action='append', default=[], metavar='PATTERN',
+        help='Skip modules and whole packages whose name or path matches.',
+    )
+    command.add_argument(
+        '--max-depth', type=int, help='The deepest package level to collect.'
+    )
+
+
+def main(argv: list[str]|None = None) -> int:
+    """Runs the command line interface.
+
+    Args:
+        argv (list[str]|None): The arguments, from `sys.argv` if None.
+
+    Returns:
+        int: The exit status.
+    """
+    args = parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,37 +1,356 @@
-# ruff: noqa
-# This ignores all errors in this file. It is present as this is a work in progress/ test file at the moment.
-# Remove when work on this files implementations are performed.
+"""Render collected documentation to Markdown files.
 
-from module_traverser import invoke_modules
-from docurator import docurator
-from doc_containers import ClassDocs, Docs
+This module renders the documentation in the docurator registry to one
+Markdown file per module. Each module is rendered by a generator and streamed
+to disk, so memory use does not grow with the size of the documentation.
 
-path = 'docurator'
+Files whose rendered contents are unchanged are not rewritten, keeping their
+modification time, so incremental builds of the docs only see changed modules.
+
+Classes, objects and names written as code in docstrings are linked to their
+documentation, resolved through a `SymbolIndex` built once for all modules.
+
+Classes:
+    DocDisplayFormatter: Formats documentation as Markdown lines.
+
+Functions:
+    render_module(module_docs: ModuleDocs, index: SymbolIndex): Yields the Markdown of a module.
+    write_module(module_docs: ModuleDocs, target: str): Writes the Markdown
+        file of a module if its contents changed.
+    write_docs(docs: dict[str, ModuleDocs], target: str): Writes the Markdown
+        files of all modules.
+""" # noqa: E501
+import contextlib
+import hashlib
+import inspect
+import os
+import re
+import sys
+from typing import Iterable, Iterator
+
+from doc_containers import ClassDocs, Docs, ModuleDocs
+from symbol_index import SymbolIndex
+
+MAX_HEADING_LEVEL = 6
+# Names written as code in docstrings, e.g. `Docurator.docs`.
+_CODE_NAME = re.compile(r'`([A-Za-z_][\w.]*)`')
+CHUNK_SIZE = 1 << 16
 
 
 class DocDisplayFormatter:
-    def __init__(self, content: Docs) -> None:
+    """Formats documentation as Markdown lines.
+
+    Every class and object is preceded by an anchor named by its fully
+    qualified name. With a symbol index, referenced names are linked.
+
+    Attributes:
+        content (Docs): The documentation to format.
+        index (SymbolIndex|None): Resolves references to links, None for no links.
+        module (str|None): The dotted name of the module containing the documentation.
+    """ # noqa: E501
+    def __init__(
+            self,
+            content: Docs,
+            index: SymbolIndex|None = None,
+            module: str|None = None
+        ) -> None:
+        """Initializes the formatter with the documentation to format."""
         self.content = content
+        self.index = index
+        self.module = content.name if isinstance(content, ModuleDocs) else module
 
-    
+    def lines(self, level: int = 1) -> Iterator[str]:
+        """Yields the Markdown lines of the documentation and its contents.
 
+        Args:
+            level (int): The heading level of the documentation.
 
-if __name__ == '__main__':
+        Yields:
+            str: The lines, without line endings.
+        """
+        content = self.content
+        heading = '#' * min(level, MAX_HEADING_LEVEL)
+        if isinstance(content, ModuleDocs):
+            yield f'{heading} {content.name}'
+        else:
+            yield f'<a id="{self.module}.{content.qualname}"></a>'
+            yield ''
+            yield f'{heading} {content.qualname}'
+            yield ''
+            yield '```python'
+            yield self.signature_line()
+            yield '```'
+            if self.index is not None:
+                yield from self.reference_lines()
+
+        if content.docstring:
+            yield ''
+            yield from self.docstring_lines()
+
+        if isinstance(content, (ModuleDocs, ClassDocs)):
+            for child in sorted_contents(content.contents):
+                yield ''
+                yield from DocDisplayFormatter(
+                    child, self.index, self.module
+                ).lines(level + 1)
+
+    def reference_lines(self) -> Iterator[str]:
+        """Yields the Markdown lines linking the parents and annotation types.
+
+        Yields:
+            str: The lines, without line endings.
+        """
+        content = self.content
+        parents = []
+        if isinstance(content, ClassDocs) and content.parents:
+            parents = [inspect.formatannotation(p) for p in content.parents]
+            yield ''
+            yield 'Bases: ' + ', '.join(self.link(parent) for parent in parents)
+        links = [
+            self.link(reference) for reference in self.index.references(content)
+            if reference not in parents
+            and self.index.resolve(reference, self.module) is not None
+        ]
+        if links:
+            yield ''
+            yield 'See also: ' + ', '.join(links)
+
+    def link(self, reference: str) -> str:
+        """A reference as a Markdown link to its documentation if it resolves.
+
+        Args:
+            reference (str): The name referenced.
+
+        Returns:
+            str: The link, or the name as code if it does not resolve.
+        """
+        symbol = None
+        if self.index is not None:
+            symbol = self.index.resolve(reference, self.module)
+        if symbol is None:
+            return f'`{reference}`'
+        target = module_filename(symbol.module)
+        if symbol.anchor is not None:
+            target = f'{target}#{symbol.anchor}'
+        return f'[`{reference}`]({target})'
+
+    def docstring_lines(self) -> Iterator[str]:
+        """Yields the Markdown lines of the docstring, section by section.
+
+        The docstring is only parsed here, when it is rendered. Docstrings which
+        can not be parsed are rendered as written. Names written as code in the
+        descriptions are linked if they resolve.
+
+        Yields:
+            str: The lines, without line endings.
+        """ # noqa: E501
+        try:
+            sections = self.content.sections
+        except ValueError:
+            yield inspect.cleandoc(self.content.docstring)
+            return
+
+        descriptions = (sections.short_description, sections.long_description)
+        yield self.__link_code('\n\n'.join(text for text in descriptions if text))
+        if sections.args:
+            yield ''
+            yield '**Args:**'
+            yield ''
+            for arg in sections.args:
+                type_text = f' ({self.link(arg.type_name)})' if arg.type_name else ''
+                description = self.__link_code(arg.description or '')
+                yield f'- `{arg.name}`{type_text}: {description}'
+        if sections.returns is not None:
+            returns = sections.returns
+            yield ''
+            yield '**Yields:**' if returns.is_generator else '**Returns:**'
+            yield ''
+            yield (
+                f'-{self.__type_text(returns.type_name)}: '
+                f'{self.__link_code(returns.description or "")}'
+            )
+        if sections.raises:
+            yield ''
+            yield '**Raises:**'
+            yield ''
+            for raises in sections.raises:
+                yield (
+                    f'-{self.__type_text(raises.type_name)}: '
+                    f'{self.__link_code(raises.description or "")}'
+                )
+        if sections.examples:
+            yield ''
+            yield '**Examples:**'
+        for example in sections.examples:
+            yield ''
+            yield '```python'
+            yield example.code
+            yield '```'
+
+    def signature_line(self) -> str:
+        """The definition of the documented object as it would be written."""
+        content = self.content
+        signature = '' if content.f_signature is None else str(content.f_signature)
+        if isinstance(content, ClassDocs):
+            return f'class {content.name}{signature}'
+        return f'def {content.name}{signature}'
+
+    def __type_text(self, type_name: str|None) -> str:
+        return f' {self.link(type_name)}' if type_name else ''
+
+    def __link_code(self, text: str) -> str:
+        if self.index is None:
+            return text
+        return _CODE_NAME.sub(lambda match: self.link(match.group(1)), text)
+
+
+def sorted_contents(contents: Iterable[Docs]) -> list[Docs]:
+    """Sorts documentation with classes first, then by name.
 
+    Args:
+        contents (Iterable[Docs]): The documentation to sort.
 
+    Returns:
+        list[Docs]: The sorted documentation.
+    """
+    return sorted(
+        contents,
+        key=lambda doc: (not isinstance(doc, ClassDocs), doc.name),
+    )
 
 
-    invoke_modules(path)
-    temp_doc = docurator
+def render_module(
+        module_docs: ModuleDocs,
+        index: SymbolIndex|None = None
+    ) -> Iterator[str]:
+    """Yields the Markdown of a module in chunks.
 
-    print("------\n\n\n")
-    for name, module in temp_doc.docs.items():
-        print(name)
-        module_docs = module.contents
-        for obj in module_docs:
-            print(obj.name)
-            if isinstance(obj, ClassDocs):
-                for method in obj.contents:
-                    print('   - ', method.name)
+    Args:
+        module_docs (ModuleDocs): The documentation of the module.
+        index (SymbolIndex|None): Resolves references to links, None for no links.
 
+    Yields:
+        str: Consecutive chunks of the Markdown file contents.
+    """ # noqa: E501
+    for line in DocDisplayFormatter(module_docs, index).lines():
+        yield f'{line}\n'
+
+
+def module_path(module_name: str, target: str) -> str:
+    """The path of the Markdown file of a module.
+
+    Args:
+        module_name (str): The dotted name of the module.
+        target (str): The directory the documentation is written to.
+
+    Returns:
+        str: The path of the file.
+    """
+    return os.path.join(target, module_filename(module_name))
+
+
+def module_filename(module_name: str) -> str:
+    """The name of the Markdown file of a module, also used to link to it.
+
+    Args:
+        module_name (str): The dotted name of the module.
+
+    Returns:
+        str: The file name.
+    """
+    return f'{module_name}.md'
+
+
+def write_module(
+        module_docs: ModuleDocs,
+        target: str,
+        index: SymbolIndex|None = None
+    ) -> bool:
+    """Writes the Markdown file of a module if its contents changed.
+
+    The rendered Markdown is streamed to a temporary file while hashed,
+    and only replaces the existing file if the hashes differ.
+
+    Args:
+        module_docs (ModuleDocs): The documentation of the module.
+        target (str): The directory to write the documentation to.
+        index (SymbolIndex|None): Resolves references to links, None for no links.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged.
+    """
+    path = module_path(module_docs.name, target)
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    digest = hashlib.sha256()
+    try:
+        with open(temporary_path, 'w', encoding='utf-8', newline='\n') as file:
+            for chunk in render_module(module_docs, index):
+                file.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+
+        if _hash_file(path) == digest.hexdigest():
+            return False
+        os.replace(temporary_path, path)
+        return True
+    finally:
+        # Nothing is left behind if the file is unchanged or rendering fails.
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_path)
+
+
+def write_docs(
+        docs: dict[str, ModuleDocs],
+        target: str,
+        index: SymbolIndex|None = None
+    ) -> list[str]:
+    """Writes the Markdown files of all modules, one file per module.
+
+    Args:
+        docs (dict[str, ModuleDocs]): The documentation by module name,
+            e.g. `Docurator.docs`.
+        target (str): The directory to write the documentation to.
+        index (SymbolIndex|None): Resolves references to links,
+            built from the documentation if None.
+
+    Returns:
+        list[str]: The paths of the files which were written.
+    """
+    if index is None:
+        index = SymbolIndex(docs)
+    os.makedirs(target, exist_ok=True)
+    return [
+        module_path(module_docs.name, target)
+        for module_docs in docs.values()
+        if write_module(module_docs, target, index)
+    ]
+
+
+def _hash_file(path: str) -> str|None:
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as file:
+            while chunk := file.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+if __name__ == '__main__':
+    from docurator import docurator
+    from module_traverser import invoke_modules
 
+    source, target = sys.argv[1:3]
+    invoke_modules(source)
+    index = SymbolIndex(docurator.docs)
+    for path in write_docs(docurator.docs, target, index):
+        print(path)
+    for unresolved in index.unresolved():
+        detail = (
+            f' (ambiguous: {", ".join(unresolved.candidates)})'
+            if unresolved.ambiguous else ''
+        )
+        print(
+            f'Unresolved {unresolved.reference} in {unresolved.location}{detail}',
+            file=sys.stderr,
+        )
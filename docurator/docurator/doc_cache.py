@@ -0,0 +1,210 @@
+"""On disk cache of the documentation collected per module.
+
+Collecting documentation requires importing or parsing every module. This
+module stores the documentation of each module in a cache directory, so
+unchanged modules are loaded from the cache instead of being collected again.
+
+A cache entry is one JSON file per module and collection engine, containing:
+
+    format: The version of the entry layout, see `CACHE_FORMAT`.
+    version: The docurator version which created the entry.
+    engine: The collection engine which created the entry.
+    module: The dotted name of the module.
+    path: The path of the module source.
+    mtime_ns, size: The modification time and size of the source when stored.
+    sha256: The hash of the source contents when stored.
+    docs: The module documentation from `serialization.docs_to_dict`,
+        None if the module contains no documentation.
+
+An entry is valid while the format, version, engine and path match, and the
+source is unchanged. The modification time and size are checked first, so
+the source is only read and hashed when they differ.
+
+The state of the source is read with `source_state` before the module is
+collected, and stored with its documentation. A source edited while the module
+is collected thus invalidates the entry, instead of being cached with the
+documentation of its earlier contents.
+
+Classes:
+    CacheEntry: A valid cache entry for a module.
+    SourceState: The modification time, size and hash of a module source.
+    DocCache: Stores and loads cache entries in a directory.
+
+Functions:
+    source_state(path: str): Reads the state of a module source.
+""" # noqa: E501
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+from doc_containers import ModuleDocs
+from docurator import __version__
+from serialization import docs_from_dict, docs_to_dict
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A valid cache entry for a module.
+
+    Attributes:
+        module_docs (ModuleDocs|None): The documentation of the module,
+            None if the module contains no documentation.
+    """
+    module_docs: ModuleDocs|None
+
+
+@dataclass(frozen=True)
+class SourceState:
+    """The modification time, size and hash of a module source.
+
+    Attributes:
+        mtime_ns (int): The modification time in nanoseconds.
+        size (int): The size in bytes.
+        sha256 (str): The hash of the contents.
+    """
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+class DocCache:
+    """Stores and loads the documentation of modules in a cache directory.
+
+    Attributes:
+        directory (str): The directory containing the cache entries.
+        engine (str): The collection engine the entries are stored for.
+    """
+    def __init__(self, directory: str, engine: str) -> None:
+        """Initializes the cache, creating the directory if it does not exist.
+
+        Args:
+            directory (str): The directory containing the cache entries.
+            engine (str): The collection engine the entries are stored for.
+        """
+        self.directory = os.path.abspath(directory)
+        self.engine = engine
+        os.makedirs(self.directory, exist_ok=True)
+
+    def load(self, name: str, path: str) -> CacheEntry|None:
+        """Loads the cache entry of a module if it is still valid.
+
+        Args:
+            name (str): The dotted name of the module.
+            path (str): The path of the module source.
+
+        Returns:
+            CacheEntry|None: The entry, None if it is missing or outdated.
+        """
+        try:
+            with open(self.entry_path(name, path), encoding='utf-8') as file:
+                entry = json.load(file)
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+
+        expected = {
+            'format': CACHE_FORMAT,
+            'version': __version__,
+            'engine': self.engine,
+            'module': name,
+            'path': os.path.abspath(path),
+        }
+        if any(entry.get(key) != value for key, value in expected.items()):
+            return None
+
+        if (entry['mtime_ns'], entry['size']) != (stat.st_mtime_ns, stat.st_size):
+            try:
+                digest = _hash_file(path)
+            except OSError:
+                return None
+            if digest != entry['sha256']:
+                return None
+            # Unchanged contents, refresh the entry to skip hashing next time.
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self.__write(name, path, entry)
+
+        docs = entry['docs']
+        return CacheEntry(None if docs is None else docs_from_dict(docs))
+
+    def store(
+            self,
+            name: str,
+            path: str,
+            module_docs: ModuleDocs|None,
+            state: SourceState
+        ) -> None:
+        """Stores the documentation of a module.
+
+        Args:
+            name (str): The dotted name of the module.
+            path (str): The path of the module source.
+            module_docs (ModuleDocs|None): The documentation of the module,
+                None if the module contains no documentation.
+            state (SourceState): The state of the source before the module
+                was collected, from `source_state`.
+        """
+        entry = {
+            'format': CACHE_FORMAT,
+            'version': __version__,
+            'engine': self.engine,
+            'module': name,
+            'path': os.path.abspath(path),
+            'mtime_ns': state.mtime_ns,
+            'size': state.size,
+            'sha256': state.sha256,
+            'docs': None if module_docs is None else docs_to_dict(module_docs),
+        }
+        self.__write(name, path, entry)
+
+    def entry_path(self, name: str, path: str) -> str:
+        """The path of the cache entry for a module.
+
+        Args:
+            name (str): The dotted name of the module.
+            path (str): The path of the module source.
+
+        Returns:
+            str: The path of the entry file within the cache directory.
+        """
+        key = f'{self.engine}:{name}:{os.path.abspath(path)}'
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f'{name}-{digest}.json')
+
+    def __write(self, name: str, path: str, entry: dict) -> None:
+        # Write to a temporary file first, readers never see partial entries.
+        entry_path = self.entry_path(name, path)
+        temporary_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file, separators=(',', ':'))
+        os.replace(temporary_path, entry_path)
+
+
+def source_state(path: str) -> SourceState|None:
+    """Reads the state of a module source, before the module is collected.
+
+    Args:
+        path (str): The path of the module source.
+
+    Returns:
+        SourceState|None: The state of the source, None if it can not be read.
+    """
+    try:
+        stat = os.stat(path)
+        digest = _hash_file(path)
+    except OSError as e:
+        logger.warning(f'Could not read {path}: {e}')
+        return None
+    return SourceState(stat.st_mtime_ns, stat.st_size, digest)
+
+
+def _hash_file(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
@@ -1,87 +1,314 @@
-"""Conatins container dataclasses to store the different documentations."""
+"""Conatins container classes to store the different documentations.
+
+The containers are immutable, slotted classes. Registries can hold tens of
+thousands of them, so they carry no per-instance `__dict__`, and the names,
+qualnames and type names repeated across them are interned.
+
+Every container carries a content hash over its name, qualname, signature,
+docstring and parents. The hashes of modules and classes roll up the hashes of
+their contents, Merkle-style, so equal hashes mean equal subtrees.
+
+Classes:
+    DocsContents: The documentation within a container, as a set.
+
+Functions:
+    memory_report(modules: Iterable[ModuleDocs]): Reports the memory used by
+        the documentation of modules.
+    parent_name(parent: object): The name a parent class is displayed and stored by.
+""" # noqa: E501
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Type
+from collections.abc import MutableSet
+from dataclasses import FrozenInstanceError, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Type
 
+import hashlib
 import inspect
+import sys
+
+if TYPE_CHECKING:
+    from docstring_sections import DocstringSections
+
+# Shared by all untagged documentation, an empty frozenset is not a singleton.
+NO_TAGS = frozenset()
+HASH_SIZE = 16
+_FIELD_SEPARATOR = '\x00'
+_MISSING = '\x01'
+
+
+class Lazy:
+    """A value computed from the documented object the first time it is used.
+
+    The object is kept alive until the value is resolved, so the value can be
+    computed after the object was deleted or its module reloaded. Documentation
+    replaces the lazy value with the resolved one, releasing the object.
+    """ #noqa: E501
+    __slots__ = ('__compute', '__source')
+
+    def __init__(self, compute: Callable[[Any], Any], source: object) -> None:
+        """Initializes the lazy value.
+
+        Args:
+            compute (Callable): Computes the value from the source object.
+            source (object): The object the value is computed from.
+        """
+        self.__compute = compute
+        self.__source = source
+
+    def resolve(self) -> Any: # noqa: ANN401
+        """Computes the value from the source object."""
+        return self.__compute(self.__source)
 
 
-@dataclass(frozen=True)
 class Docs:
     """Represents documentation information.
 
     Attributes:
         name (str): The name of the object.
         docstring (Optional[str]): The docstring of the object, or None if no docstring is provided.
+        sections (DocstringSections|None): The docstring parsed into its sections on access,
+            memoized across documentation sharing the same docstring.
+        own_hash (str): The hash of the documentation itself, without its contents.
+        content_hash (str): The hash of the documentation and all documentation within it.
     """ #noqa: E501
-    name: str
-    docstring: str|None
+    __slots__ = ('name', 'docstring', '_own_hash')
+
+    def __init__(self, name: str, docstring: str|None) -> None:
+        """Initializes the documentation, interning the name."""
+        object.__setattr__(self, 'name', sys.intern(name))
+        object.__setattr__(self, 'docstring', docstring)
+        object.__setattr__(self, '_own_hash', None)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Documentation is immutable once created."""
+        raise FrozenInstanceError(f'cannot assign to field {name!r}')
+
+    def __delattr__(self, name: str) -> None:
+        """Documentation is immutable once created."""
+        raise FrozenInstanceError(f'cannot delete field {name!r}')
+
+    def __repr__(self) -> str:
+        """Represent the documentation by its class and name."""
+        return f'{self.__class__.__name__}(name={self.name!r})'
 
     def __eq__(self, other: Docs) -> bool:
         """Equality for Docs."""
         if not isinstance(other, self.__class__):
             return False
         return self.name == other.name
-    
+
     def __hash__(self) -> str:
         """Implement hash on the name.
-        
+
         The name of the Docs should be unique within the different scopes they are saved.
         files must be distinct within the same directory
         Functions and classes must have distinct names in the various scopes in a file.
         """ #noqa: E501
         return hash(self.name)
-    
 
-@dataclass(frozen=True, eq=False)
-class ModuleDocs(Docs):
-    """Represents documentation information for a module.
+    @property
+    def sections(self) -> DocstringSections|None:
+        """The docstring parsed into its sections, None without a docstring."""
+        if self.docstring is None:
+            return None
+        from docstring_sections import parse_sections
+        return parse_sections(self.docstring)
 
-    Attributes:
-        name (str): The name of the object.
-        docstring (str|None): The docstring of the object, or None if no docstring is provided.
-        contents set[Docs]: A set of documentation objects.
+    @property
+    def own_hash(self) -> str:
+        """The hash of the documentation itself, computed once."""
+        own_hash = self._own_hash
+        if own_hash is None:
+            # Fields are told apart by a separator which text does not contain.
+            data = _FIELD_SEPARATOR.join(
+                _MISSING if field is None else field
+                for field in self._hashed_fields()
+            )
+            own_hash = hashlib.blake2b(
+                data.encode('utf-8', 'surrogatepass'), digest_size=HASH_SIZE
+            ).hexdigest()
+            object.__setattr__(self, '_own_hash', own_hash)
+        return own_hash
+
+    @property
+    def content_hash(self) -> str:
+        """The hash of the documentation and all documentation within it.
+
+        Containers combine their own hash with the hashes of their contents
+        in name order. Contents can still be added, so it is not memoized.
+        """
+        return self._content_hash({})
+
+    def _content_hash(self, hashes: dict[int, str]) -> str:
+        # The hashes of containers already walked are kept by id, so a walk
+        # over unchanging documentation hashes every subtree once.
+        if not isinstance(self, DocsContainer):
+            return self.own_hash
+        content_hash = hashes.get(id(self))
+        if content_hash is None:
+            contents = self._contents
+            digest = hashlib.blake2b(
+                self.own_hash.encode('ascii'), digest_size=HASH_SIZE
+            )
+            for name in sorted(contents):
+                digest.update(contents[name]._content_hash(hashes).encode('ascii'))
+            content_hash = hashes[id(self)] = digest.hexdigest()
+        return content_hash
+
+    def _hashed_fields(self) -> list[str|None]:
+        # The fields the own hash is computed from, starting with the kind.
+        return ['module', self.name, self.docstring]
+
+    def _resolve(self, slot: str) -> Any: # noqa: ANN401
+        # Replaces a lazy value with the computed one on first access.
+        value = object.__getattribute__(self, slot)
+        if isinstance(value, Lazy):
+            value = value.resolve()
+            object.__setattr__(self, slot, value)
+        return value
+
+
+class DocsContainer:
+    """Name indexed access to the documentation stored within a container.
+
+    The contents are kept in a dictionary from name to documentation, giving
+    constant time insertion, lookup and membership checks. Like a set of `Docs`,
+    adding documentation with a name which already exists keeps the first one.
     """ #noqa: E501
-    __contents: set[Docs] = field(default_factory=set)
-    
+    __slots__ = ()
+
+    _contents: dict[str, Docs]
+
     @property
-    def contents(self) -> list[Docs]:
-        """Interact with the __object attribute."""
-        return self.__contents
+    def contents(self) -> DocsContents:
+        """The documentation within the container, as a set."""
+        return DocsContents(self)
+
+    def add(self, doc: Docs) -> None:
+        """Adds documentation to the container.
+
+        Args:
+            doc (Docs): The documentation to add.
+        """
+        self._contents.setdefault(doc.name, doc)
+
+    def discard(self, doc: Docs) -> None:
+        """Removes documentation from the container, if it is contained.
+
+        Args:
+            doc (Docs): The documentation to remove.
+        """
+        if self._contents.get(doc.name) == doc:
+            del self._contents[doc.name]
+
+    def update(self, docs: Iterable[Docs]) -> None:
+        """Adds several documentations to the container.
+
+        Args:
+            docs (Iterable[Docs]): The documentations to add.
+        """
+        for doc in docs:
+            self.add(doc)
+
+    def get(self, name: str) -> Docs|None:
+        """Gets the documentation with the given name from the contents.
+
+        Args:
+            name (str): The name of the documentation to get.
+
+        Returns:
+            Docs|None: The documentation, None if it does not exist.
+        """
+        return self._contents.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        """Asserts if documentation with the given name exists in the contents."""
+        return name in self._contents
 
     def contains_class(self, class_name: str) -> bool:
         """Asserts if the class supposed to be documented exists in the contents.
-        
+
         Args:
             class_name (str): The name of the class to look for.
 
         Returns:
             bool: True if the class exists in contents, False otherwise.
         """
-        condition_map = map(
-            lambda doc: (isinstance(doc, ClassDocs)) and (doc.name == class_name),
-            self.__contents
-        )
-        return any(condition_map)
-    
-    def get_class(self, class_name: str) -> ClassDocs:
+        return isinstance(self._contents.get(class_name), ClassDocs)
+
+    def get_class(self, class_name: str) -> ClassDocs|None:
         """Gets the class with the given name from the contents.
-        
+
         Args:
             class_name (str): The name of the class to get.
 
         Returns:
-            ClassDocs: The docs for the given class.
-        """
-        return filter(
-            lambda doc: (isinstance(doc, ClassDocs)) and (doc.name == class_name),
-            self.__contents
-        ).__next__
+            ClassDocs|None: The docs for the given class, None if it does not exist.
+        """ #noqa: E501
+        doc = self._contents.get(class_name)
+        return doc if isinstance(doc, ClassDocs) else None
+
+
+class DocsContents(MutableSet):
+    """The documentation within a container, as a set.
+
+    A live view of the contents indexed by name, supporting the operations of
+    a set of `Docs`. Changes go through the container, set operations such as
+    `|` and `-` return plain sets.
+    """
+    __slots__ = ('_container',)
+
+    def __init__(self, container: DocsContainer) -> None:
+        """Initializes the view of the contents of a container."""
+        self._container = container
+
+    def __contains__(self, doc: object) -> bool:
+        """True if the documentation is within the container."""
+        if not isinstance(doc, Docs):
+            return False
+        return self._container._contents.get(doc.name) == doc
+
+    def __iter__(self) -> Iterator[Docs]:
+        """Iterates the documentation in the order it was added."""
+        return iter(self._container._contents.values())
 
+    def __len__(self) -> int:
+        """The number of documentations within the container."""
+        return len(self._container._contents)
 
+    def __repr__(self) -> str:
+        """Represent the contents like a set."""
+        return f'{self.__class__.__name__}({set(self)!r})'
+
+    def add(self, doc: Docs) -> None:
+        """Adds documentation to the container, see `DocsContainer.add`."""
+        self._container.add(doc)
+
+    def discard(self, doc: Docs) -> None:
+        """Removes documentation from the container, if it is contained."""
+        self._container.discard(doc)
+
+    @classmethod
+    def _from_iterable(cls, docs: Iterable[Docs]) -> set[Docs]:
+        # The results of set operations are not bound to a container.
+        return set(docs)
+
+
+class ModuleDocs(Docs, DocsContainer):
+    """Represents documentation information for a module.
+
+    Attributes:
+        name (str): The name of the object.
+        docstring (str|None): The docstring of the object, or None if no docstring is provided.
+        contents (DocsContents): The documentation objects, as a set indexed by name.
+    """ #noqa: E501
+    __slots__ = ('_contents',)
+
+    def __init__(self, name: str, docstring: str|None) -> None:
+        """Initializes the documentation of a module with empty contents."""
+        super().__init__(name, docstring)
+        object.__setattr__(self, '_contents', {})
 
 
-@dataclass(frozen=True, eq=False)
 class ObjectDocs(Docs):
     """Represents documentation information for an object.
 
@@ -91,14 +318,47 @@ class ObjectDocs(Docs):
         qualname (str): The qualified name of the object, which includes the module and class name if applicable.
         type (str): The type of the object as a string (e.g., "function", "class").
         f_signature (Type[signature]): The function signature, if applicable.
+            Can be given as `Lazy`, computing it on first access.
         module (Optional[str]): The name of the module where the object is defined, or None if not applicable.
+        tags (frozenset[str]): The audiences the object is documented for, given to `document_me`.
     """ #noqa: E501
-    qualname: str
-    type: str
-    f_signature: Type[inspect.signature]
+    __slots__ = ('qualname', 'type', '_f_signature', 'tags')
+
+    def __init__(
+            self,
+            name: str,
+            docstring: str|None,
+            qualname: str,
+            type: str,
+            f_signature: Type[inspect.signature]|Lazy|None = None,
+            tags: Iterable[str] = ()
+        ) -> None:
+        """Initializes the documentation, interning the names."""
+        super().__init__(name, docstring)
+        object.__setattr__(self, 'qualname', sys.intern(qualname))
+        object.__setattr__(self, 'type', sys.intern(type))
+        object.__setattr__(self, '_f_signature', f_signature)
+        tags = frozenset(sys.intern(tag) for tag in tags)
+        object.__setattr__(self, 'tags', tags or NO_TAGS)
+
+    def __repr__(self) -> str:
+        """Represent the documentation by its class and qualified name."""
+        return f'{self.__class__.__name__}(qualname={self.qualname!r})'
 
-@dataclass(frozen=True, eq=False)
-class ClassDocs(ObjectDocs):
+    @property
+    def f_signature(self) -> Type[inspect.signature]|None:
+        """The function signature, computed on first access if lazy."""
+        return self._resolve('_f_signature')
+
+    def _hashed_fields(self) -> list[str|None]:
+        signature = self.f_signature
+        return [
+            'object', self.name, self.qualname,
+            None if signature is None else str(signature), self.docstring,
+        ]
+
+
+class ClassDocs(ObjectDocs, DocsContainer):
     """Represents documentation information for a class, including its parents.
 
     Inherits from:
@@ -108,13 +368,117 @@ class ClassDocs(ObjectDocs):
         name (str): The name of the object.
         docstring (str|None): The docstring of the object, or None if no docstring is provided.
         parents (List[object]|None): A list of parent classes of the documented class.
-            None if has no parents.
-        contents set[Docs]: A set of documentation objects.
+            None if has no parents. Can be given as `Lazy`, computing it on first access.
+        contents (DocsContents): The documentation objects, as a set indexed by name.
+        tags (frozenset[str]): The audiences the class is documented for, given to `document_me`.
     """ #noqa: E501
-    parents: list[object]|None
-    __contents: set[Docs] = field(default_factory=set)
-    
+    __slots__ = ('_parents', '_contents')
+
+    def __init__(
+            self,
+            name: str,
+            docstring: str|None,
+            qualname: str,
+            type: str,
+            f_signature: Type[inspect.signature]|Lazy|None = None,
+            parents: list[object]|Lazy|None = None,
+            tags: Iterable[str] = ()
+        ) -> None:
+        """Initializes the documentation of a class with empty contents."""
+        super().__init__(name, docstring, qualname, type, f_signature, tags)
+        object.__setattr__(self, '_parents', parents)
+        object.__setattr__(self, '_contents', {})
+
     @property
-    def contents(self) -> set[Docs]:
-        """Interact with the __object attribute."""
-        return self.__contents
+    def parents(self) -> list[object]|None:
+        """The parent classes, computed on first access if lazy."""
+        return self._resolve('_parents')
+
+    def _hashed_fields(self) -> list[str|None]:
+        fields = super()._hashed_fields()
+        fields[0] = 'class'
+        parents = self.parents
+        fields.append(
+            None if parents is None
+            else ', '.join(parent_name(parent) for parent in parents)
+        )
+        return fields
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """The memory used by documentation containers.
+
+    Counts the containers, their content indexes, their strings and the parent
+    lists. Strings shared through interning are counted once, for the first
+    container holding them. Signatures and lazy values are not counted.
+
+    Attributes:
+        modules (dict[str, int]): Bytes per module, including the documentation within it.
+        kinds (dict[str, int]): Bytes per kind of documentation: 'module', 'class' or 'object'.
+        total (int): Bytes used by all the documentation.
+    """ #noqa: E501
+    modules: dict[str, int]
+    kinds: dict[str, int]
+    total: int
+
+
+def parent_name(parent: object) -> str:
+    """The name a parent class is displayed and stored by.
+
+    Classes are named by their module and qualified name, other values,
+    such as parents read from the source, by their text.
+
+    Args:
+        parent (object): A parent class.
+
+    Returns:
+        str: The name of the parent.
+    """
+    if not isinstance(parent, type):
+        return str(parent)
+    if parent.__module__ == 'builtins':
+        return parent.__qualname__
+    return f'{parent.__module__}.{parent.__qualname__}'
+
+
+def memory_report(modules: Iterable[ModuleDocs]) -> MemoryReport:
+    """Reports the memory used by the documentation of modules.
+
+    Args:
+        modules (Iterable[ModuleDocs]): The documentation of the modules.
+
+    Returns:
+        MemoryReport: The bytes used by module and by kind of documentation.
+    """
+    seen = set()
+    kinds = {'module': 0, 'class': 0, 'object': 0}
+
+    def size(doc: Docs) -> int:
+        owned = [doc, doc.name, doc.docstring]
+        if isinstance(doc, ObjectDocs):
+            owned.extend((doc.qualname, doc.type, doc.tags))
+        if isinstance(doc, ClassDocs):
+            parents = object.__getattribute__(doc, '_parents')
+            if isinstance(parents, list):
+                owned.append(parents)
+        if isinstance(doc, DocsContainer):
+            owned.append(doc._contents)
+
+        own_size = 0
+        for value in owned:
+            if value is not None and id(value) not in seen:
+                seen.add(id(value))
+                own_size += sys.getsizeof(value)
+        if isinstance(doc, ModuleDocs):
+            kind = 'module'
+        else:
+            kind = 'class' if isinstance(doc, ClassDocs) else 'object'
+        kinds[kind] += own_size
+
+        if isinstance(doc, DocsContainer):
+            own_size += sum(size(child) for child in doc.contents)
+        return own_size
+
+    module_sizes = {module_docs.name: size(module_docs) for module_docs in modules}
+    return MemoryReport(module_sizes, kinds, sum(module_sizes.values()))
@@ -0,0 +1,292 @@
+"""Report the public API which is not decorated with `document_me`.
+
+The analyzer walks the same modules as `invoke_modules`, and finds the public
+callables of every module in one pass over its parsed source: module level
+functions and classes, and the methods and nested classes of public classes.
+These are compared against the documentation the docurator registry holds.
+
+With the 'ast' engine the same parsed source is also collected into the
+registry, so every file is read and parsed once and nothing is imported.
+With the 'import' engine the modules are imported by `invoke_modules` first.
+
+A name is public if it does not start with an underscore, dunder methods
+included, in a module whose dotted name has no part starting with one. A
+module defining `__all__` as a literal list or tuple exports only those
+names. Properties and typing overloads are not callables to document.
+
+Classes:
+    ModuleCoverage: The documentation coverage of one module.
+    CoverageReport: The documentation coverage of all modules.
+
+Functions:
+    public_callables(tree: ast.Module): The qualified names of the public callables
+        in a parsed module.
+    analyze_coverage(paths: Roots, engine: str, module_filter: ModuleFilter|None): Reports
+        the coverage of the modules in the given roots.
+""" # noqa: E501
+from __future__ import annotations
+
+import ast
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+from ast_collector import collect_tree
+from doc_containers import DocsContainer, ModuleDocs
+from docurator import docurator
+from module_traverser import (
+    ENGINES,
+    ModuleFilter,
+    Roots,
+    invoke_modules,
+    walk_modules,
+)
+
+logger = logging.getLogger(__name__)
+
+# Decorators turning a function into something other than a callable.
+NOT_CALLABLE_DECORATORS = frozenset((
+    'property', 'cached_property', 'setter', 'getter', 'deleter', 'overload',
+))
+
+
+@dataclass(frozen=True)
+class ModuleCoverage:
+    """The documentation coverage of one module.
+
+    Attributes:
+        name (str): The dotted name of the module.
+        public (int): The number of public callables in the module.
+        undocumented (tuple[str, ...]): The qualified names of the public
+            callables which are not documented, in source order.
+    """
+    name: str
+    public: int
+    undocumented: tuple[str, ...]
+
+    @property
+    def documented(self) -> int:
+        """The number of public callables which are documented."""
+        return self.public - len(self.undocumented)
+
+    @property
+    def percent(self) -> float:
+        """The percentage of public callables documented, 100 if there are none."""
+        return 100.0 if not self.public else 100.0 * self.documented / self.public
+
+
+@dataclass(frozen=True)
+class CoverageReport:
+    """The documentation coverage of all modules.
+
+    Attributes:
+        modules (tuple[ModuleCoverage, ...]): The coverage of every module
+            with public callables, in the order walked.
+    """
+    modules: tuple[ModuleCoverage, ...]
+
+    @property
+    def public(self) -> int:
+        """The number of public callables in all modules."""
+        return sum(module.public for module in self.modules)
+
+    @property
+    def documented(self) -> int:
+        """The number of public callables which are documented."""
+        return sum(module.documented for module in self.modules)
+
+    @property
+    def percent(self) -> float:
+        """The percentage of public callables documented, 100 if there are none."""
+        return 100.0 if not self.public else 100.0 * self.documented / self.public
+
+    @property
+    def undocumented(self) -> list[str]:
+        """The fully qualified names of the undocumented public callables."""
+        return [
+            f'{module.name}.{qualname}'
+            for module in self.modules for qualname in module.undocumented
+        ]
+
+    def summary(self, list_undocumented: bool = True) -> str:
+        """A human readable table of the coverage per module.
+
+        Args:
+            list_undocumented (bool): Also lists every undocumented callable.
+
+        Returns:
+            str: The summary table.
+        """
+        lines = [f'{"coverage":>8} {"documented":>10}  module']
+        for module in self.modules:
+            lines.append(
+                f'{module.percent:>7.1f}% {module.documented:>5}/{module.public:<4}'
+                f'  {module.name}'
+            )
+        lines.append(
+            f'{self.percent:>7.1f}% {self.documented:>5}/{self.public:<4}  total'
+        )
+        undocumented = self.undocumented
+        if list_undocumented and undocumented:
+            lines.append('')
+            lines.append(f'{len(undocumented)} undocumented:')
+            lines.extend(f'  {name}' for name in undocumented)
+        return '\n'.join(lines)
+
+    def report(self) -> dict[str, Any]:
+        """The coverage as JSON compatible data.
+
+        Returns:
+            dict[str, Any]: The totals and the coverage of every module.
+        """
+        return {
+            'totals': {
+                'modules': len(self.modules),
+                'public': self.public,
+                'documented': self.documented,
+                'percent': self.percent,
+            },
+            'modules': [
+                {**asdict(module), 'percent': module.percent}
+                for module in self.modules
+            ],
+        }
+
+
+def public_callables(tree: ast.Module) -> list[str]:
+    """The qualified names of the public callables in a parsed module.
+
+    Args:
+        tree (ast.Module): The parsed source of the module.
+
+    Returns:
+        list[str]: The qualified names, in source order.
+    """
+    exported = _exported_names(tree)
+    names = []
+    for node in tree.body:
+        if exported is None or _definition_name(node) in exported:
+            names.extend(_public_names(node, ''))
+    return names
+
+
+def analyze_coverage(
+        paths: Roots,
+        engine: str = 'ast',
+        module_filter: ModuleFilter|None = None
+    ) -> CoverageReport:
+    """Reports the documentation coverage of the modules in source roots.
+
+    The documentation is collected into the docurator registry, and
+    replaces documentation collected before for the same modules.
+
+    Args:
+        paths (Roots): The root directory of the modules to analyze, or several roots.
+        engine (str): How the documentation is collected, 'ast' parses the
+            source once for both, 'import' imports the modules.
+        module_filter (ModuleFilter|None): Selects the modules to analyze,
+            excluded packages are never parsed or imported. All if None.
+
+    Returns:
+        CoverageReport: The coverage of the modules with public callables.
+
+    Raises:
+        ValueError: If the provided engine is not valid.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f'Engine {engine} was not recognized.')
+    if engine == 'import':
+        invoke_modules(paths, engine, module_filter=module_filter)
+
+    modules = []
+    for mod in walk_modules(paths, module_filter):
+        if mod.path is None or not mod.path.endswith('.py'):
+            continue
+        if any(part.startswith('_') for part in mod.name.split('.')):
+            continue
+        try:
+            with open(mod.path, 'rb') as source:
+                tree = ast.parse(source.read(), filename=mod.path)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning(f'Failed to parse {mod.name}: {e}')
+            continue
+        if engine == 'ast':
+            module_docs = collect_tree(mod.name, tree)
+            if module_docs is not None:
+                docurator.register_module(module_docs)
+
+        public = public_callables(tree)
+        if not public:
+            continue
+        documented = set(_documented_qualnames(docurator.docs.get(mod.name)))
+        modules.append(ModuleCoverage(
+            mod.name,
+            len(public),
+            tuple(qualname for qualname in public if qualname not in documented),
+        ))
+    return CoverageReport(tuple(modules))
+
+
+def _public_names(node: ast.stmt, prefix: str) -> Iterator[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        if not node.name.startswith('_') and not _is_not_callable(node):
+            yield f'{prefix}{node.name}'
+    elif isinstance(node, ast.ClassDef) and not node.name.startswith('_'):
+        qualname = f'{prefix}{node.name}'
+        yield qualname
+        for child in node.body:
+            yield from _public_names(child, f'{qualname}.')
+
+
+def _is_not_callable(node: ast.FunctionDef|ast.AsyncFunctionDef) -> bool:
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        name = None
+        if isinstance(decorator, ast.Name):
+            name = decorator.id
+        elif isinstance(decorator, ast.Attribute):
+            name = decorator.attr
+        if name in NOT_CALLABLE_DECORATORS:
+            return True
+    return False
+
+
+def _definition_name(node: ast.stmt) -> str|None:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return node.name
+    return None
+
+
+def _exported_names(tree: ast.Module) -> set[str]|None:
+    # The names in a literal `__all__`, None if the module has none.
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if not any(
+            isinstance(target, ast.Name) and target.id == '__all__'
+            for target in targets
+        ):
+            continue
+        if not isinstance(value, (ast.List, ast.Tuple)):
+            return None
+        return {
+            element.value for element in value.elts
+            if isinstance(element, ast.Constant) and isinstance(element.value, str)
+        }
+    return None
+
+
+def _documented_qualnames(module_docs: ModuleDocs|None) -> Iterator[str]:
+    if module_docs is None:
+        return
+    stack = list(module_docs.contents)
+    while stack:
+        doc = stack.pop()
+        yield doc.qualname
+        if isinstance(doc, DocsContainer):
+            stack.extend(doc.contents)
@@ -0,0 +1,173 @@
+"""Parse docstrings into typed sections.
+
+Docstrings in the Google, NumPy and reST styles are parsed with
+`docstring_parser` into frozen section objects, so renderers do not
+depend on the parser's own types.
+
+Parsed docstrings are kept in a bounded LRU cache keyed by the docstring.
+Inherited and overridden methods often share identical docstrings, which
+are then parsed only once.
+
+Classes:
+    Parameter: A documented parameter.
+    Returns: The documented return value.
+    Raises: A documented exception.
+    Example: A documented example.
+    DocstringSections: The sections of a parsed docstring.
+
+Functions:
+    parse_sections(docstring: str, style: str): Parses a docstring into sections.
+""" # noqa: E501
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+CACHE_SIZE = 4096
+STYLES = ('auto', 'google', 'numpy', 'rest')
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """A documented parameter.
+
+    Attributes:
+        name (str): The name of the parameter.
+        type_name (str|None): The documented type, None if not documented.
+        description (str|None): The description of the parameter.
+        default (str|None): The documented default value, None if not documented.
+        is_optional (bool): True if the parameter is documented as optional.
+    """ # noqa: E501
+    name: str
+    type_name: str|None
+    description: str|None
+    default: str|None
+    is_optional: bool
+
+
+@dataclass(frozen=True)
+class Returns:
+    """The documented return value.
+
+    Attributes:
+        type_name (str|None): The documented type, None if not documented.
+        description (str|None): The description of the return value.
+        is_generator (bool): True if the value is documented as yielded.
+    """
+    type_name: str|None
+    description: str|None
+    is_generator: bool
+
+
+@dataclass(frozen=True)
+class Raises:
+    """A documented exception.
+
+    Attributes:
+        type_name (str|None): The type of the exception.
+        description (str|None): When the exception is raised.
+    """
+    type_name: str|None
+    description: str|None
+
+
+@dataclass(frozen=True)
+class Example:
+    """A documented example.
+
+    Attributes:
+        code (str): The example, often doctest lines.
+    """
+    code: str
+
+
+@dataclass(frozen=True)
+class DocstringSections:
+    """The sections of a parsed docstring.
+
+    Attributes:
+        style (str): The style the docstring was parsed as.
+        short_description (str|None): The first line of the docstring.
+        long_description (str|None): The description following the first line.
+        args (tuple[Parameter, ...]): The documented parameters.
+        returns (Returns|None): The documented return value.
+        raises (tuple[Raises, ...]): The documented exceptions.
+        examples (tuple[Example, ...]): The documented examples.
+    """
+    style: str
+    short_description: str|None
+    long_description: str|None
+    args: tuple[Parameter, ...]
+    returns: Returns|None
+    raises: tuple[Raises, ...]
+    examples: tuple[Example, ...]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_sections(docstring: str, style: str = 'auto') -> DocstringSections:
+    """Parses a docstring into sections.
+
+    The results are cached and shared, identical docstrings
+    are only parsed once while they are in the cache.
+
+    Args:
+        docstring (str): The docstring to parse.
+        style (str): The style of the docstring, 'auto' detects it.
+
+    Returns:
+        DocstringSections: The parsed sections.
+
+    Raises:
+        ValueError: If the style is not recognized, or the docstring
+            is not valid in the given style.
+    """
+    if style not in STYLES:
+        raise ValueError(f'Style {style} was not recognized.')
+    import docstring_parser
+
+    styles = {
+        'auto': docstring_parser.DocstringStyle.AUTO,
+        'google': docstring_parser.DocstringStyle.GOOGLE,
+        'numpy': docstring_parser.DocstringStyle.NUMPYDOC,
+        'rest': docstring_parser.DocstringStyle.REST,
+    }
+    try:
+        parsed = docstring_parser.parse(docstring, styles[style])
+    except docstring_parser.ParseError as e:
+        raise ValueError(f'Docstring is not valid {style} style: {e}') from e
+    returns = parsed.returns
+    return DocstringSections(
+        style=_style_name(parsed.style, docstring_parser.DocstringStyle),
+        short_description=parsed.short_description,
+        long_description=parsed.long_description,
+        args=tuple(
+            Parameter(
+                param.arg_name,
+                param.type_name,
+                param.description,
+                param.default,
+                bool(param.is_optional),
+            )
+            for param in parsed.params
+        ),
+        returns=None if returns is None else Returns(
+            returns.type_name, returns.description, returns.is_generator
+        ),
+        raises=tuple(
+            Raises(raises.type_name, raises.description)
+            for raises in parsed.raises
+        ),
+        examples=tuple(
+            Example(example.snippet or example.description or '')
+            for example in parsed.examples
+        ),
+    )
+
+
+def _style_name(style: object, styles: type) -> str:
+    names = {
+        styles.GOOGLE: 'google',
+        styles.NUMPYDOC: 'numpy',
+        styles.REST: 'rest',
+    }
+    return names.get(style, 'unknown')
@@ -1,160 +1,78 @@
-"""Contains the docurator factory, and storing class.
+"""Contains the docurator factory, and the documentation decorator.
 
 This module provides a utility for collecting and storing documentation information of callable objects.
 using a decorator-based approach. It is designed for both development and production environments, allowing
 documentation gathering to be toggled on or off.
 
-Classes:
-    Docurator: Collects documentation information for callable objects and stores them in a list.
+The mode is read from the `DOCURATOR_MODE` environment variable when this module is imported,
+defaulting to 'doc'. Nothing beyond this module is imported in production mode, the collection
+machinery in `registry` is only imported in doc mode, or when `Docurator` or `docurator` is used.
 
 Functions:
-    decorator_factory(mode: str): Creates a decorator function to either collect documentation information 
+    decorator_factory(mode: str): Creates a decorator function to either collect documentation information
         (in 'development' or 'doc' mode) or do nothing (in 'production' mode).
 
 Decorators:
-    document_me: A decorator created by `decorator_factory`, used to annotate callable objects and collect 
-        their documentation information based on the current mode.
+    document_me: A decorator created by `decorator_factory`, used to annotate callable objects and collect
+        their documentation information based on the current mode. Called with strings, e.g.
+        `@document_me('users')`, it tags the documentation with the audiences it is meant for.
+
+Attributes:
+    mode (str): The mode `document_me` was created for.
+    Docurator (type): The storing class, imported from `registry` on first use.
+    docurator (Docurator): The registry `document_me` adds decorated objects to, imported on first use.
 
 Usage:
-    - Use the `document_me` decorator to annotate functions, methods, or other callable objects that need 
+    - Use the `document_me` decorator to annotate functions, methods, or other callable objects that need
       their documentation collected.
-    - `Docurator` instances will store relevant metadata such as docstrings, function signatures, names, 
+    - `Docurator` instances will store relevant metadata such as docstrings, function signatures, names,
       and module information.
+    - Set `DOCURATOR_MODE=production` in services which only run the decorated code.
 """ # noqa: E501
+import os
+
+# Annotations are quoted rather than importing `__future__` or `typing`.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, TypeVar
+
+    CallableObject = TypeVar('CallableObject', bound=Callable[..., Any])
+    Decorator = Callable[[CallableObject], CallableObject]
+
+__version__ = '0.1.0'
+
+MODE_VARIABLE = 'DOCURATOR_MODE'
+PRODUCTION_MODES = ('production',)
+DOC_MODES = ('document', 'doc')
+
+# Attributes imported from the collection machinery on first access.
+_LAZY_ATTRIBUTES = ('Docurator', 'docurator')
+
+
+def __getattr__(name: str) -> object:
+    """Imports the collection machinery when its attributes are first used."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import registry
+    value = getattr(registry, name)
+    globals()[name] = value
+    return value
+
 
-import logging
-from typing import Callable, TypeVar, Any
-import inspect
-from doc_containers import Docs, ModuleDocs, ObjectDocs, ClassDocs
-
-logger = logging.getLogger(__name__)
-CallableObject = TypeVar("F", bound=Callable[..., Any])
-
-
-class Docurator:
-    """A class for collecting documentation information for callable objects.
-
-    Attributes:
-        docs (List[Docs]): A list of documentation information collected for the callable objects.
-    """ #noqa E501
-    def __init__(self) -> None:
-        """Initializes an empty list to store documentation information."""
-        self.__module_docs = {}
-
-        # Due to class method wrappers being initialized prior
-        # to the class wrapper, this stores the methods to be appended
-        # to the calss at a later time.
-        self.__class_method_cache = {}
-
-    @property
-    def docs(self) -> dict[str, Docs]:
-        """Get the dictionary containing the fetched documentations."""
-        return self.__module_docs
-
-    def add(self, func: CallableObject) -> None:
-        """Adds documentation information for a given callable object.
-
-        Args:
-            func (Callable): The callable object (e.g., function, method) for which to collect documentation.
-
-        Raises:
-            ValueError: If `func` is not a callable object.
-        """ #noqa: E501
-        if isinstance(func, classmethod):
-            f = func.__func__
-        else: 
-            f = func
-
-        if not callable(f):
-            raise ValueError('The provided object must be callable.')
-        
-        module = inspect.getmodule(f)
-        module_name = module.__name__
-        module_docs = self.__module_docs.get(module_name)
-        if module_docs is None:
-            module_docs = ModuleDocs(
-                module_name, 
-                module.__doc__
-            )
-            self.__module_docs[module_name] = module_docs
-
-        shared_content = {
-            'docstring':f.__doc__, 
-            'name':f.__name__,
-            'qualname':f.__qualname__,
-            'type':f.__class__.__name__,
-            'f_signature': inspect.signature(f),
-        }
-        if inspect.isclass(f):
-            doc_content = self.__create_class_doc(shared_content, f)
-            # Fetch methods from method cache if exists.
-            cached_class_methods = self.__pop_from_method_cache(
-                module_name, doc_content.qualname
-            )
-            doc_content.contents.update(cached_class_methods)
-        else:
-            doc_content = ObjectDocs(**shared_content)
-
-
-        if self.__is_method(f):
-            class_name = self.__create_class_belonging_key(doc_content)
-            if module_docs.contains_class(class_name):
-                module_docs.get_class(class_name).contents.add(doc_content)
-            else:
-                self.__add_to_method_cache(module_name, doc_content)
-            return
-        module_docs.contents.add(doc_content)
-
-
-    @staticmethod
-    def __create_class_doc(base_content: dict, class_: object) -> ClassDocs:
-        parents = [obj for obj in class_.__bases__ if obj is not object]
-        base_content['parents'] = parents or None
-        return ClassDocs(**base_content)
-
-    def __add_to_method_cache(self, module_name: str, doc: ObjectDocs) -> None:
-        method_path = self.__create_class_belonging_key(doc)
-        key = f'{module_name}.{method_path}'
-        cache = self.__class_method_cache.get(key)
-        if cache is None:
-            cache = set()
-            self.__class_method_cache[key] = cache
-        cache.add(doc)
-
-    def __pop_from_method_cache(self, module_name: str, class_qualname: str) -> list[Docs]: #noqa E501
-        key = f'{module_name}.{class_qualname}'
-        if self.__class_method_cache.get(key) is not None:
-            methods = self.__class_method_cache.pop(key)
-        else:
-            methods = set()
-        return methods
-    
-        
-    @staticmethod
-    def __is_method(func: Callable) -> bool:
-        return len(func.__qualname__.split('.')) > 1
-    
-    @staticmethod
-    def __create_class_belonging_key(doc: ObjectDocs) -> str:
-        return '.'.join(doc.qualname.split('.')[:-1])
-
-
-
-mode = 'doc'
-docurator = Docurator()
-
-
-
-def decorator_factory(mode: str) -> Callable:
+def decorator_factory(mode: str) -> 'Callable':
     """Factory function to create a decorator based on the specified mode.
 
     The function returns a decorator depending on the mode.
     For a production mode the decorater simply returns the function
-    In document mode the decorator passes the function to the 
-    docurator for retrieving the documentation for the class. 
+    In document mode the decorator passes the function to the
+    docurator for retrieving the documentation for the class.
+
+    The decorator is used bare, `@document_me`, or called with the
+    audiences the object is documented for as tags, e.g.
+    `@document_me('users', 'maintainers')`.
 
     Args:
-        mode: A string indicating the mode of the decorator. 
+        mode: A string indicating the mode of the decorator.
               Possible values are 'production', 'document', or 'doc'.
 
     Returns:
@@ -163,19 +81,57 @@ def decorator_factory(mode: str) -> Callable:
     Raises:
         ValueError: If the provided mode is not recognized.
     """
-    if mode == 'production':
-        logger.info('In production setting docurator does nothing.')
-        def documentor(func: CallableObject) -> CallableObject:
-            return func
-    elif mode in ['document', 'doc']:
-        logger.info(f'In {mode} setting docurator collects documentation.')
-        def documentor(func: CallableObject) -> CallableObject:
-            docurator.add(func)
+    if mode in PRODUCTION_MODES:
+        # Nothing is imported or logged, production pays no import cost.
+        def documentor(
+                func: 'CallableObject|str|None' = None,
+                *tags: str
+            ) -> 'CallableObject|Decorator':
+            # Runs for every decorated object on import, the bare decorator
+            # is told apart without packing or inspecting an argument tuple.
+            if tags or func is None or isinstance(func, str):
+                _check_tags(tags if func is None else (func, *tags))
+                return _identity
             return func
+    elif mode in DOC_MODES:
+        import logging
+
+        from registry import docurator
+
+        logging.getLogger(__name__).info(
+            f'In {mode} setting docurator collects documentation.'
+        )
+        def documentor(
+                *arguments: 'CallableObject|str'
+            ) -> 'CallableObject|Decorator':
+            if _is_bare(arguments):
+                docurator.add(arguments[0])
+                return arguments[0]
+            _check_tags(arguments)
+
+            def tagged(func: 'CallableObject') -> 'CallableObject':
+                docurator.add(func, arguments)
+                return func
+            return tagged
     else:
         raise ValueError(f'Mode {mode} was not recognized.')
 
     return documentor
 
 
+def _is_bare(arguments: tuple) -> bool:
+    # `@document_me` passes the decorated object, `@document_me(...)` the tags.
+    return len(arguments) == 1 and not isinstance(arguments[0], str)
+
+
+def _check_tags(tags: tuple) -> None:
+    if not all(isinstance(tag, str) for tag in tags):
+        raise ValueError(f'Tags must be strings, got {tags!r}.')
+
+
+def _identity(func: 'CallableObject') -> 'CallableObject':
+    return func
+
+
+mode = os.environ.get(MODE_VARIABLE, 'doc')
 document_me = decorator_factory(mode)
@@ -0,0 +1,204 @@
+"""Profile the collection of documentation per module.
+
+This module records, for every module collected by `invoke_modules`, how long
+it took, how much memory it allocated, how many objects its decorators
+captured and whether it failed. Callers can attach hooks which are called with
+every profile, and the profiles are available as log records, a summary of the
+slowest modules and a JSON report.
+
+Classes:
+    ModuleProfile: The profile of collecting one module.
+    ImportProfiler: Profiles the collection of modules.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator
+
+from docurator import docurator
+
+logger = logging.getLogger(__name__)
+
+ProfileHook = Callable[['ModuleProfile'], None]
+
+
+@dataclass
+class ModuleProfile:
+    """The profile of collecting one module.
+
+    Attributes:
+        name (str): The dotted name of the module.
+        wall_seconds (float): The wall time spent collecting the module.
+        cpu_seconds (float): The cpu time of the process spent collecting the module.
+        memory_peak (int|None): The peak bytes allocated while collecting the module,
+            None if memory was not traced.
+        captures (int): The objects captured by `document_me` during the collection.
+        error (str|None): The exception if the collection failed, None otherwise.
+    """ # noqa: E501
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    memory_peak: int|None = None
+    captures: int = 0
+    error: str|None = None
+
+    @property
+    def failed(self) -> bool:
+        """True if the collection of the module failed."""
+        return self.error is not None
+
+
+class ImportProfiler:
+    """Profiles the collection of modules.
+
+    Attributes:
+        profiles (list[ModuleProfile]): The profiles in the order recorded.
+        trace_memory (bool): Measure the memory allocated with `tracemalloc`,
+            which slows down the collection.
+    """
+    def __init__(self, trace_memory: bool = True) -> None:
+        """Initializes the profiler without profiles or hooks."""
+        self.profiles = []
+        self.trace_memory = trace_memory
+        self.__hooks = []
+
+    def add_hook(self, hook: ProfileHook) -> None:
+        """Adds a callback called with every recorded profile.
+
+        Args:
+            hook (Callable[[ModuleProfile], None]): The callback.
+        """
+        self.__hooks.append(hook)
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[ModuleProfile]:
+        """Profiles the collection of a module within the context.
+
+        Set `error` on the yielded profile if the collection fails.
+        Exceptions raised within the context are recorded and re-raised.
+
+        Args:
+            name (str): The dotted name of the module.
+
+        Yields:
+            ModuleProfile: The profile, completed when the context exits.
+        """
+        profile = ModuleProfile(name)
+        started_tracing = False
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            memory_start = tracemalloc.get_traced_memory()[0]
+        captures = docurator.capture_count
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield profile
+        except BaseException as e:
+            profile.error = repr(e)
+            raise
+        finally:
+            profile.wall_seconds = time.perf_counter() - wall
+            profile.cpu_seconds = time.process_time() - cpu
+            profile.captures = docurator.capture_count - captures
+            if self.trace_memory:
+                profile.memory_peak = tracemalloc.get_traced_memory()[1] - memory_start
+                if started_tracing:
+                    tracemalloc.stop()
+            self.record(profile)
+
+    def record(self, profile: ModuleProfile) -> None:
+        """Records a profile, logging it and calling the hooks.
+
+        Args:
+            profile (ModuleProfile): The profile to record.
+        """
+        self.profiles.append(profile)
+        level = logging.WARNING if profile.failed else logging.INFO
+        logger.log(
+            level,
+            f'Collected {profile.name} in {profile.wall_seconds:.4f}s, '
+            f'{profile.captures} captures'
+            + (f', failed: {profile.error}' if profile.failed else ''),
+            extra={'module_profile': asdict(profile)},
+        )
+        for hook in self.__hooks:
+            hook(profile)
+
+    def slowest(self, top: int = 10) -> list[ModuleProfile]:
+        """The profiles of the slowest modules by wall time.
+
+        Args:
+            top (int): The number of profiles to return.
+
+        Returns:
+            list[ModuleProfile]: The slowest profiles, slowest first.
+        """
+        return sorted(
+            self.profiles, key=lambda profile: profile.wall_seconds, reverse=True
+        )[:top]
+
+    def summary(self, top: int = 10) -> str:
+        """A human readable summary of the slowest modules.
+
+        Args:
+            top (int): The number of modules to list.
+
+        Returns:
+            str: The summary table.
+        """
+        lines = [
+            f'{len(self.profiles)} modules in '
+            f'{sum(p.wall_seconds for p in self.profiles):.3f}s, '
+            f'{sum(p.failed for p in self.profiles)} failed',
+            f'{"wall s":>9} {"cpu s":>9} {"peak KiB":>9} {"captures":>8}  module',
+        ]
+        for profile in self.slowest(top):
+            peak = (
+                '-' if profile.memory_peak is None
+                else f'{profile.memory_peak / 1024:.1f}'
+            )
+            lines.append(
+                f'{profile.wall_seconds:>9.4f} {profile.cpu_seconds:>9.4f} '
+                f'{peak:>9} {profile.captures:>8}  {profile.name}'
+                + (' (failed)' if profile.failed else '')
+            )
+        return '\n'.join(lines)
+
+    def report(self, top: int = 10) -> dict[str, Any]:
+        """The profiles as JSON compatible data.
+
+        Args:
+            top (int): The number of modules to list as the slowest.
+
+        Returns:
+            dict[str, Any]: The totals, the slowest modules and all profiles.
+        """
+        return {
+            'totals': {
+                'modules': len(self.profiles),
+                'failed': sum(p.failed for p in self.profiles),
+                'wall_seconds': sum(p.wall_seconds for p in self.profiles),
+                'cpu_seconds': sum(p.cpu_seconds for p in self.profiles),
+                'captures': sum(p.captures for p in self.profiles),
+            },
+            'slowest': [profile.name for profile in self.slowest(top)],
+            'modules': [asdict(profile) for profile in self.profiles],
+        }
+
+    def write_json(self, path: str, top: int = 10) -> None:
+        """Writes the report as a JSON file.
+
+        Args:
+            path (str): The path of the file to write.
+            top (int): The number of modules to list as the slowest.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(top), file, indent=2)
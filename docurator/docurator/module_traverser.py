@@ -1,27 +1,576 @@
 """Run modules to invoke docurator decorators.
 
-This module provides functionality to dynamically import and invoke all Python 
-modules starting from a given path.
+This module provides functionality to collect the documentation of all Python
+modules starting from a given path. Modules are either imported, which invokes
+the `document_me` decorators, or parsed from their source without running them.
 
+Modules are found in one or several source roots, e.g. the source directories
+of every project in a monorepo, including PEP 420 namespace packages spread
+over several roots. Every module is found once, named as it is imported.
+
+Modules can be filtered by their dotted names and paths, and by their depth.
+Excluded packages are pruned while walking, so nothing within them is imported.
+
+Classes:
+    SourceModule: Describes a module found while walking a source tree.
+    ModuleFilter: Selects the modules to walk and collect.
 
 Functions:
-    invoke_modules(path: str): Invokes modules at the given directiry 
-        and subdirectories
+    walk_modules(paths: Roots, module_filter: ModuleFilter|None): Yields the modules
+        in the given roots and their subdirectories without importing them.
+    normalize_roots(paths: Roots): The absolute paths of source roots.
+    add_import_roots(paths: Roots): Puts source roots on `sys.path`.
+    invoke_modules(paths: Roots, engine: str, cache_dir: str|None, workers: int|None,
+        profiler: ImportProfiler|None, module_filter: ModuleFilter|None,
+        pool: WorkerPool|None): Collects the documentation of modules in the given
+        roots and their subdirectories, optionally across several worker processes
+        or isolated in a worker pool, and profiling each module.
+    collect_chunk(modules: list[SourceModule], engine: str, trace_memory: bool|None):
+        Collects modules in a worker process.
+    merge_chunk(result: dict[str, Any]): Merges the documentation collected by
+        `collect_chunk` into the registry.
 """
-import pkgutil
+import fnmatch
 import importlib
+import importlib.machinery
+import itertools
+import logging
+import math
+import multiprocessing
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Union
+
+from ast_collector import collect_module
+from doc_cache import DocCache, source_state
+from docurator import docurator
+from instrumentation import ImportProfiler, ModuleProfile
+from serialization import docs_from_dict, docs_to_dict
+
+if TYPE_CHECKING:
+    from worker_pool import CollectionReport, WorkerPool
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('import', 'ast')
+# The directory of docurator's own modules, which import each other by name.
+DOCURATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+CHUNKS_PER_WORKER = 4
+REGEX_PREFIX = 're:'
+PYCACHE = '__pycache__'
+
+# One root directory, or several roots.
+Roots = Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]]
+
+# Module file suffixes in the order the import system prefers them.
+_SUFFIXES = (
+    *importlib.machinery.EXTENSION_SUFFIXES,
+    *importlib.machinery.SOURCE_SUFFIXES,
+    *importlib.machinery.BYTECODE_SUFFIXES,
+)
+_SUFFIXES_BY_LENGTH = sorted(
+    ((suffix, rank) for rank, suffix in enumerate(_SUFFIXES)),
+    key=lambda item: -len(item[0]),
+)
+# Source packages are by far the most common, so are looked for first.
+_INIT_SUFFIXES = sorted(
+    _SUFFIXES, key=lambda suffix: suffix not in importlib.machinery.SOURCE_SUFFIXES
+)
+
+
+@dataclass(frozen=True)
+class SourceModule:
+    """Describes a module found while walking a source tree.
+
+    Attributes:
+        name (str): The dotted name of the module.
+        path (str|None): The path to the module file, None if it has no file.
+        is_package (bool): True if the module is a package.
+    """
+    name: str
+    path: str|None
+    is_package: bool
+
+
+@dataclass(frozen=True)
+class ModuleFilter:
+    """Selects the modules to walk and collect.
+
+    Patterns match the dotted name or the path of a module. They are globs,
+    e.g. `*.tests` or `*/migrations/*`, or regular expressions searched for
+    when prefixed with `re:`, e.g. `re:_tests?$`.
+
+    Attributes:
+        include (tuple[str, ...]): Only modules matching one of the patterns
+            are collected, all modules if empty. Packages which do not match
+            are still walked, their submodules may match.
+        exclude (tuple[str, ...]): Modules matching one of the patterns are not
+            collected. Packages matching are not walked, so their submodules
+            are never found or imported.
+        max_depth (int|None): The deepest level of modules collected, where top
+            level modules are at depth 0. Packages at this depth are not walked.
+    """
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    max_depth: int|None = None
+    _include: re.Pattern|None = field(init=False, repr=False, compare=False)
+    _exclude: re.Pattern|None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compiles the patterns once into a single expression each."""
+        object.__setattr__(self, '_include', _compile_patterns(self.include))
+        object.__setattr__(self, '_exclude', _compile_patterns(self.exclude))
+
+    def collects(self, mod: SourceModule) -> bool:
+        """True if the module should be collected."""
+        if self.excludes(mod) or not self.__within_depth(mod, 0):
+            return False
+        return self._include is None or _matches(self._include, mod)
+
+    def descends(self, mod: SourceModule) -> bool:
+        """True if the submodules of the package should be walked."""
+        return not self.excludes(mod) and self.__within_depth(mod, 1)
+
+    def excludes(self, mod: SourceModule) -> bool:
+        """True if the module matches an exclude pattern."""
+        return self._exclude is not None and _matches(self._exclude, mod)
+
+    def __within_depth(self, mod: SourceModule, offset: int) -> bool:
+        return self.max_depth is None or mod.name.count('.') + offset <= self.max_depth
 
-def invoke_modules(path: str) -> None:
-    """Invokes modules starting at the gicen path.
+
+def walk_modules(
+        paths: Roots,
+        module_filter: ModuleFilter|None = None
+    ) -> Iterator[SourceModule]:
+    """Yields the modules found in source roots without importing them.
+
+    Unlike `pkgutil.walk_packages`, packages are not imported to find their
+    submodules. Modules are named as the import system names them with the
+    roots on `sys.path`, in the given order:
+
+    - A module or regular package in an earlier root shadows one of the same
+      name in a later root.
+    - Directories without an `__init__` module are namespace packages, see
+      PEP 420, whose portions in all roots are walked as one package. They
+      are only yielded if modules are found within them.
+    - A directory given as a root is only walked as a root, not as a portion
+      of a namespace package in another root, and no directory is walked
+      twice, so overlapping roots yield every module once.
 
     Args:
-        path (str): A path pointing to the root of the modules to invoke.
+        paths (Roots): The root directory of the modules, or several roots.
+        module_filter (ModuleFilter|None): Selects the modules to yield and
+            the packages to walk. All modules if None.
+
+    Yields:
+        SourceModule: The modules found, packages before their submodules,
+            namespace packages without a path.
     """
-    abs_path = os.path.abspath(path)
-    
-    for mod in pkgutil.walk_packages([abs_path]):
-        try:   
-            importlib.import_module(mod.name)
-        except ModuleNotFoundError as e:
-            print(f"Failed to import {mod.name}: {e}")
+    roots = normalize_roots(paths)
+    walked = {os.path.realpath(root) for root in roots}
+    yield from _walk(roots, '', module_filter or ModuleFilter(), walked)
+
+
+def normalize_roots(paths: Roots) -> list[str]:
+    """The absolute paths of source roots, in order, without repetitions.
+
+    Args:
+        paths (Roots): A root directory, or several roots.
+
+    Returns:
+        list[str]: The absolute paths of the roots.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+
+def add_import_roots(paths: Roots) -> list[str]:
+    """Puts source roots on `sys.path`, so their modules import by name.
+
+    Roots already on the path keep their position, the others are inserted
+    in the given order, taking precedence like `walk_modules`. They follow
+    the directory of docurator's own modules, so a source module named like
+    one of them, e.g. `snapshot`, does not replace it. Such a module can not
+    be imported, and fails to collect with the 'import' engine.
+
+    Args:
+        paths (Roots): A root directory, or several roots.
+
+    Returns:
+        list[str]: The roots which were added.
+    """
+    added = [root for root in normalize_roots(paths) if root not in sys.path]
+    if added:
+        position = _docurator_path_index() + 1
+        sys.path[position:position] = added
+        importlib.invalidate_caches()
+    return added
+
+
+def _docurator_path_index() -> int:
+    # The position of docurator's own modules on `sys.path`, -1 if absent.
+    for index, entry in enumerate(sys.path):
+        if os.path.abspath(entry or os.curdir) == DOCURATOR_DIR:
+            return index
+    return -1
+
+
+def _walk(
+        paths: list[str],
+        prefix: str,
+        module_filter: ModuleFilter,
+        walked: set[str]
+    ) -> Iterator[SourceModule]:
+    # Like the path based finder, the first module or regular package of a
+    # name wins, otherwise the directories of that name form a namespace.
+    found = {}
+    portions = {}
+    for path in paths:
+        modules, namespaces = _scan(path)
+        for name, module in modules.items():
+            found.setdefault(name, module)
+        for name, directory in namespaces.items():
+            if os.path.realpath(directory) not in walked:
+                portions.setdefault(name, []).append(directory)
+
+    for name in sorted(found.keys() | portions.keys()):
+        if name in found:
+            origin, is_package = found[name]
+            mod = SourceModule(f'{prefix}{name}', origin, is_package)
+            if module_filter.collects(mod):
+                yield mod
+            if is_package and module_filter.descends(mod):
+                yield from _walk_package(
+                    [os.path.dirname(origin)], mod, module_filter, walked
+                )
+        else:
+            mod = SourceModule(f'{prefix}{name}', None, True)
+            if not module_filter.descends(mod):
+                continue
+            submodules = list(_walk_package(portions[name], mod, module_filter, walked)) # noqa: E501
+            if submodules and module_filter.collects(mod):
+                yield mod
+            yield from submodules
+
+
+def _walk_package(
+        paths: list[str],
+        mod: SourceModule,
+        module_filter: ModuleFilter,
+        walked: set[str]
+    ) -> Iterator[SourceModule]:
+    unwalked = []
+    for path in paths:
+        real_path = os.path.realpath(path)
+        if real_path not in walked:
+            walked.add(real_path)
+            unwalked.append(path)
+    if unwalked:
+        yield from _walk(unwalked, f'{mod.name}.', module_filter, walked)
+
+
+def _scan(directory: str) -> tuple[dict[str, tuple[str, bool]], dict[str, str]]:
+    # The modules and packages in a directory by name, with their origin and
+    # if they are packages, and the directories which may be namespaces.
+    modules = {}
+    ranks = {}
+    namespaces = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return modules, namespaces
+    for entry in entries:
+        name = entry.name
+        try:
+            is_directory = entry.is_dir()
+        except OSError:
+            continue
+        if is_directory:
+            if '.' in name or name == PYCACHE:
+                continue
+            init = _package_init(entry.path)
+            if init is not None:
+                # Packages take precedence over modules of the same name.
+                modules[name] = (init, True)
+                ranks[name] = -1
+            elif name.isidentifier():
+                namespaces[name] = entry.path
+            continue
+        module_name, rank = _module_name(name)
+        if module_name is None or rank >= ranks.get(module_name, len(_SUFFIXES)):
+            continue
+        modules[module_name] = (entry.path, False)
+        ranks[module_name] = rank
+    return modules, namespaces
+
+
+def _package_init(directory: str) -> str|None:
+    for suffix in _INIT_SUFFIXES:
+        path = os.path.join(directory, f'__init__{suffix}')
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _module_name(filename: str) -> tuple[str|None, int]:
+    # The name of the module a file defines, and the rank of its suffix.
+    for suffix, rank in _SUFFIXES_BY_LENGTH:
+        if filename.endswith(suffix):
+            name = filename[:-len(suffix)]
+            if name and '.' not in name and name != '__init__':
+                return name, rank
+            return None, rank
+    return None, len(_SUFFIXES)
+
+
+def _compile_patterns(patterns: tuple[str, ...]) -> re.Pattern|None:
+    # Globs match the whole text, regular expressions are searched for.
+    if not patterns:
+        return None
+    expressions = [
+        pattern[len(REGEX_PREFIX):] if pattern.startswith(REGEX_PREFIX)
+        else rf'\A(?:{fnmatch.translate(pattern)})'
+        for pattern in patterns
+    ]
+    return re.compile('|'.join(f'(?:{expression})' for expression in expressions))
+
+
+def _matches(pattern: re.Pattern, mod: SourceModule) -> bool:
+    if pattern.search(mod.name):
+        return True
+    return mod.path is not None and bool(
+        pattern.search(mod.path.replace(os.sep, '/'))
+    )
+
+
+def invoke_modules(
+        paths: Roots,
+        engine: str = 'import',
+        cache_dir: str|None = None,
+        workers: int|None = None,
+        profiler: ImportProfiler|None = None,
+        module_filter: ModuleFilter|None = None,
+        pool: 'WorkerPool|None' = None
+    ) -> 'CollectionReport|None':
+    """Invokes the modules found in source roots, see `walk_modules`.
+
+    With the 'import' engine the roots are put on `sys.path` once for the
+    whole run, see `add_import_roots`, and stay there for modules imported
+    or reloaded later.
+
+    Args:
+        paths (Roots): The root directory of the modules to invoke, or several roots.
+        engine (str): How the documentation is collected. 'import' imports
+            the modules to invoke the decorators, 'ast' parses their source.
+        cache_dir (str|None): A directory to cache the documentation of each
+            module in. Modules with unchanged source are loaded from the cache
+            instead of being collected. No caching if None.
+        workers (int|None): The number of worker processes to collect the
+            modules with. Collected in this process if None or 1.
+        profiler (ImportProfiler|None): Records a profile of the collection
+            of every module which is not loaded from the cache.
+        module_filter (ModuleFilter|None): Selects the modules to collect,
+            excluded packages are never imported. All modules if None.
+        pool (WorkerPool|None): Collects the modules in isolated workers with
+            a timeout per module, instead of `workers`. Not isolated if None.
+
+    Returns:
+        CollectionReport|None: The modules collected in the pool and those
+            which failed, timed out or crashed their worker. None without a pool.
+
+    Raises:
+        ValueError: If the provided engine or number of workers is not valid.
+    """ # noqa: E501
+    if engine not in ENGINES:
+        raise ValueError(f'Engine {engine} was not recognized.')
+    if workers is not None and workers < 1:
+        raise ValueError('The number of workers must be at least 1.')
+    cache = None if cache_dir is None else DocCache(cache_dir, engine)
+    if engine == 'import':
+        # Spawned workers start with the same `sys.path`.
+        add_import_roots(paths)
+
+    modules = []
+    # The state of each source to cache, read before the module is collected.
+    states = {}
+    for mod in walk_modules(paths, module_filter):
+        entry = None
+        if cache is not None and mod.path is not None:
+            entry = cache.load(mod.name, mod.path)
+            if entry is None:
+                states[mod.name] = source_state(mod.path)
+        if entry is None:
+            modules.append(mod)
+        elif entry.module_docs is not None:
+            docurator.register_module(entry.module_docs)
+
+    report = None
+    if pool is not None:
+        report = pool.collect(modules, engine, profiler)
+        names = set(report.collected)
+        collected = [mod for mod in modules if mod.name in names]
+    elif workers is None or workers == 1:
+        collected = (
+            mod for mod in modules if _collect_module(mod, engine, profiler)
+        )
+    else:
+        collected = _collect_parallel(modules, engine, workers, profiler)
+
+    # Failures are not cached, they might depend on the environment.
+    for mod in collected:
+        state = states.get(mod.name)
+        if cache is not None and state is not None:
+            cache.store(mod.name, mod.path, docurator.docs.get(mod.name), state)
+    return report
+
+
+def _collect_module(
+        mod: SourceModule,
+        engine: str,
+        profiler: ImportProfiler|None = None
+    ) -> bool:
+    collect = _import_module if engine == 'import' else _parse_module
+    if profiler is None:
+        return collect(mod) is None
+    with profiler.profile(mod.name) as profile:
+        error = collect(mod)
+        if error is not None:
+            profile.error = repr(error)
+    return error is None
+
+
+def _collect_parallel(
+        modules: list[SourceModule],
+        engine: str,
+        workers: int,
+        profiler: ImportProfiler|None
+    ) -> list[SourceModule]:
+    # Several chunks per worker balances modules with slow imports.
+    chunk_size = max(1, math.ceil(len(modules) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [
+        modules[start:start + chunk_size]
+        for start in range(0, len(modules), chunk_size)
+    ]
+    # Spawned workers start with an empty docurator and no imported modules.
+    context = multiprocessing.get_context('spawn')
+    trace_memory = None if profiler is None else profiler.trace_memory
+    collected = set()
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        for result in executor.map(
+                collect_chunk,
+                chunks,
+                itertools.repeat(engine),
+                itertools.repeat(trace_memory),
+            ):
+            merge_chunk(result)
+            collected.update(result['collected'])
+            for profile in result['profiles']:
+                profiler.record(ModuleProfile(**profile))
+    return [mod for mod in modules if mod.name in collected]
+
+
+def collect_chunk(
+        modules: list[SourceModule],
+        engine: str,
+        trace_memory: bool|None
+    ) -> dict[str, Any]:
+    """Collects a chunk of modules in a worker process.
+
+    Returns:
+        dict[str, Any]: The serialized documentation of the modules,
+            including modules imported by them, the methods which could
+            not be attached to a class, the names of the modules
+            collected without failure and their profiles if profiled.
+    """
+    # Workers are reused, only return what this chunk collected.
+    docurator.clear()
+    profiler = None if trace_memory is None else ImportProfiler(trace_memory)
+    collected = [
+        mod.name for mod in modules if _collect_module(mod, engine, profiler)
+    ]
+    return {
+        'modules': [
+            docs_to_dict(module_docs) for module_docs in docurator.docs.values()
+        ],
+        'unattached': [
+            [module_name, class_qualname, [docs_to_dict(doc) for doc in methods]]
+            for (module_name, class_qualname), methods
+            in docurator.unattached_methods.items()
+        ],
+        'collected': collected,
+        'profiles': [] if profiler is None else [
+            asdict(profile) for profile in profiler.profiles
+        ],
+    }
+
+
+def merge_chunk(result: dict[str, Any], replace: Iterable[str] = ()) -> None:
+    """Merges the documentation collected by `collect_chunk` into the registry.
+
+    Args:
+        result (dict[str, Any]): The result of `collect_chunk`.
+        replace (Iterable[str]): The dotted names of modules collected again,
+            whose documentation in the registry is removed rather than merged
+            into, so changed docstrings and signatures are not kept stale.
+    """
+    for module_name in replace:
+        docurator.remove_module(module_name)
+    for module_data in result['modules']:
+        docurator.merge(docs_from_dict(module_data))
+    for module_name, class_qualname, methods in result['unattached']:
+        docurator.merge_methods(
+            module_name,
+            class_qualname,
+            [docs_from_dict(method) for method in methods],
+        )
+
+
+def _import_module(mod: SourceModule) -> BaseException|None:
+    # A module failing to import, or exiting, does not end the collection.
+    try:
+        module = importlib.import_module(mod.name)
+    except (Exception, SystemExit) as e:
+        logger.warning(f'Failed to import {mod.name}: {e!r}')
+        return e
+    error = _shadowing_error(mod, module)
+    if error is not None:
+        logger.warning(f'Failed to import {mod.name}: {error}')
+    return error
+
+
+def _shadowing_error(mod: SourceModule, module: ModuleType) -> ImportError|None:
+    # Another module of the same name may have been imported instead, e.g.
+    # one of docurator's own modules, or one earlier on `sys.path`.
+    path = getattr(module, '__file__', None)
+    if mod.path is None or path is None:
+        return None
+    if os.path.abspath(path) == os.path.abspath(mod.path):
+        return None
+    try:
+        if os.path.samefile(path, mod.path):
+            return None
+    except OSError:
+        pass
+    return ImportError(
+        f'{mod.name} resolves to {path}, not {mod.path}',
+        name=mod.name, path=mod.path,
+    )
+
+
+def _parse_module(mod: SourceModule) -> Exception|None:
+    if mod.path is None or not mod.path.endswith('.py'):
+        return None
+    try:
+        module_docs = collect_module(mod.name, mod.path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.warning(f'Failed to parse {mod.name}: {e}')
+        return e
+    if module_docs is not None:
+        docurator.register_module(module_docs)
+    return None
@@ -0,0 +1,428 @@
+"""Contains the storing class collecting the documentation of decorated objects.
+
+This module is the collection machinery behind `document_me`. It is only imported
+in doc mode, or when the registry is used directly, so production processes do
+not load it.
+
+Classes:
+    Docurator: Collects documentation information for callable objects and stores them per module.
+
+Attributes:
+    docurator (Docurator): The registry `document_me` adds decorated objects to.
+""" # noqa: E501
+
+import logging
+import sys
+import threading
+from collections import deque
+from types import ModuleType
+from typing import Callable, Iterable, TypeVar, Any
+import inspect
+from doc_containers import (
+    ClassDocs,
+    Docs,
+    Lazy,
+    MemoryReport,
+    ModuleDocs,
+    ObjectDocs,
+    memory_report,
+)
+
+logger = logging.getLogger(__name__)
+CallableObject = TypeVar("F", bound=Callable[..., Any])
+# A captured object, its tags, and the name and docstring of its module.
+_Capture = tuple[CallableObject, Iterable[str], str, str|None]
+
+
+class Docurator:
+    """A class for collecting documentation information for callable objects.
+
+    Decorated objects are only captured when decorated. The documentation
+    tree is built from the captures in one pass by `finalize`, which runs
+    before the documentation is read.
+
+    Modules can be imported from several threads at once. Every thread
+    captures into its own buffer without locking, the buffers are drained
+    by `finalize`, which like all changes to the tree holds a lock. The
+    buffers of threads which ended are dropped once drained.
+
+    Attributes:
+        docs (dict[str, ModuleDocs]): The collected documentation by module name.
+        unattached_methods (dict[tuple[str, str], set[Docs]]): Documented methods
+            whose class is not documented, by module name and class qualname.
+    """ #noqa E501
+    def __init__(self) -> None:
+        """Initializes empty storage for documentation information."""
+        self.__module_docs = {}
+        self.__lock = threading.RLock()
+
+        # Objects decorated since the last finalize, per thread. Methods are
+        # decorated before their class, the tree is built once all are captured.
+        self.__local = threading.local()
+        self.__buffers = []
+        # Captures counted by the buffers of threads which ended.
+        self.__ended_count = 0
+        # Captures drained by a finalize which failed, built by the next one.
+        self.__pending = []
+
+        # The documented classes by module name and qualname.
+        self.__classes = {}
+
+        # Methods whose class has not been documented, by module name
+        # and class qualname. Attached if the class is documented later.
+        self.__unattached = {}
+
+    @property
+    def docs(self) -> dict[str, ModuleDocs]:
+        """Get the dictionary containing the fetched documentations."""
+        self.finalize()
+        return self.__module_docs
+
+    @property
+    def capture_count(self) -> int:
+        """The number of objects captured since the docurator was created."""
+        buffers = self.__buffers
+        return self.__ended_count + sum(buffer.count for buffer in buffers)
+
+    @property
+    def unattached_methods(self) -> dict[tuple[str, str], set[Docs]]:
+        """Methods waiting for their class, by module name and class qualname."""
+        self.finalize()
+        return self.__unattached
+
+    def add(self, func: CallableObject, tags: Iterable[str] = ()) -> None:
+        """Captures a callable object to be documented.
+
+        The documentation is created by the next `finalize`. The module of
+        the object is resolved now, while it is imported.
+
+        Args:
+            func (Callable): The callable object (e.g., function, method) for which to collect documentation.
+            tags (Iterable[str]): The audiences the object is documented for.
+
+        Raises:
+            ValueError: If `func` is not a named callable object, or its
+                module can not be resolved.
+        """ #noqa: E501
+        if isinstance(func, classmethod):
+            f = func.__func__
+        else: 
+            f = func
+
+        if not callable(f):
+            raise ValueError('The provided object must be callable.')
+        # Checked now, a capture which can not be built is kept by finalize.
+        if not hasattr(f, '__qualname__'):
+            raise ValueError('The provided object must have a qualified name.')
+        # Import machinery may remove a module from `sys.modules` before
+        # the next finalize, e.g. when its import fails.
+        module = _resolve_module(f)
+        if module is not None:
+            module_name, module_docstring = module.__name__, module.__doc__
+        else:
+            module_name, module_docstring = getattr(f, '__module__', None), None
+        if module_name is None:
+            raise ValueError(f'The module of {f!r} could not be resolved.')
+        buffer = getattr(self.__local, 'buffer', None)
+        if buffer is None:
+            buffer = _CaptureBuffer(threading.current_thread())
+            self.__local.buffer = buffer
+            with self.__lock:
+                self.__buffers.append(buffer)
+        buffer.captures.append((f, tags, module_name, module_docstring))
+        buffer.count += 1
+
+    def finalize(self) -> None:
+        """Builds the documentation tree from the captured objects.
+
+        Captures are sorted by qualname, so every class is documented
+        before the methods and nested classes within it. Methods whose
+        class is not documented are logged and kept in `unattached_methods`.
+        The tree does not depend on the threads the objects were captured in.
+        If building fails, the captures are kept for the next finalize.
+        """
+        with self.__lock:
+            captures, self.__pending = self.__pending, []
+            # Threads which ended before draining can not capture anymore.
+            ended = [
+                buffer for buffer in self.__buffers if not buffer.thread.is_alive()
+            ]
+            for buffer in self.__buffers:
+                # Other threads may capture meanwhile, popping is atomic.
+                try:
+                    while True:
+                        captures.append(buffer.captures.popleft())
+                except IndexError:
+                    pass
+            if ended:
+                self.__drop_buffers(ended)
+            if captures:
+                try:
+                    self.__build(captures)
+                except BaseException:
+                    self.__pending = captures
+                    raise
+
+    def register_module(self, module_docs: ModuleDocs) -> None:
+        """Adds documentation collected for a whole module.
+
+        Used when the documentation is collected without invoking
+        the decorators, replacing existing documentation of the module.
+
+        Args:
+            module_docs (ModuleDocs): The documentation of the module.
+        """
+        with self.__lock:
+            self.finalize()
+            self.__module_docs[module_docs.name] = module_docs
+            self.__classes.pop(module_docs.name, None)
+
+    def remove_module(self, module_name: str) -> ModuleDocs|None:
+        """Removes the documentation of a module.
+
+        Used before a module is collected again, so objects which are no
+        longer documented do not remain in the tree.
+
+        Args:
+            module_name (str): The dotted name of the module.
+
+        Returns:
+            ModuleDocs|None: The removed documentation, None if there was none.
+        """
+        with self.__lock:
+            self.finalize()
+            self.__classes.pop(module_name, None)
+            for key in [key for key in self.__unattached if key[0] == module_name]:
+                del self.__unattached[key]
+            return self.__module_docs.pop(module_name, None)
+
+    def merge(self, module_docs: ModuleDocs) -> None:
+        """Merges documentation of a module collected by another docurator.
+
+        Classes documented in both are merged recursively, other
+        documentation keeps the first one added, like `add` does.
+
+        Args:
+            module_docs (ModuleDocs): The documentation of the module.
+        """
+        with self.__lock:
+            self.finalize()
+            existing = self.__module_docs.get(module_docs.name)
+            if existing is None:
+                self.__module_docs[module_docs.name] = module_docs
+            else:
+                self.__merge_contents(existing, module_docs)
+
+    def merge_methods(
+            self,
+            module_name: str,
+            class_qualname: str,
+            methods: Iterable[Docs]
+        ) -> None:
+        """Merges methods another docurator could not attach to their class.
+
+        Args:
+            module_name (str): The name of the module containing the class.
+            class_qualname (str): The qualified name of the class.
+            methods (Iterable[Docs]): The documentation of the methods.
+        """
+        with self.__lock:
+            self.finalize()
+            class_docs = self.__find_class(module_name, class_qualname)
+            if class_docs is not None:
+                class_docs.update(methods)
+                return
+            key = (module_name, class_qualname)
+            self.__unattached.setdefault(key, set()).update(methods)
+
+    def export_snapshot(self, path: str) -> None:
+        """Writes the collected documentation to a snapshot file.
+
+        Methods whose class is not documented are not included.
+
+        Args:
+            path (str): The path of the snapshot file to write.
+        """
+        from snapshot import write_snapshot
+        write_snapshot(path, self.docs.values())
+
+    def load_snapshot(self, path: str, names: Iterable[str]|None = None) -> None:
+        """Loads documentation from a snapshot file.
+
+        The loaded modules replace existing documentation of the same modules.
+
+        Args:
+            path (str): The path of the snapshot file.
+            names (Iterable[str]|None): The dotted names of the modules to load,
+                None loads all modules.
+        """
+        from snapshot import load_snapshot
+        for module_docs in load_snapshot(path, names).values():
+            self.register_module(module_docs)
+
+    def memory_report(self) -> MemoryReport:
+        """Reports the memory used by the collected documentation.
+
+        Returns:
+            MemoryReport: The bytes used by module and by kind of documentation.
+        """
+        return memory_report(self.docs.values())
+
+    def clear(self) -> None:
+        """Removes all collected documentation."""
+        with self.__lock:
+            self.__module_docs.clear()
+            self.__pending.clear()
+            for buffer in self.__buffers:
+                buffer.captures.clear()
+            self.__classes.clear()
+            self.__unattached.clear()
+
+    def __build(self, captures: list[_Capture]) -> None:
+        # Every doc is created before the tree changes, so a capture
+        # failing leaves the tree as it was for the next finalize.
+        created = [
+            (module_name, module_docstring, self.__create_doc(f, tags))
+            for f, tags, module_name, module_docstring in captures
+        ]
+        documented = []
+        for module_name, module_docstring, doc in created:
+            module_docs = self.__module_docs.get(module_name)
+            if module_docs is None:
+                module_docs = ModuleDocs(module_name, module_docstring)
+                self.__module_docs[module_name] = module_docs
+            documented.append((module_docs, doc))
+        documented.sort(key=lambda item: (item[0].name, item[1].qualname))
+
+        unattached = set()
+        for module_docs, doc in documented:
+            classes = self.__classes.setdefault(module_docs.name, {})
+            if isinstance(doc, ClassDocs):
+                classes[doc.qualname] = doc
+                # Methods from earlier captures waiting for this class.
+                doc.update(self.__unattached.pop(
+                    (module_docs.name, doc.qualname), ()
+                ))
+
+            class_qualname, _, _ = doc.qualname.rpartition('.')
+            if not class_qualname:
+                module_docs.add(doc)
+                continue
+            class_docs = classes.get(class_qualname) or self.__find_class(
+                module_docs.name, class_qualname
+            )
+            if class_docs is not None:
+                class_docs.add(doc)
+            else:
+                key = (module_docs.name, class_qualname)
+                self.__unattached.setdefault(key, set()).add(doc)
+                unattached.add(key)
+
+        waiting = self.__waiting_modules() if unattached else set()
+        for module_name, class_qualname in sorted(unattached):
+            if module_name in waiting:
+                continue
+            logger.warning(
+                f'{class_qualname} in {module_name} is not documented, '
+                'its documented methods are not attached.'
+            )
+
+    def __drop_buffers(self, ended: list['_CaptureBuffer']) -> None:
+        # Threads are started per request by the doc server, their drained
+        # buffers would otherwise be walked by every finalize.
+        dropped = {id(buffer) for buffer in ended}
+        self.__ended_count += sum(buffer.count for buffer in ended)
+        self.__buffers = [
+            buffer for buffer in self.__buffers if id(buffer) not in dropped
+        ]
+
+    def __waiting_modules(self) -> set[str]:
+        # Modules other threads are still importing, or have captured objects
+        # from since the buffers were drained. Their classes may be captured
+        # after their methods, so the methods are not reported yet. Modules
+        # which finish importing before the check have all their captures
+        # waiting in the buffers, as the lock is held.
+        waiting = _importing_modules()
+        for buffer in self.__buffers:
+            waiting.update(capture[2] for capture in list(buffer.captures))
+        return waiting
+
+    @classmethod
+    def __merge_contents(
+            cls,
+            target: ModuleDocs|ClassDocs,
+            source: ModuleDocs|ClassDocs
+        ) -> None:
+        for doc in source.contents:
+            current = target.get(doc.name)
+            if isinstance(current, ClassDocs) and isinstance(doc, ClassDocs):
+                cls.__merge_contents(current, doc)
+            else:
+                target.add(doc)
+
+    def __find_class(self, module_name: str, class_qualname: str) -> ClassDocs|None: # noqa: E501
+        container = self.__module_docs.get(module_name)
+        for name in class_qualname.split('.'):
+            if container is None:
+                return None
+            container = container.get_class(name)
+        return container
+
+    @staticmethod
+    def __create_doc(f: CallableObject, tags: Iterable[str]) -> ObjectDocs:
+        # Signatures and parents are only computed when used,
+        # keeping the decorated object until then.
+        signature = Lazy(_signature, f)
+        if not isinstance(f, type):
+            return ObjectDocs(
+                f.__name__, f.__doc__, f.__qualname__,
+                f.__class__.__name__, signature, tags
+            )
+        return ClassDocs(
+            f.__name__, f.__doc__, f.__qualname__,
+            f.__class__.__name__, signature, Lazy(_class_parents, f), tags
+        )
+
+
+class _CaptureBuffer:
+    # The objects captured by one thread with their tags and the name and
+    # docstring of their module, only appended to by that thread.
+    __slots__ = ('thread', 'captures', 'count')
+
+    def __init__(self, thread: threading.Thread) -> None:
+        self.thread = thread
+        self.captures = deque()
+        self.count = 0
+
+
+def _resolve_module(f: CallableObject) -> ModuleType:
+    # The defining module is nearly always imported under `__module__`,
+    # `inspect.getmodule` may search all modules and their files.
+    module = sys.modules.get(getattr(f, '__module__', None))
+    if module is None:
+        module = inspect.getmodule(f)
+    return module
+
+
+def _importing_modules() -> set[str]:
+    # The modules whose body is still executing, in any thread.
+    return {
+        name for name, module in list(sys.modules.items())
+        if getattr(getattr(module, '__spec__', None), '_initializing', False)
+    }
+
+
+def _signature(f: CallableObject) -> inspect.Signature|None:
+    # Classes deriving from builtin types without an `__init__` of their own,
+    # e.g. exceptions, have no signature. Resolved lazily, so not raised here.
+    try:
+        return inspect.signature(f)
+    except (ValueError, TypeError):
+        return None
+
+
+def _class_parents(class_: type) -> list[type]|None:
+    return [obj for obj in class_.__bases__ if obj is not object] or None
+
+
+docurator = Docurator()
@@ -0,0 +1,393 @@
+"""Full text search over the collected documentation.
+
+The search index is an inverted index from tokens to the documented classes
+and objects containing them, written next to the rendered documentation.
+Queries are answered from the index file alone, without collecting the
+documentation again.
+
+Names, qualified names, parameter names and docstrings are tokenized into
+lower case words, splitting snake_case and CamelCase. Every token scores a
+document by the weights of the fields it appears in, see `FIELD_WEIGHTS`.
+
+The index file is JSON, containing:
+
+    format: The version of the index layout, see `INDEX_FORMAT`.
+    documents: The fully qualified name, module, kind and summary of every
+        document, indexed by position.
+    postings: Per token, a flat list of document positions and scores.
+    modules: Per module, a digest of its indexed fields, its documents and tokens.
+
+Modules are updated incrementally, only modules whose digest changed
+are tokenized again, and only their postings are touched.
+
+Classes:
+    SearchResult: A document matching a query.
+    SearchIndex: An inverted index over the documentation.
+
+Functions:
+    tokenize(text: str): Splits text into lower case search tokens.
+    summary(doc: Docs): The first line of the docstring of documentation.
+    write_search_index(docs: dict[str, ModuleDocs], target: str): Updates the
+        search index written next to the rendered documentation.
+""" # noqa: E501
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from doc_containers import ClassDocs, Docs, DocsContainer, ModuleDocs
+
+INDEX_FORMAT = 1
+INDEX_FILENAME = 'search_index.json'
+FIELD_WEIGHTS = {'name': 8.0, 'qualname': 4.0, 'parameter': 2.0, 'docstring': 1.0}
+# Tokens matching a query word by prefix score less than exact matches.
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_TOKENS = 256
+
+_WORD = re.compile(r'[A-Za-z0-9_]+')
+_PART = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'be', 'by', 'for', 'if', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'this', 'to', 'with',
+))
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """A document matching a query.
+
+    Attributes:
+        name (str): The fully qualified name of the documented object.
+        module (str): The dotted name of the module documenting the object.
+        kind (str): 'class' or 'object'.
+        summary (str): The first line of the docstring.
+        score (float): The relevance of the document, higher is better.
+    """
+    name: str
+    module: str
+    kind: str
+    summary: str
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lower case search tokens.
+
+    Words are split on snake_case and CamelCase, keeping the whole word
+    as well. Single characters and common English words are dropped.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The tokens, in order, with repetitions.
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        parts = _PART.findall(word)
+        whole = word.strip('_').lower()
+        if len(parts) > 1 or (parts and parts[0].lower() != whole):
+            tokens.append(whole)
+        tokens.extend(part.lower() for part in parts)
+    return [
+        token for token in tokens
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+class SearchIndex:
+    """An inverted index over the documentation of classes and objects.
+
+    Attributes:
+        modules (list[str]): The dotted names of the indexed modules.
+    """
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self.__documents = []
+        self.__postings = {}
+        self.__modules = {}
+        self.__sorted_tokens = None
+
+    @property
+    def modules(self) -> list[str]:
+        """The dotted names of the indexed modules."""
+        return list(self.__modules)
+
+    def update(self, modules: Iterable[ModuleDocs]) -> list[str]:
+        """Indexes modules, replacing earlier entries of the same modules.
+
+        Modules whose indexed fields are unchanged are skipped.
+
+        Args:
+            modules (Iterable[ModuleDocs]): The documentation of the modules.
+
+        Returns:
+            list[str]: The dotted names of the modules which were indexed.
+        """
+        updated = []
+        for module_docs in modules:
+            fields = list(_document_fields(module_docs))
+            digest = hashlib.sha256(
+                json.dumps(fields, separators=(',', ':')).encode('utf-8')
+            ).hexdigest()
+            entry = self.__modules.get(module_docs.name)
+            if entry is not None and entry['digest'] == digest:
+                continue
+            self.remove(module_docs.name)
+            self.__add_module(module_docs.name, digest, fields)
+            updated.append(module_docs.name)
+        return updated
+
+    def remove(self, module_name: str) -> None:
+        """Removes a module from the index.
+
+        Args:
+            module_name (str): The dotted name of the module.
+        """
+        entry = self.__modules.pop(module_name, None)
+        if entry is None:
+            return
+        removed = set(entry['documents'])
+        for position in removed:
+            self.__documents[position] = None
+        for token in entry['tokens']:
+            postings = self.__postings[token]
+            kept = [
+                value
+                for position, score in zip(postings[::2], postings[1::2])
+                if position not in removed
+                for value in (position, score)
+            ]
+            if kept:
+                self.__postings[token] = kept
+            else:
+                del self.__postings[token]
+                self.__sorted_tokens = None
+
+    def search(self, query: str, limit: int = 10) -> list[SearchResult]:
+        """Finds the documents matching every word of a query.
+
+        Each word matches tokens equal to it, or starting with it at a lower
+        score. Documents are ranked by the sum of their best score per word.
+
+        Args:
+            query (str): The words to search for.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[SearchResult]: The best matching documents, best first.
+        """
+        scores = None
+        for word in dict.fromkeys(tokenize(query)):
+            word_scores = {}
+            for token, weight in self.__matching_tokens(word):
+                postings = self.__postings[token]
+                for position, score in zip(postings[::2], postings[1::2]):
+                    score *= weight
+                    if score > word_scores.get(position, 0.0):
+                        word_scores[position] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    position: score + word_scores[position]
+                    for position, score in scores.items()
+                    if position in word_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(
+            (scores or {}).items(),
+            key=lambda item: (-item[1], self.__documents[item[0]][0]),
+        )
+        return [
+            SearchResult(*self.__documents[position], score)
+            for position, score in ranked[:limit]
+        ]
+
+    def save(self, path: str) -> None:
+        """Writes the index to a file, compacting the document positions.
+
+        The file is replaced atomically.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        positions = {}
+        documents = []
+        for position, document in enumerate(self.__documents):
+            if document is not None:
+                positions[position] = len(documents)
+                documents.append(document)
+
+        data = {
+            'format': INDEX_FORMAT,
+            'documents': documents,
+            'postings': {
+                token: [
+                    value
+                    for position, score in zip(postings[::2], postings[1::2])
+                    for value in (positions[position], score)
+                ]
+                for token, postings in self.__postings.items()
+            },
+            'modules': {
+                name: {
+                    'digest': entry['digest'],
+                    'documents': [positions[p] for p in entry['documents']],
+                    'tokens': entry['tokens'],
+                }
+                for name, entry in self.__modules.items()
+            },
+        }
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        # Unlike `json.dump`, `json.dumps` encodes with the C accelerator.
+        text = json.dumps(data, separators=(',', ':'))
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> SearchIndex:
+        """Reads an index from a file.
+
+        Args:
+            path (str): The path of the index file.
+
+        Returns:
+            SearchIndex: The index.
+
+        Raises:
+            ValueError: If the file is not an index this version can read.
+        """
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        if not isinstance(data, dict) or data.get('format') != INDEX_FORMAT:
+            raise ValueError(f'{path} is not a search index of format {INDEX_FORMAT}.') # noqa: E501
+        index = cls()
+        index.__documents = data['documents']
+        index.__postings = data['postings']
+        index.__modules = data['modules']
+        return index
+
+    def __add_module(
+            self,
+            module_name: str,
+            digest: str,
+            fields: list[list]
+        ) -> None:
+        positions = []
+        module_tokens = set()
+        for name, kind, summary, field_texts in fields:
+            position = len(self.__documents)
+            self.__documents.append([name, module_name, kind, summary])
+            positions.append(position)
+
+            token_scores = {}
+            for field, text in field_texts:
+                for token in set(tokenize(text)):
+                    token_scores[token] = (
+                        token_scores.get(token, 0.0) + FIELD_WEIGHTS[field]
+                    )
+            for token, score in token_scores.items():
+                postings = self.__postings.get(token)
+                if postings is None:
+                    self.__postings[token] = postings = []
+                    self.__sorted_tokens = None
+                postings.extend((position, score))
+            module_tokens.update(token_scores)
+
+        self.__modules[module_name] = {
+            'digest': digest,
+            'documents': positions,
+            'tokens': sorted(module_tokens),
+        }
+
+    def __matching_tokens(self, word: str) -> Iterator[tuple[str, float]]:
+        if word in self.__postings:
+            yield word, 1.0
+        if self.__sorted_tokens is None:
+            self.__sorted_tokens = sorted(self.__postings)
+        tokens = self.__sorted_tokens
+        start = bisect.bisect_right(tokens, word)
+        for token in tokens[start:start + MAX_PREFIX_TOKENS]:
+            if not token.startswith(word):
+                break
+            yield token, PREFIX_WEIGHT
+
+
+def write_search_index(docs: dict[str, ModuleDocs], target: str) -> list[str]:
+    """Updates the search index written next to the rendered documentation.
+
+    The existing index in the target directory is updated incrementally,
+    modules no longer documented are removed from it.
+
+    Args:
+        docs (dict[str, ModuleDocs]): The documentation by module name,
+            e.g. `Docurator.docs`.
+        target (str): The directory the documentation is written to.
+
+    Returns:
+        list[str]: The dotted names of the modules which were indexed or removed.
+    """ # noqa: E501
+    path = os.path.join(target, INDEX_FILENAME)
+    try:
+        index = SearchIndex.load(path)
+    except (OSError, ValueError, KeyError):
+        index = SearchIndex()
+
+    changed = [name for name in index.modules if name not in docs]
+    for name in changed:
+        index.remove(name)
+    changed.extend(index.update(docs.values()))
+    if changed or not os.path.exists(path):
+        os.makedirs(target, exist_ok=True)
+        index.save(path)
+    return changed
+
+
+def _document_fields(module_docs: ModuleDocs) -> Iterator[list]:
+    # The indexed fields of every class and object in a module, in a stable
+    # order, as [name, kind, summary, [[field, text], ...]].
+    stack = sorted(module_docs.contents, key=lambda doc: doc.qualname, reverse=True) # noqa: E501
+    while stack:
+        doc = stack.pop()
+        yield [
+            f'{module_docs.name}.{doc.qualname}',
+            'class' if isinstance(doc, ClassDocs) else 'object',
+            summary(doc),
+            [
+                ['name', doc.name],
+                ['qualname', doc.qualname],
+                *(['parameter', name] for name in _parameter_names(doc)),
+                ['docstring', doc.docstring or ''],
+            ],
+        ]
+        if isinstance(doc, DocsContainer):
+            stack.extend(sorted(doc.contents, key=lambda d: d.qualname, reverse=True)) # noqa: E501
+
+
+def _parameter_names(doc: Docs) -> list[str]:
+    signature = doc.f_signature
+    if signature is None:
+        return []
+    return [name for name in signature.parameters if name not in ('self', 'cls')]
+
+
+def summary(doc: Docs) -> str:
+    """The first line of the docstring of documentation.
+
+    Args:
+        doc (Docs): The documentation.
+
+    Returns:
+        str: The first line, empty if there is no docstring.
+    """
+    docstring = (doc.docstring or '').strip()
+    return docstring.partition('\n')[0].strip()
@@ -0,0 +1,153 @@
+"""Convert documentation containers to and from plain data.
+
+The documentation tree holds runtime objects, such as signatures and parent
+classes, which can not be stored or sent between processes as they are.
+This module converts the containers to dictionaries of plain, JSON compatible
+values and back.
+
+Values which only exist at runtime are stored as the text they display as.
+When loaded they become `SourceText`, so a loaded signature displays exactly
+as the collected one.
+
+Functions:
+    signature_to_dict(signature: inspect.Signature|None): Converts a signature to plain data.
+    signature_from_dict(data: dict|None): Rebuilds a signature from plain data.
+    docs_to_dict(doc: Docs): Converts a documentation tree to plain data.
+    docs_from_dict(data: dict): Rebuilds a documentation tree from plain data.
+""" # noqa: E501
+from __future__ import annotations
+
+import inspect
+from typing import Any
+
+from ast_collector import SourceText
+from doc_containers import ClassDocs, Docs, ModuleDocs, ObjectDocs, parent_name
+
+
+def signature_to_dict(signature: inspect.Signature|None) -> dict[str, Any]|None:
+    """Converts a signature to plain data.
+
+    Args:
+        signature (inspect.Signature|None): The signature to convert,
+            None if the object has no signature.
+
+    Returns:
+        dict[str, Any]|None: The parameters and return annotation of the
+            signature, None without a signature.
+    """
+    if signature is None:
+        return None
+    parameters = []
+    for parameter in signature.parameters.values():
+        data = {'name': parameter.name, 'kind': parameter.kind.name}
+        if parameter.default is not parameter.empty:
+            data['default'] = repr(parameter.default)
+        if parameter.annotation is not parameter.empty:
+            data['annotation'] = inspect.formatannotation(parameter.annotation)
+        parameters.append(data)
+
+    data = {'parameters': parameters}
+    if signature.return_annotation is not signature.empty:
+        data['returns'] = inspect.formatannotation(signature.return_annotation)
+    return data
+
+
+def signature_from_dict(data: dict[str, Any]|None) -> inspect.Signature|None:
+    """Rebuilds a signature from plain data.
+
+    Args:
+        data (dict[str, Any]|None): Data created by `signature_to_dict`.
+
+    Returns:
+        inspect.Signature|None: The signature, with annotations and defaults as `SourceText`,
+            None without a signature.
+    """ # noqa: E501
+    if data is None:
+        return None
+    empty = inspect.Parameter.empty
+    parameters = [
+        inspect.Parameter(
+            parameter['name'],
+            getattr(inspect.Parameter, parameter['kind']),
+            default=_source_text(parameter.get('default', empty)),
+            annotation=_source_text(parameter.get('annotation', empty)),
+        )
+        for parameter in data['parameters']
+    ]
+    return inspect.Signature(
+        parameters,
+        return_annotation=_source_text(data.get('returns', empty)),
+    )
+
+
+def docs_to_dict(doc: Docs) -> dict[str, Any]:
+    """Converts a documentation tree to plain data.
+
+    Args:
+        doc (Docs): The documentation, with all documentation it contains.
+
+    Returns:
+        dict[str, Any]: The documentation as JSON compatible data.
+    """
+    data = {'name': doc.name, 'docstring': doc.docstring}
+    if isinstance(doc, ModuleDocs):
+        data['kind'] = 'module'
+    else:
+        data['kind'] = 'class' if isinstance(doc, ClassDocs) else 'object'
+        data['qualname'] = doc.qualname
+        data['type'] = doc.type
+        data['signature'] = signature_to_dict(doc.f_signature)
+        if doc.tags:
+            data['tags'] = sorted(doc.tags)
+    if isinstance(doc, ClassDocs):
+        data['parents'] = (
+            None if doc.parents is None
+            else [parent_name(parent) for parent in doc.parents]
+        )
+    if isinstance(doc, (ModuleDocs, ClassDocs)):
+        data['contents'] = [docs_to_dict(child) for child in doc.contents]
+    return data
+
+
+def docs_from_dict(data: dict[str, Any]) -> Docs:
+    """Rebuilds a documentation tree from plain data.
+
+    Args:
+        data (dict[str, Any]): Data created by `docs_to_dict`.
+
+    Returns:
+        Docs: The documentation, with all documentation it contains.
+
+    Raises:
+        ValueError: If the kind of documentation is not recognized.
+    """
+    kind = data['kind']
+    if kind == 'module':
+        doc = ModuleDocs(data['name'], data['docstring'])
+    elif kind in ('object', 'class'):
+        content = {
+            'name': data['name'],
+            'docstring': data['docstring'],
+            'qualname': data['qualname'],
+            'type': data['type'],
+            'f_signature': signature_from_dict(data['signature']),
+            'tags': data.get('tags', ()),
+        }
+        if kind == 'object':
+            return ObjectDocs(**content)
+        parents = data['parents']
+        doc = ClassDocs(
+            **content,
+            parents=None if parents is None else [SourceText(p) for p in parents],
+        )
+    else:
+        raise ValueError(f'Documentation kind {kind} was not recognized.')
+
+    doc.update(docs_from_dict(child) for child in data['contents'])
+    return doc
+
+
+def _source_text(value: object) -> object:
+    if value is inspect.Parameter.empty:
+        return value
+    return SourceText(value)
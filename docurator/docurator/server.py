@@ -0,0 +1,371 @@
+"""Serve the collected documentation from a long-lived process.
+
+The documentation is collected once and kept in the docurator registry, with
+a symbol index and a search index built from it. Editors and scripts query
+the process over HTTP on localhost, and are answered from memory instead of
+collecting the documentation again. Modules whose source changed are only
+collected again when a client asks for a refresh.
+
+Endpoints, answering JSON unless noted otherwise:
+
+    GET /modules: The dotted names of the documented modules.
+    GET /docs/<name>: The documentation of a module, class or object, by its
+        fully qualified name or an unambiguous short name.
+    GET /members/<name>: The name, kind and summary of every entry within a
+        module or class.
+    GET /search?q=<query>&limit=<n>: The classes and objects matching a query.
+    GET /render/<name>: The Markdown of a module, class or object, as text.
+    POST /refresh: Collects the modules whose source changed since the last
+        refresh, answering their names.
+
+Names which are not documented are answered with status 404, and the fully
+qualified names an ambiguous short name could refer to. Invalid parameters,
+such as a limit below 1, are answered with status 400, and requests which
+fail with status 500 and the error, keeping the connection open.
+
+Classes:
+    DocService: Answers queries about the documentation in the registry.
+    DocServer: Serves a `DocService` over HTTP, a thread per request.
+
+Usage:
+    python cli.py serve src --engine ast --port 8765
+    curl localhost:8765/search?q=render
+""" # noqa: E501
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from content_parser import DocDisplayFormatter, render_module
+from doc_containers import ClassDocs, DocsContainer, ModuleDocs
+from docurator import docurator
+from module_traverser import ENGINES, ModuleFilter, Roots
+from search_index import SearchIndex, summary
+from serialization import docs_to_dict
+from symbol_index import Symbol, SymbolIndex
+from watch import SourceTracker, recollect_module
+
+if TYPE_CHECKING:
+    from worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+HOST = '127.0.0.1'
+PORT = 8765
+SEARCH_LIMIT = 10
+MARKDOWN_TYPE = 'text/markdown; charset=utf-8'
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+class DocService:
+    """Answers queries about the documentation in the registry.
+
+    Queries and refreshes are serialized by a lock, so every answer is made
+    from one consistent state of the registry and its indexes.
+
+    Attributes:
+        engine (str): How changed modules are collected, 'import' or 'ast'.
+        pool (WorkerPool|None): Collects changed modules in isolated workers,
+            in this process if None.
+    """
+    def __init__(
+            self,
+            source: Roots,
+            engine: str = 'import',
+            module_filter: ModuleFilter|None = None,
+            pool: WorkerPool|None = None
+        ) -> None:
+        """Initializes the service, nothing is indexed until `load`.
+
+        Args:
+            source (Roots): The root directory of the documented modules,
+                or several roots.
+            engine (str): How changed modules are collected, 'import' or 'ast'.
+            module_filter (ModuleFilter|None): Selects the modules to refresh.
+            pool (WorkerPool|None): Collects changed modules in isolated workers,
+                in this process if None.
+
+        Raises:
+            ValueError: If the provided engine is not valid.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f'Engine {engine} was not recognized.')
+        self.engine = engine
+        self.pool = pool
+        self.__tracker = SourceTracker(source, module_filter)
+        self.__lock = threading.Lock()
+        self.__index = SymbolIndex({})
+        self.__search = SearchIndex()
+
+    def load(self) -> None:
+        """Indexes the documentation collected so far and snapshots the source.
+
+        The documentation is collected beforehand, e.g. by `invoke_modules`.
+        """
+        with self.__lock:
+            self.__tracker.snapshot()
+            docs = docurator.docs
+            self.__index = SymbolIndex(docs)
+            self.__search = SearchIndex()
+            self.__search.update(docs.values())
+
+    def refresh(self) -> list[str]:
+        """Collects the modules whose source changed since the last refresh.
+
+        Returns:
+            list[str]: The dotted names of the modules which were changed,
+                added or deleted, sorted.
+        """
+        with self.__lock:
+            names = sorted(self.__tracker.poll())
+            current = self.__tracker.modules
+            for name in names:
+                recollect_module(name, current.get(name), self.engine, self.pool)
+            docs = docurator.docs
+            for name in names:
+                if name in docs:
+                    self.__index.update(docs[name])
+                else:
+                    self.__index.remove(name)
+                    self.__search.remove(name)
+            self.__search.update(docs[name] for name in names if name in docs)
+        if names:
+            logger.info(f'Refreshed {len(names)} changed modules.')
+        return names
+
+    def modules(self) -> list[str]:
+        """The dotted names of the documented modules, sorted."""
+        with self.__lock:
+            return sorted(docurator.docs)
+
+    def lookup(self, name: str) -> dict[str, Any]|None:
+        """The documentation of a module, class or object.
+
+        Args:
+            name (str): The fully qualified name, or an unambiguous short name.
+
+        Returns:
+            dict[str, Any]|None: The fully qualified name and module of the
+                symbol, and its documentation from `docs_to_dict`. None if
+                nothing is documented under the name.
+        """
+        with self.__lock:
+            symbol = self.__index.resolve(name)
+            if symbol is None:
+                return None
+            return {
+                'name': symbol.name,
+                'module': symbol.module,
+                'docs': docs_to_dict(symbol.docs),
+            }
+
+    def members(self, name: str) -> list[dict[str, str]]|None:
+        """The entries within a module or class.
+
+        Args:
+            name (str): The fully qualified name, or an unambiguous short name.
+
+        Returns:
+            list[dict[str, str]]|None: The fully qualified name, kind and summary
+                of every entry, sorted by name. Empty for a function or method,
+                None if nothing is documented under the name.
+        """ # noqa: E501
+        with self.__lock:
+            symbol = self.__index.resolve(name)
+            if symbol is None:
+                return None
+            if not isinstance(symbol.docs, DocsContainer):
+                return []
+            return [
+                {
+                    'name': f'{symbol.name}.{doc.name}',
+                    'kind': 'class' if isinstance(doc, ClassDocs) else 'object',
+                    'summary': summary(doc),
+                }
+                for doc in sorted(symbol.docs.contents, key=lambda doc: doc.name)
+            ]
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[dict[str, Any]]:
+        """The classes and objects matching a query, see `SearchIndex.search`.
+
+        Args:
+            query (str): The words to search for.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[dict[str, Any]]: The name, module, kind, summary and score of
+                the best matching documents, best first.
+        """
+        with self.__lock:
+            results = self.__search.search(query, limit)
+        return [asdict(result) for result in results]
+
+    def render(self, name: str) -> str|None:
+        """The Markdown of a module, class or object, as `write_docs` renders it.
+
+        Args:
+            name (str): The fully qualified name, or an unambiguous short name.
+
+        Returns:
+            str|None: The Markdown, None if nothing is documented under the name.
+        """
+        with self.__lock:
+            symbol = self.__index.resolve(name)
+            if symbol is None:
+                return None
+            return _render(symbol, self.__index)
+
+    def candidates(self, name: str) -> list[str]:
+        """The fully qualified names an ambiguous short name could refer to."""
+        with self.__lock:
+            return list(self.__index.candidates(name))
+
+
+class DocServer(ThreadingHTTPServer):
+    """Serves a `DocService` over HTTP, a thread per request.
+
+    Attributes:
+        service (DocService): Answers the queries.
+    """
+    daemon_threads = True
+
+    def __init__(self, service: DocService, host: str = HOST, port: int = PORT) -> None:
+        """Binds the server, requests are served by `serve_forever`.
+
+        Args:
+            service (DocService): Answers the queries.
+            host (str): The address to listen on, localhost by default.
+            port (int): The port to listen on, any free port if 0.
+        """
+        super().__init__((host, port), _RequestHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        """The base URL the server listens on."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the `DocService` of the server."""
+    # Every response has a length, so clients can keep their connection.
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, Nagle's algorithm would hold
+    # the body back until the client acknowledges the headers.
+    disable_nagle_algorithm = True
+    server: DocServer
+
+    def do_GET(self) -> None: # noqa: N802
+        """Answers the GET endpoints."""
+        self.__dispatch(self.__get)
+
+    def do_POST(self) -> None: # noqa: N802
+        """Answers the POST endpoints."""
+        self.__dispatch(self.__post)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Logs requests to the module logger instead of stderr."""
+        logger.debug(f'{self.address_string()} {format % args}')
+
+    def __dispatch(self, answer: Callable[[], None]) -> None:
+        if not self.__discard_body():
+            return
+        try:
+            answer()
+        except ConnectionError:
+            # The client is gone, there is nobody to answer.
+            raise
+        except Exception as e:
+            # Nothing was sent yet, every endpoint answers once it is computed.
+            logger.exception(f'Failed to answer {self.command} {self.path}')
+            self.__send_json(500, {'error': f'{e.__class__.__name__}: {e}'})
+
+    def __get(self) -> None:
+        url = urlsplit(self.path)
+        endpoint, _, name = url.path.strip('/').partition('/')
+        name = unquote(name)
+        service = self.server.service
+        if endpoint == 'modules' and not name:
+            self.__send_json(200, service.modules())
+        elif endpoint == 'search' and not name:
+            query = parse_qs(url.query)
+            try:
+                limit = int(query.get('limit', [SEARCH_LIMIT])[0])
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                self.__send_json(
+                    400, {'error': 'The limit must be a positive integer.'}
+                )
+                return
+            self.__send_json(200, service.search(query.get('q', [''])[0], limit))
+        elif endpoint == 'docs' and name:
+            self.__send_found(name, service.lookup(name))
+        elif endpoint == 'members' and name:
+            self.__send_found(name, service.members(name))
+        elif endpoint == 'render' and name:
+            markdown = service.render(name)
+            if markdown is None:
+                self.__send_found(name, None)
+            else:
+                self.__send(200, markdown.encode('utf-8'), MARKDOWN_TYPE)
+        else:
+            self.__send_json(404, {'error': f'{url.path} is not an endpoint.'})
+
+    def __post(self) -> None:
+        if urlsplit(self.path).path.strip('/') == 'refresh':
+            self.__send_json(200, {'changed': self.server.service.refresh()})
+        else:
+            self.__send_json(404, {'error': f'{self.path} is not an endpoint.'})
+
+    def __discard_body(self) -> bool:
+        # No endpoint reads a body, but it must be consumed, or the next
+        # request on the connection would be read from it.
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or 'Transfer-Encoding' in self.headers:
+            self.close_connection = True
+            self.__send_json(400, {'error': 'The request body can not be read.'})
+            return False
+        while length > 0:
+            chunk = self.rfile.read(min(length, BODY_CHUNK_SIZE))
+            if not chunk:
+                break
+            length -= len(chunk)
+        return True
+
+    def __send_found(self, name: str, data: object) -> None:
+        if data is not None:
+            self.__send_json(200, data)
+            return
+        self.__send_json(404, {
+            'error': f'{name} is not documented.',
+            'candidates': self.server.service.candidates(name),
+        })
+
+    def __send_json(self, status: int, data: object) -> None:
+        self.__send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def __send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _render(symbol: Symbol, index: SymbolIndex) -> str:
+    if isinstance(symbol.docs, ModuleDocs):
+        return ''.join(render_module(symbol.docs, index))
+    formatter = DocDisplayFormatter(symbol.docs, index, symbol.module)
+    return ''.join(f'{line}\n' for line in formatter.lines())
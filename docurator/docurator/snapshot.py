@@ -0,0 +1,220 @@
+"""Save the documentation of a registry to a snapshot file and load it back.
+
+A snapshot holds the complete documentation tree of every module, so tools
+can render or inspect documentation without importing or parsing the source
+again. Signatures are stored in their serializable form, see `serialization`.
+
+The file starts with a fixed size preamble, followed by a JSON header and the
+documentation of every module as a separate JSON document:
+
+    magic: `MAGIC`, identifying the file as a snapshot.
+    header length: The byte length of the header, an unsigned 32 bit integer.
+    header: The format and docurator version, and the offset and length in bytes
+        of every module, relative to the end of the header, and its content hash.
+    modules: The documentation of the modules from `serialization.docs_to_dict`.
+
+The header is an index of the modules, a reader memory maps the file and only
+decodes the modules it loads. Modules with equal content hashes in two
+snapshots are equal, and need not be loaded to compare them.
+
+Classes:
+    Snapshot: Reads modules from a snapshot file.
+
+Functions:
+    write_snapshot(path: str, modules: Iterable[ModuleDocs]): Writes a snapshot file.
+    load_snapshot(path: str, names: Iterable[str]|None): Loads modules from a snapshot file.
+""" # noqa: E501
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from types import TracebackType
+from typing import Iterable
+
+from doc_containers import ModuleDocs
+from docurator import __version__
+from serialization import docs_from_dict, docs_to_dict
+
+MAGIC = b'DOCSNAP\n'
+SNAPSHOT_FORMAT = 2
+# Format 1 snapshots have no content hashes.
+READABLE_FORMATS = (1, 2)
+_PREAMBLE = struct.Struct(f'<{len(MAGIC)}sI')
+
+
+def write_snapshot(path: str, modules: Iterable[ModuleDocs]) -> None:
+    """Writes the documentation of modules to a snapshot file.
+
+    The file is replaced atomically, readers never see a partial snapshot.
+
+    Args:
+        path (str): The path of the file to write.
+        modules (Iterable[ModuleDocs]): The documentation of the modules.
+    """
+    index = {}
+    bodies = []
+    offset = 0
+    for module_docs in modules:
+        body = json.dumps(
+            docs_to_dict(module_docs), separators=(',', ':')
+        ).encode('utf-8')
+        index[module_docs.name] = [offset, len(body), module_docs.content_hash]
+        bodies.append(body)
+        offset += len(body)
+
+    header = json.dumps({
+        'format': SNAPSHOT_FORMAT,
+        'version': __version__,
+        'modules': index,
+    }, separators=(',', ':')).encode('utf-8')
+
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(_PREAMBLE.pack(MAGIC, len(header)))
+        file.write(header)
+        for body in bodies:
+            file.write(body)
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path: str, names: Iterable[str]|None = None) -> dict[str, ModuleDocs]: # noqa: E501
+    """Loads the documentation of modules from a snapshot file.
+
+    Args:
+        path (str): The path of the snapshot file.
+        names (Iterable[str]|None): The dotted names of the modules to load,
+            None loads all modules.
+
+    Returns:
+        dict[str, ModuleDocs]: The documentation by module name.
+
+    Raises:
+        ValueError: If the file is not a snapshot this version can read,
+            or the documentation of a module is corrupt.
+        KeyError: If a requested module is not in the snapshot.
+    """
+    with Snapshot(path) as snapshot:
+        if names is None:
+            names = snapshot.modules
+        return {name: snapshot.load(name) for name in names}
+
+
+class Snapshot:
+    """Reads the documentation of modules from a snapshot file.
+
+    The file is memory mapped, loading a module only reads and decodes the
+    bytes of that module. Use as a context manager, or call `close`.
+
+    Attributes:
+        path (str): The path of the snapshot file.
+        version (str): The docurator version which wrote the snapshot.
+        modules (list[str]): The dotted names of the modules in the snapshot.
+    """
+    def __init__(self, path: str) -> None:
+        """Opens the snapshot and reads its header.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot this version can read.
+        """
+        self.path = path
+        self.__file = open(path, 'rb')
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__file.close()
+            raise ValueError(f'{path} is not a docurator snapshot.') from None
+
+        try:
+            header = self.__read_header()
+        except ValueError:
+            self.close()
+            raise
+        self.version = header['version']
+        self.__index = header['modules']
+        self.modules = list(self.__index)
+
+    def load(self, name: str) -> ModuleDocs:
+        """Loads the documentation of one module.
+
+        Args:
+            name (str): The dotted name of the module.
+
+        Returns:
+            ModuleDocs: The documentation of the module.
+
+        Raises:
+            KeyError: If the module is not in the snapshot.
+            ValueError: If the documentation of the module is corrupt.
+        """
+        if name not in self.__index:
+            raise KeyError(f'{name} is not in the snapshot {self.path}.')
+        offset, length = self.__index[name][:2]
+        start = self.__data_start + offset
+        return docs_from_dict(json.loads(self.__map[start:start + length]))
+
+    def content_hash(self, name: str) -> str|None:
+        """The content hash of a module, without loading it.
+
+        Args:
+            name (str): The dotted name of the module.
+
+        Returns:
+            str|None: The `ModuleDocs.content_hash` of the module when the
+                snapshot was written, None if the snapshot has no hashes.
+
+        Raises:
+            KeyError: If the module is not in the snapshot.
+        """
+        if name not in self.__index:
+            raise KeyError(f'{name} is not in the snapshot {self.path}.')
+        entry = self.__index[name]
+        return entry[2] if len(entry) > 2 else None
+
+    def close(self) -> None:
+        """Closes the snapshot file."""
+        self.__map.close()
+        self.__file.close()
+
+    def __contains__(self, name: str) -> bool:
+        """Asserts if the module with the given name is in the snapshot."""
+        return name in self.__index
+
+    def __enter__(self) -> Snapshot:
+        """Returns the snapshot, closed when the context exits."""
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException]|None,
+            exc_value: BaseException|None,
+            traceback: TracebackType|None
+        ) -> None:
+        """Closes the snapshot file."""
+        self.close()
+
+    def __read_header(self) -> dict:
+        if len(self.__map) < _PREAMBLE.size:
+            raise ValueError(f'{self.path} is not a docurator snapshot.')
+        magic, header_length = _PREAMBLE.unpack_from(self.__map)
+        if magic != MAGIC:
+            raise ValueError(f'{self.path} is not a docurator snapshot.')
+        self.__data_start = _PREAMBLE.size + header_length
+        if self.__data_start > len(self.__map):
+            raise ValueError(f'{self.path} is a truncated docurator snapshot.')
+        # Decoding errors are ValueErrors too.
+        header = json.loads(self.__map[_PREAMBLE.size:self.__data_start])
+        if not isinstance(header, dict):
+            raise ValueError(f'{self.path} has a corrupt snapshot header.')
+        if header.get('format') not in READABLE_FORMATS:
+            raise ValueError(
+                f'{self.path} has snapshot format {header.get("format")}, '
+                f'expected one of {READABLE_FORMATS}.'
+            )
+        if not isinstance(header.get('modules'), dict) or 'version' not in header:
+            raise ValueError(f'{self.path} has a corrupt snapshot header.')
+        return header
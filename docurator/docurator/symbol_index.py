@@ -0,0 +1,257 @@
+"""Index the documented symbols to resolve cross references.
+
+The index is built once from the documentation registry and maps the fully
+qualified name, the qualified name and the short name of every documented
+module, class and object to its documentation and anchor. Resolving a
+reference is a constant number of dictionary lookups, however large the
+registry is.
+
+A reference resolves, in order, as:
+
+    1. A fully qualified name, e.g. `package.module.Class.method`.
+    2. A name within the module the reference is made from, e.g. `Class.method`.
+    3. A short name documented once, e.g. `method`. Short names documented more
+       than once resolve if exactly one is within the referencing module, and
+       are ambiguous otherwise.
+
+Classes:
+    Symbol: A documented symbol.
+    UnresolvedReference: A reference which could not be resolved.
+    SymbolIndex: Resolves references to documented symbols.
+
+Functions:
+    annotation_references(annotation: object): The names referenced by an annotation.
+""" # noqa: E501
+from __future__ import annotations
+
+import builtins
+import inspect
+import re
+import sys
+import typing
+from dataclasses import dataclass
+from typing import Iterator
+
+from doc_containers import ClassDocs, Docs, DocsContainer, ModuleDocs, ObjectDocs
+
+_NAME = re.compile(r'[A-Za-z_][\w.]*\w|[A-Za-z_]')
+# Text within angle brackets is a repr, e.g. `<built-in function any>`.
+_REPR = re.compile(r'<[^<>]*>')
+# Names which are never documented, so are not reported as unresolved.
+_EXTERNAL = (
+    frozenset(dir(builtins)) | frozenset(typing.__all__) | frozenset(('NoneType',))
+)
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A documented symbol.
+
+    Attributes:
+        name (str): The fully qualified name of the symbol.
+        module (str): The dotted name of the module documenting the symbol.
+        docs (Docs): The documentation of the symbol.
+        anchor (str|None): The anchor of the symbol within the module output,
+            None for the module itself.
+    """
+    name: str
+    module: str
+    docs: Docs
+    anchor: str|None
+
+
+@dataclass(frozen=True)
+class UnresolvedReference:
+    """A reference which could not be resolved.
+
+    Attributes:
+        reference (str): The name referenced.
+        location (str): The fully qualified name of the symbol making the reference.
+        candidates (tuple[str, ...]): The fully qualified names the reference could refer to
+            if it is ambiguous, empty if nothing is documented under the name.
+    """ # noqa: E501
+    reference: str
+    location: str
+    candidates: tuple[str, ...] = ()
+
+    @property
+    def ambiguous(self) -> bool:
+        """True if the reference matches more than one symbol."""
+        return bool(self.candidates)
+
+
+class SymbolIndex:
+    """Resolves references to documented symbols.
+
+    The index reflects the registry when it was built. Modules whose
+    documentation changed are updated in or removed from the index.
+
+    Attributes:
+        symbols (dict[str, Symbol]): The symbols by fully qualified name.
+    """
+    def __init__(self, docs: dict[str, ModuleDocs]) -> None:
+        """Builds the index from the documentation of modules.
+
+        Args:
+            docs (dict[str, ModuleDocs]): The documentation by module name,
+                e.g. `Docurator.docs`.
+        """
+        self.symbols = {}
+        self.__short_names = {}
+        # The fully qualified and short names of the symbols by module.
+        self.__module_names = {}
+        for module_docs in docs.values():
+            self.__add_module(module_docs)
+
+    def update(self, module_docs: ModuleDocs) -> None:
+        """Replaces the symbols of a module with its current documentation.
+
+        Args:
+            module_docs (ModuleDocs): The documentation of the module.
+        """
+        self.remove(module_docs.name)
+        self.__add_module(module_docs)
+
+    def remove(self, module_name: str) -> None:
+        """Removes the symbols of a module.
+
+        Args:
+            module_name (str): The dotted name of the module.
+        """
+        for name, short_name in self.__module_names.pop(module_name, ()):
+            symbol = self.symbols.get(name)
+            if symbol is not None and symbol.module == module_name:
+                del self.symbols[name]
+            by_module = self.__short_names.get(short_name, {})
+            by_module.pop(module_name, None)
+            if not by_module:
+                self.__short_names.pop(short_name, None)
+
+    def resolve(self, reference: str, module: str|None = None) -> Symbol|None:
+        """Resolves a reference to the symbol it refers to.
+
+        Args:
+            reference (str): The name referenced.
+            module (str|None): The dotted name of the module making the reference.
+
+        Returns:
+            Symbol|None: The symbol, None if nothing or several symbols match.
+        """
+        symbol = self.symbols.get(reference)
+        if symbol is None and module is not None:
+            symbol = self.symbols.get(f'{module}.{reference}')
+        if symbol is None:
+            symbol = self.__resolve_short(reference, module)
+        return symbol
+
+    def candidates(self, reference: str) -> tuple[str, ...]:
+        """The fully qualified names documented under a short name.
+
+        Args:
+            reference (str): The short or qualified name.
+
+        Returns:
+            tuple[str, ...]: The fully qualified names, sorted.
+        """
+        by_module = self.__short_names.get(reference, {})
+        return tuple(sorted(
+            symbol.name for symbols in by_module.values() for symbol in symbols
+        ))
+
+    def references(self, doc: Docs) -> Iterator[str]:
+        """Yields the names referenced by the signature and parents of documentation.
+
+        Builtins and names from `typing` are not yielded.
+
+        Args:
+            doc (Docs): The documentation making the references.
+
+        Yields:
+            str: The names referenced, each once.
+        """ # noqa: E501
+        names = []
+        if isinstance(doc, ObjectDocs) and doc.f_signature is not None:
+            signature = doc.f_signature
+            for parameter in signature.parameters.values():
+                if parameter.annotation is not parameter.empty:
+                    names.extend(annotation_references(parameter.annotation))
+            if signature.return_annotation is not signature.empty:
+                names.extend(annotation_references(signature.return_annotation))
+        if isinstance(doc, ClassDocs):
+            for parent in doc.parents or ():
+                names.extend(annotation_references(parent))
+        yield from dict.fromkeys(
+            name for name in names if not _is_external(name)
+        )
+
+    def unresolved(self) -> list[UnresolvedReference]:
+        """Reports the references in signatures and parents which do not resolve.
+
+        Returns:
+            list[UnresolvedReference]: The unresolved references, sorted by location.
+        """ # noqa: E501
+        report = []
+        for symbol in self.symbols.values():
+            for reference in self.references(symbol.docs):
+                if self.resolve(reference, symbol.module) is None:
+                    report.append(UnresolvedReference(
+                        reference, symbol.name, self.candidates(reference)
+                    ))
+        return sorted(report, key=lambda item: (item.location, item.reference))
+
+    def __add_module(self, module_docs: ModuleDocs) -> None:
+        module = module_docs.name
+        self.__add(Symbol(module, module, module_docs, None), module.rpartition('.')[2]) # noqa: E501
+        stack = list(module_docs.contents)
+        while stack:
+            doc = stack.pop()
+            name = f'{module}.{doc.qualname}'
+            symbol = Symbol(name, module, doc, name)
+            self.__add(symbol, doc.name)
+            if doc.qualname != doc.name:
+                self.__add_short(doc.qualname, symbol)
+            if isinstance(doc, DocsContainer):
+                stack.extend(doc.contents)
+
+    def __add(self, symbol: Symbol, short_name: str) -> None:
+        self.symbols[symbol.name] = symbol
+        self.__add_short(short_name, symbol)
+
+    def __add_short(self, short_name: str, symbol: Symbol) -> None:
+        self.__module_names.setdefault(symbol.module, []).append(
+            (symbol.name, short_name)
+        )
+        by_module = self.__short_names.setdefault(short_name, {})
+        by_module.setdefault(symbol.module, []).append(symbol)
+
+    def __resolve_short(self, reference: str, module: str|None) -> Symbol|None:
+        # Symbols by module, the lookup does not grow with the ambiguity.
+        by_module = self.__short_names.get(reference)
+        if by_module is None:
+            return None
+        if len(by_module) == 1:
+            symbols, = by_module.values()
+        else:
+            symbols = by_module.get(module, ())
+        return symbols[0] if len(symbols) == 1 else None
+
+
+def annotation_references(annotation: object) -> list[str]:
+    """The names referenced by an annotation or parent class.
+
+    Args:
+        annotation (object): A type, typing construct or annotation text.
+
+    Returns:
+        list[str]: The dotted names in the annotation, in order.
+    """
+    if not isinstance(annotation, str):
+        annotation = inspect.formatannotation(annotation)
+    return _NAME.findall(_REPR.sub('', annotation))
+
+
+def _is_external(name: str) -> bool:
+    return (
+        name in _EXTERNAL
+        or name.partition('.')[0] in sys.stdlib_module_names
+    )
@@ -0,0 +1,309 @@
+"""Project the collected documentation for different audiences.
+
+The documentation is collected once, and every audience sees a view of it.
+A view selects documentation by the privacy of its name, by the tags given to
+`document_me`, e.g. `@document_me('users')`, and by its kind. Projecting the
+registry through a view wraps the modules and classes in read-only
+projections, which share the underlying documentation without copying it.
+The contents of a projection are selected the first time they are read.
+
+Projections are `ModuleDocs` and `ClassDocs` themselves, so they are rendered,
+indexed and searched like the collected documentation. Rendering several
+audiences costs one collection pass, and one render pass per view.
+
+Tags given to a class apply to its methods and nested classes. A class which
+does not match the tags of a view is still shown if any of its contents do.
+
+Classes:
+    View: Selects the documentation shown to an audience.
+    ModuleView: A read-only projection of the documentation of a module.
+    ClassView: A read-only projection of the documentation of a class.
+
+Functions:
+    is_private(name: str): True if a name is private by convention.
+    write_views(docs: dict[str, ModuleDocs], views: Iterable[View], target: str): Writes
+        the documentation of every view to its own directory.
+""" # noqa: E501
+from __future__ import annotations
+
+import inspect
+import os
+from dataclasses import FrozenInstanceError, dataclass
+from typing import Iterable, Mapping, Type
+
+from doc_containers import NO_TAGS, ClassDocs, Docs, ModuleDocs
+
+KINDS = ('class', 'function', 'method')
+
+
+@dataclass(frozen=True)
+class View:
+    """Selects the documentation shown to an audience.
+
+    Attributes:
+        name (str): The name of the audience, also the directory it is written to.
+        public_only (bool): Hides modules, classes and objects with private names.
+        tags (frozenset[str]|None): Shows only documentation tagged with one
+            of the tags, all documentation if None.
+        exclude_tags (frozenset[str]): Hides documentation tagged with one of the tags.
+        kinds (frozenset[str]|None): Shows only documentation of these kinds,
+            'class', 'function' or 'method', all kinds if None.
+
+    Raises:
+        ValueError: If a kind is not recognized.
+    """ # noqa: E501
+    name: str
+    public_only: bool = False
+    tags: frozenset[str]|None = None
+    exclude_tags: frozenset[str] = frozenset()
+    kinds: frozenset[str]|None = None
+
+    def __post_init__(self) -> None:
+        """Accepts any iterable of tags and kinds."""
+        for field_name in ('tags', 'exclude_tags', 'kinds'):
+            value = getattr(self, field_name)
+            if value is not None:
+                object.__setattr__(self, field_name, frozenset(value))
+        unknown = set(self.kinds or ()) - set(KINDS)
+        if unknown:
+            raise ValueError(f'Kinds {sorted(unknown)} were not recognized.')
+
+    def project(self, docs: Mapping[str, ModuleDocs]) -> dict[str, ModuleDocs]:
+        """Projects the documentation of modules through the view.
+
+        Args:
+            docs (Mapping[str, ModuleDocs]): The documentation by module name,
+                e.g. `Docurator.docs`.
+
+        Returns:
+            dict[str, ModuleDocs]: The projections by module name, without
+                modules the view shows nothing of.
+        """
+        projected = {}
+        for name, module_docs in docs.items():
+            if self.public_only and any(map(is_private, name.split('.'))):
+                continue
+            module_view = ModuleView(module_docs, self)
+            if module_view.contents:
+                projected[name] = module_view
+        return projected
+
+    def shows(self, doc: Docs, kind: str, tags: frozenset[str]) -> bool:
+        """True if the view shows documentation, not considering its contents.
+
+        Args:
+            doc (Docs): The documentation of a class or object.
+            kind (str): The kind of the documentation, 'class', 'function' or 'method'.
+            tags (frozenset[str]): The tags of the documentation, including
+                the tags of the classes containing it.
+
+        Returns:
+            bool: True if the documentation is shown.
+        """ # noqa: E501
+        return self.admits(doc, kind, tags) and (
+            self.tags is None or not self.tags.isdisjoint(tags)
+        )
+
+    def admits(self, doc: Docs, kind: str, tags: frozenset[str]) -> bool:
+        """True if the view shows documentation, or may show its contents.
+
+        Args:
+            doc (Docs): The documentation of a class or object.
+            kind (str): The kind of the documentation, 'class', 'function' or 'method'.
+            tags (frozenset[str]): The tags of the documentation, including
+                the tags of the classes containing it.
+
+        Returns:
+            bool: False if neither the documentation nor its contents are shown.
+        """ # noqa: E501
+        if self.public_only and is_private(doc.name):
+            return False
+        if self.kinds is not None and kind not in self.kinds:
+            return False
+        return self.exclude_tags.isdisjoint(tags)
+
+
+class _Projection:
+    """Reads the contents of a projection from the documentation it projects.
+
+    The contents are selected on first access and kept, the documentation
+    within them is shared with the projected container.
+    """
+    __slots__ = ()
+
+    _source: ModuleDocs|ClassDocs
+    _view: View
+    _inherited: frozenset[str]
+    _projected: dict[str, Docs]|None
+
+    @property
+    def _contents(self) -> dict[str, Docs]:
+        projected = self._projected
+        if projected is None:
+            projected = self._select()
+            object.__setattr__(self, '_projected', projected)
+        return projected
+
+    @property
+    def source(self) -> ModuleDocs|ClassDocs:
+        """The documentation the projection is made of."""
+        return self._source
+
+    def add(self, doc: Docs) -> None:
+        """Projections are read-only, documentation is added to their source."""
+        raise FrozenInstanceError(f'cannot add to the view of {self.name!r}')
+
+    def update(self, docs: Iterable[Docs]) -> None:
+        """Projections are read-only, documentation is added to their source."""
+        raise FrozenInstanceError(f'cannot add to the view of {self.name!r}')
+
+    def discard(self, doc: Docs) -> None:
+        """Projections are read-only, documentation is removed from their source."""
+        raise FrozenInstanceError(f'cannot remove from the view of {self.name!r}')
+
+    def _select(self) -> dict[str, Docs]:
+        view = self._view
+        member_kind = 'method' if isinstance(self._source, ClassDocs) else 'function'
+        selected = {}
+        for doc in self._source.contents:
+            tags = doc.tags | self._inherited if self._inherited else doc.tags
+            kind = 'class' if isinstance(doc, ClassDocs) else member_kind
+            if not view.admits(doc, kind, tags):
+                continue
+            if isinstance(doc, ClassDocs):
+                class_view = ClassView(doc, view, tags)
+                if view.shows(doc, kind, tags) or class_view.contents:
+                    selected[doc.name] = class_view
+            elif view.shows(doc, kind, tags):
+                selected[doc.name] = doc
+        return selected
+
+
+class ModuleView(_Projection, ModuleDocs):
+    """A read-only projection of the documentation of a module.
+
+    Attributes:
+        name (str): The name of the module.
+        docstring (str|None): The docstring of the module.
+        contents (DocsContents): The documentation the view shows, as a set indexed by name.
+        source (ModuleDocs): The projected documentation.
+    """ # noqa: E501
+    __slots__ = ('_source', '_view', '_inherited', '_projected')
+
+    def __init__(self, source: ModuleDocs, view: View) -> None:
+        """Initializes the projection, sharing the names of the source."""
+        for slot, value in (
+            ('name', source.name),
+            ('docstring', source.docstring),
+            ('_own_hash', source._own_hash),
+            ('_source', source),
+            ('_view', view),
+            ('_inherited', NO_TAGS),
+            ('_projected', None),
+        ):
+            object.__setattr__(self, slot, value)
+
+
+class ClassView(_Projection, ClassDocs):
+    """A read-only projection of the documentation of a class.
+
+    Attributes:
+        name (str): The name of the class.
+        docstring (str|None): The docstring of the class.
+        qualname (str): The qualified name of the class.
+        type (str): The name of the metaclass.
+        f_signature (inspect.Signature|None): The signature of the source.
+        parents (list[object]|None): The parent classes of the source.
+        tags (frozenset[str]): The tags of the class.
+        contents (DocsContents): The documentation the view shows, as a set indexed by name.
+        source (ClassDocs): The projected documentation.
+    """ # noqa: E501
+    __slots__ = ('_source', '_view', '_inherited', '_projected')
+
+    def __init__(
+            self,
+            source: ClassDocs,
+            view: View,
+            inherited: frozenset[str] = NO_TAGS
+        ) -> None:
+        """Initializes the projection, sharing the names of the source.
+
+        Args:
+            source (ClassDocs): The documentation of the class.
+            view (View): The view selecting the contents.
+            inherited (frozenset[str]): The tags of the class, including the
+                tags of the classes containing it, passed on to its contents.
+        """
+        for slot, value in (
+            ('name', source.name),
+            ('docstring', source.docstring),
+            ('_own_hash', source._own_hash),
+            ('qualname', source.qualname),
+            ('type', source.type),
+            ('tags', source.tags),
+            ('_f_signature', None),
+            ('_parents', None),
+            ('_source', source),
+            ('_view', view),
+            ('_inherited', inherited),
+            ('_projected', None),
+        ):
+            object.__setattr__(self, slot, value)
+
+    @property
+    def f_signature(self) -> Type[inspect.signature]|None:
+        """The signature of the projected class."""
+        return self._source.f_signature
+
+    @property
+    def parents(self) -> list[object]|None:
+        """The parent classes of the projected class."""
+        return self._source.parents
+
+
+def is_private(name: str) -> bool:
+    """True if a name is private by convention.
+
+    Names starting with an underscore are private, except dunder names
+    such as `__init__`, which are part of the public interface.
+
+    Args:
+        name (str): The name of a module, class or object.
+
+    Returns:
+        bool: True if the name is private.
+    """
+    return name.startswith('_') and not (
+        name.startswith('__') and name.endswith('__')
+    )
+
+
+def write_views(
+        docs: dict[str, ModuleDocs],
+        views: Iterable[View],
+        target: str
+    ) -> dict[str, list[str]]:
+    """Writes the documentation of every view to its own directory.
+
+    Every view gets its own symbol index, so it never links to documentation
+    it does not show, and its own search index.
+
+    Args:
+        docs (dict[str, ModuleDocs]): The documentation by module name,
+            e.g. `Docurator.docs`.
+        views (Iterable[View]): The views to write.
+        target (str): The directory containing a directory per view.
+
+    Returns:
+        dict[str, list[str]]: The paths of the files which were written, by view name.
+    """ # noqa: E501
+    from content_parser import write_docs
+    from search_index import write_search_index
+
+    written = {}
+    for view in views:
+        projected = view.project(docs)
+        view_target = os.path.join(target, view.name)
+        written[view.name] = write_docs(projected, view_target)
+        write_search_index(projected, view_target)
+    return written
@@ -0,0 +1,416 @@
+"""Rebuild the documentation of changed modules while the source is edited.
+
+The source tree is polled for the modification times and sizes of its files,
+so no notifier specific to the operating system is needed. Changes are
+debounced, and only once no file changed for the debounce period are the
+changed modules collected again. Their documentation replaces the subtree of
+the module in the docurator registry.
+
+Only the affected Markdown files are rendered again: the changed modules, and
+modules referencing a symbol whose resolution may have changed, because a
+symbol was added to or removed from a changed module. The references made by
+every module are recorded while it is rendered. The search index is updated
+for the changed modules only.
+
+Classes:
+    Watcher: Rebuilds the documentation of modules whose source changed.
+    SourceTracker: Finds the modules whose source files changed.
+
+Functions:
+    recollect_module(name: str, mod: SourceModule|None, engine: str, pool: WorkerPool|None):
+        Replaces the documentation of a module in the registry.
+
+Usage:
+    python cli.py watch src docs --engine ast
+""" # noqa: E501
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from ast_collector import collect_module
+from content_parser import module_path, write_module
+from doc_containers import DocsContainer, ModuleDocs
+from docurator import docurator
+from module_traverser import (
+    ENGINES,
+    ModuleFilter,
+    Roots,
+    SourceModule,
+    normalize_roots,
+    walk_modules,
+)
+from search_index import INDEX_FILENAME, SearchIndex
+from symbol_index import Symbol, SymbolIndex
+
+if TYPE_CHECKING:
+    from worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.1
+SOURCE_SUFFIX = '.py'
+
+# The modification time and size of a file, by path.
+SourceState = dict[str, tuple[int, int]]
+
+
+class Watcher:
+    """Rebuilds the documentation of modules whose source changed.
+
+    The documentation is collected into the `docurator` registry and written
+    to the target directory, together with its search index. Modules are
+    collected again the way the engine collects them, 'import' reloads the
+    module to invoke its decorators, 'ast' parses its source. With a worker
+    pool, they are collected in its isolated workers instead.
+
+    Attributes:
+        roots (list[str]): The root directories of the modules to document.
+        target (str): The directory the documentation is written to.
+        engine (str): How the documentation is collected, 'import' or 'ast'.
+        module_filter (ModuleFilter): Selects the modules to document.
+        interval (float): The seconds between polls of the source tree.
+        debounce (float): The seconds no file may change before rebuilding.
+        pool (WorkerPool|None): Collects changed modules in isolated workers,
+            in this process if None.
+    """
+    def __init__(
+            self,
+            source: Roots,
+            target: str,
+            engine: str = 'import',
+            module_filter: ModuleFilter|None = None,
+            interval: float = POLL_INTERVAL,
+            debounce: float = DEBOUNCE,
+            pool: 'WorkerPool|None' = None
+        ) -> None:
+        """Initializes the watcher, nothing is collected or written yet.
+
+        Raises:
+            ValueError: If the provided engine is not valid.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f'Engine {engine} was not recognized.')
+        self.roots = normalize_roots(source)
+        self.target = target
+        self.engine = engine
+        self.module_filter = module_filter or ModuleFilter()
+        self.interval = interval
+        self.debounce = debounce
+        self.pool = pool
+
+        self.__tracker = SourceTracker(self.roots, self.module_filter)
+        self.__index = SymbolIndex({})
+        self.__search = SearchIndex()
+        # The references made by the rendered file of every module.
+        self.__references = {}
+
+    def build(self) -> list[str]:
+        """Writes the documentation collected so far and snapshots the source.
+
+        The documentation is collected beforehand, e.g. by `invoke_modules`.
+        Unchanged files are not rewritten, but every module is rendered to
+        record the references it makes.
+
+        Returns:
+            list[str]: The paths of the files which were written.
+        """
+        self.__tracker.snapshot()
+        docs = docurator.docs
+        self.__index = SymbolIndex(docs)
+        os.makedirs(self.target, exist_ok=True)
+        written = self.__render(docs.values())
+
+        path = os.path.join(self.target, INDEX_FILENAME)
+        try:
+            self.__search = SearchIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            self.__search = SearchIndex()
+        for name in self.__search.modules:
+            if name not in docs:
+                self.__search.remove(name)
+        self.__search.update(docs.values())
+        self.__search.save(path)
+        return written
+
+    def poll(self) -> set[str]:
+        """Finds the modules whose source changed since the last poll.
+
+        Returns:
+            set[str]: The dotted names of the modules which were changed,
+                added or deleted.
+        """
+        return self.__tracker.poll()
+
+    def rebuild(self, names: Iterable[str]) -> list[str]:
+        """Collects modules again and writes the affected documentation.
+
+        Args:
+            names (Iterable[str]): The dotted names of the changed modules.
+
+        Returns:
+            list[str]: The paths of the files which were written or deleted.
+        """
+        start = time.perf_counter()
+        names = set(names)
+        current = self.__tracker.modules
+        before = {
+            key for name in names for key in _symbol_keys(self.__index, name)
+        }
+        for name in sorted(names):
+            recollect_module(name, current.get(name), self.engine, self.pool)
+        docs = docurator.docs
+        for name in names:
+            if name in docs:
+                self.__index.update(docs[name])
+            else:
+                self.__index.remove(name)
+        after = {
+            key for name in names for key in _symbol_keys(self.__index, name)
+        }
+
+        # Symbols added or removed change how references to them resolve.
+        keys = before ^ after
+        affected = {name for name in names if name in docs}
+        affected.update(
+            module for module, references in self.__references.items()
+            if module in docs and any(
+                reference in keys or f'{module}.{reference}' in keys
+                for reference in references
+            )
+        )
+        written = self.__render(docs[name] for name in sorted(affected))
+
+        removed = sorted(name for name in names if name not in docs)
+        for name in removed:
+            self.__references.pop(name, None)
+            path = module_path(name, self.target)
+            if os.path.exists(path):
+                os.remove(path)
+                written.append(path)
+            self.__search.remove(name)
+        indexed = self.__search.update(
+            docs[name] for name in names if name in docs
+        )
+        if removed or indexed:
+            self.__search.save(os.path.join(self.target, INDEX_FILENAME))
+        logger.info(
+            f'Rebuilt {len(names)} changed modules, rendered {len(affected)} '
+            f'in {(time.perf_counter() - start) * 1e3:.0f} ms.'
+        )
+        return written
+
+    def watch(self, stop: threading.Event|None = None) -> None:
+        """Polls the source tree and rebuilds changed modules until stopped.
+
+        Args:
+            stop (threading.Event|None): Stops watching when set,
+                watches until interrupted if None.
+        """
+        stop = stop or threading.Event()
+        pending = set()
+        last_change = 0.0
+        while not stop.wait(self.interval):
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending.update(changed)
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                for path in self.rebuild(pending):
+                    logger.info(f'Wrote {path}')
+                pending = set()
+
+    def __render(self, modules: Iterable[ModuleDocs]) -> list[str]:
+        written = []
+        for module_docs in modules:
+            recorder = _ReferenceRecorder(self.__index)
+            if write_module(module_docs, self.target, recorder):
+                written.append(module_path(module_docs.name, self.target))
+            self.__references[module_docs.name] = recorder.recorded
+        return written
+
+
+class SourceTracker:
+    """Finds the modules whose source files changed.
+
+    The source tree is polled for the modification times and sizes of its
+    files, and changed files are mapped to the modules they define.
+
+    Attributes:
+        roots (list[str]): The root directories of the modules to track.
+        module_filter (ModuleFilter): Selects the modules to track.
+    """
+    def __init__(self, source: Roots, module_filter: ModuleFilter|None = None) -> None:
+        """Initializes the tracker, the source is not read until `snapshot`."""
+        self.roots = normalize_roots(source)
+        self.module_filter = module_filter or ModuleFilter()
+        self.__state = {}
+        self.__modules = {}
+
+    @property
+    def modules(self) -> dict[str, SourceModule]:
+        """The tracked modules by dotted name, as of the last poll."""
+        return {mod.name: mod for mod in self.__modules.values()}
+
+    def snapshot(self) -> None:
+        """Records the current state of the source, changes are found from it."""
+        self.__state = self.__scan()
+        self.__modules = self.__walk()
+
+    def poll(self) -> set[str]:
+        """Finds the modules whose source changed since the last poll.
+
+        Returns:
+            set[str]: The dotted names of the modules which were changed,
+                added or deleted.
+        """
+        state = self.__scan()
+        if state == self.__state:
+            return set()
+        changed_paths = {
+            path for path in state.keys() | self.__state.keys()
+            if state.get(path) != self.__state.get(path)
+        }
+        previous = self.__modules
+        if state.keys() != self.__state.keys():
+            # Files were added or deleted, walk again to name their modules.
+            self.__modules = self.__walk()
+        self.__state = state
+        return {
+            mod.name
+            for modules in (previous, self.__modules)
+            for path, mod in modules.items() if path in changed_paths
+        }
+
+    def __scan(self) -> SourceState:
+        # Files within overlapping roots are found once, by the same path.
+        # Like `walk_modules`, packages the filter does not descend into are
+        # not walked, and modules it does not collect are not stat'ed.
+        state = {}
+        for root in self.roots:
+            for directory, subdirectories, files in os.walk(root):
+                relative = os.path.relpath(directory, root)
+                prefix = (
+                    '' if relative == os.curdir
+                    else f'{relative.replace(os.sep, ".")}.'
+                )
+                subdirectories[:] = [
+                    subdirectory for subdirectory in subdirectories
+                    if not subdirectory.startswith(('.', '__pycache__'))
+                    and self.__descends(
+                        f'{prefix}{subdirectory}',
+                        os.path.join(directory, subdirectory),
+                    )
+                ]
+                for file in files:
+                    if not file.endswith(SOURCE_SUFFIX):
+                        continue
+                    path = os.path.join(directory, file)
+                    if not self.__tracks(f'{prefix}{file[:-len(SOURCE_SUFFIX)]}', path):
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def __descends(self, name: str, directory: str) -> bool:
+        init = os.path.join(directory, f'__init__{SOURCE_SUFFIX}')
+        package = SourceModule(name, init if os.path.isfile(init) else None, True)
+        return self.module_filter.descends(package)
+
+    def __tracks(self, name: str, path: str) -> bool:
+        # Package inits are kept, they tell packages from namespaces.
+        if name == '__init__' or name.endswith('.__init__'):
+            return True
+        return self.module_filter.collects(SourceModule(name, path, False))
+
+    def __walk(self) -> dict[str, SourceModule]:
+        return {
+            os.path.abspath(mod.path): mod
+            for mod in walk_modules(self.roots, self.module_filter)
+            if mod.path is not None
+        }
+
+
+def recollect_module(
+        name: str,
+        mod: SourceModule|None,
+        engine: str,
+        pool: 'WorkerPool|None' = None
+    ) -> None:
+    """Replaces the documentation of a module in the registry.
+
+    The documentation is collected again the way the engine collects it,
+    'import' reloads the module to invoke its decorators, 'ast' parses its
+    source. The previous documentation is restored if collecting fails,
+    also if the module exits, or with a pool if it times out or crashes.
+
+    Args:
+        name (str): The dotted name of the module.
+        mod (SourceModule|None): The module, None if it was deleted, which
+            only removes its documentation.
+        engine (str): How the documentation is collected, 'import' or 'ast'.
+        pool (WorkerPool|None): Collects the module in an isolated worker,
+            in this process if None.
+    """
+    previous = docurator.remove_module(name)
+    if mod is None:
+        return
+    if pool is not None:
+        # Failures are logged by the pool.
+        if pool.collect([mod], engine).failures and previous is not None:
+            docurator.register_module(previous)
+        return
+    try:
+        if engine == 'import':
+            module = sys.modules.get(name)
+            if module is None:
+                importlib.import_module(name)
+            else:
+                importlib.reload(module)
+        elif mod.path is not None and mod.path.endswith(SOURCE_SUFFIX):
+            module_docs = collect_module(name, mod.path)
+            if module_docs is not None:
+                docurator.register_module(module_docs)
+    except (Exception, SystemExit) as e:
+        logger.warning(f'Failed to collect {name}: {e!r}')
+        if previous is not None:
+            docurator.register_module(previous)
+
+
+class _ReferenceRecorder:
+    """Resolves references through a symbol index, recording every reference."""
+    def __init__(self, index: SymbolIndex) -> None:
+        self.index = index
+        self.recorded = set()
+
+    def resolve(self, reference: str, module: str|None = None) -> Symbol|None:
+        self.recorded.add(reference)
+        return self.index.resolve(reference, module)
+
+    def references(self, doc: object) -> Iterator[str]:
+        return self.index.references(doc)
+
+
+def _symbol_keys(index: SymbolIndex, module_name: str) -> Iterator[str]:
+    # The names a reference to a symbol of the module can be resolved by.
+    module_symbol = index.symbols.get(module_name)
+    if module_symbol is None:
+        return
+    yield module_name
+    yield module_name.rpartition('.')[2]
+    stack = list(module_symbol.docs.contents)
+    while stack:
+        doc = stack.pop()
+        yield f'{module_name}.{doc.qualname}'
+        yield doc.name
+        yield doc.qualname
+        if isinstance(doc, DocsContainer):
+            stack.extend(doc.contents)
@@ -0,0 +1,329 @@
+"""Collect modules in isolated worker processes with per-module timeouts.
+
+Some modules can not be imported safely: they hang waiting on a socket, exit
+the interpreter or crash it. A `WorkerPool` imports every module in one of its
+worker processes, so a module which fails can not take the collection down.
+Exceptions and `SystemExit` are reported by the worker, which carries on with
+the next module. A worker which does not finish a module within the timeout
+is killed, and a worker which dies is detected, both are replaced by a new
+worker. Workers are otherwise reused for every module and every collection,
+so their startup is only paid again after a failure.
+
+The documentation a worker captures is sent back to the parent as soon as
+each module is collected, and merged into the docurator registry there.
+
+Classes:
+    ModuleFailure: A module which could not be collected.
+    CollectionReport: The outcome of collecting modules in a pool.
+    WorkerPool: Collects modules in reusable isolated worker processes.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from types import TracebackType
+from typing import Iterable
+
+from instrumentation import ImportProfiler, ModuleProfile
+from module_traverser import ENGINES, SourceModule, collect_chunk, merge_chunk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60.0
+# The seconds a worker is given to exit when the pool closes.
+SHUTDOWN_TIMEOUT = 5.0
+
+ERROR = 'error'
+TIMEOUT = 'timeout'
+CRASH = 'crash'
+
+
+@dataclass(frozen=True)
+class ModuleFailure:
+    """A module which could not be collected.
+
+    Attributes:
+        name (str): The dotted name of the module.
+        reason (str): 'error' if the module raised an exception or exited,
+            'timeout' if it did not finish in time, 'crash' if the worker died.
+        detail (str): The exception, the timeout or the exit code of the worker.
+        seconds (float): The wall time spent on the module.
+    """
+    name: str
+    reason: str
+    detail: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class CollectionReport:
+    """The outcome of collecting modules in a pool.
+
+    Attributes:
+        collected (tuple[str, ...]): The dotted names of the modules collected,
+            in the order they finished.
+        failures (tuple[ModuleFailure, ...]): The modules which could not be
+            collected, in the order they finished.
+        seconds (float): The wall time of the whole collection.
+    """ # noqa: E501
+    collected: tuple[str, ...]
+    failures: tuple[ModuleFailure, ...]
+    seconds: float
+
+    @property
+    def timeouts(self) -> list[ModuleFailure]:
+        """The modules which did not finish within the timeout."""
+        return [failure for failure in self.failures if failure.reason == TIMEOUT]
+
+    def summary(self) -> str:
+        """A human readable summary listing every failure."""
+        lines = [
+            f'{len(self.collected)} modules collected, {len(self.failures)} failed '
+            f'in {self.seconds:.2f}s'
+        ]
+        for failure in sorted(self.failures, key=lambda failure: failure.name):
+            lines.append(f'  {failure.reason:<8} {failure.name}: {failure.detail}')
+        return '\n'.join(lines)
+
+
+class WorkerPool:
+    """Collects modules in reusable isolated worker processes.
+
+    Workers are started on the first collection and kept until the pool is
+    closed. Use as a context manager, or call `close`.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        timeout (float): The seconds a module may take to collect.
+    """
+    def __init__(self, workers: int|None = None, timeout: float = DEFAULT_TIMEOUT) -> None: # noqa: E501
+        """Initializes the pool, no worker is started yet.
+
+        Args:
+            workers (int|None): The number of worker processes, the number
+                of CPUs if None.
+            timeout (float): The seconds a module may take to collect.
+
+        Raises:
+            ValueError: If the number of workers or the timeout is not positive.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('The number of workers must be at least 1.')
+        if timeout <= 0:
+            raise ValueError('The timeout must be positive.')
+        self.workers = workers
+        self.timeout = timeout
+        # Spawned workers start with an empty docurator and no imported modules.
+        self.__context = multiprocessing.get_context('spawn')
+        self.__processes = []
+        self.__generation = 0
+
+    def collect(
+            self,
+            modules: Iterable[SourceModule],
+            engine: str = 'import',
+            profiler: ImportProfiler|None = None
+        ) -> CollectionReport:
+        """Collects modules in the workers, merging their documentation.
+
+        Modules imported by a worker in an earlier collection are imported
+        again, so the documentation reflects their current source. The
+        documentation of every collected module replaces the one in the
+        registry, what a failing module captured is merged into it.
+
+        Args:
+            modules (Iterable[SourceModule]): The modules to collect.
+            engine (str): How the documentation is collected, 'import' or 'ast'.
+            profiler (ImportProfiler|None): Records a profile of every module,
+                failures included.
+
+        Returns:
+            CollectionReport: The modules collected and the failures.
+
+        Raises:
+            ValueError: If the provided engine is not valid.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f'Engine {engine} was not recognized.')
+        start = time.perf_counter()
+        self.__generation += 1
+        trace_memory = False if profiler is None else profiler.trace_memory
+        pending = deque(modules)
+        while len(self.__processes) < min(self.workers, len(pending)):
+            self.__processes.append(self.__start())
+        # The module and the start time of every busy worker.
+        running = {}
+        collected = []
+        failures = []
+
+        while pending or running:
+            for index, worker in enumerate(self.__processes):
+                if not pending or worker in running:
+                    continue
+                if not worker.process.is_alive():
+                    # The worker died after sending its last result.
+                    worker.kill()
+                    worker = self.__processes[index] = self.__start()
+                mod = pending.popleft()
+                worker.send(mod, engine, trace_memory, self.__generation)
+                running[worker] = (mod, time.monotonic())
+
+            deadline = min(started for _, started in running.values()) + self.timeout
+            ready = wait(
+                [
+                    handle for worker in running
+                    for handle in (worker.connection, worker.process.sentinel)
+                ],
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+            now = time.monotonic()
+            for worker, (mod, started) in list(running.items()):
+                failure = None
+                if worker.connection in ready or worker.process.sentinel in ready:
+                    try:
+                        result = worker.connection.recv()
+                    except (EOFError, OSError):
+                        worker.process.join()
+                        failure = ModuleFailure(
+                            mod.name, CRASH,
+                            f'worker exited with code {worker.process.exitcode}',
+                            now - started,
+                        )
+                    else:
+                        profile = ModuleProfile(**result['profiles'][0])
+                        # A module collected again replaces its documentation.
+                        merge_chunk(result, () if profile.failed else (mod.name,))
+                        if profile.failed:
+                            failures.append(ModuleFailure(
+                                mod.name, ERROR, profile.error, profile.wall_seconds
+                            ))
+                        else:
+                            collected.append(mod.name)
+                        if profiler is not None:
+                            profiler.record(profile)
+                        del running[worker]
+                        continue
+                elif now - started >= self.timeout:
+                    worker.kill()
+                    failure = ModuleFailure(
+                        mod.name, TIMEOUT,
+                        f'no result within {self.timeout:g}s', now - started,
+                    )
+                else:
+                    continue
+
+                # The worker is gone, a new one takes its place.
+                failures.append(failure)
+                logger.warning(f'Failed to collect {mod.name}: {failure.detail}')
+                if profiler is not None:
+                    profiler.record(ModuleProfile(
+                        mod.name, wall_seconds=failure.seconds,
+                        error=f'{failure.reason}: {failure.detail}',
+                    ))
+                del running[worker]
+                self.__processes[self.__processes.index(worker)] = self.__start()
+
+        return CollectionReport(
+            tuple(collected), tuple(failures), time.perf_counter() - start
+        )
+
+    def close(self) -> None:
+        """Stops the workers, killing those which do not exit in time."""
+        processes, self.__processes = self.__processes, []
+        for worker in processes:
+            worker.stop()
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        for worker in processes:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.kill()
+
+    def __enter__(self) -> WorkerPool:
+        """Returns the pool, closed when the context exits."""
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException]|None,
+            exc_value: BaseException|None,
+            traceback: TracebackType|None
+        ) -> None:
+        """Stops the workers."""
+        self.close()
+
+    def __start(self) -> _Worker:
+        connection, child_connection = self.__context.Pipe()
+        process = self.__context.Process(
+            target=_serve, args=(child_connection,), daemon=True
+        )
+        process.start()
+        child_connection.close()
+        return _Worker(process, connection)
+
+
+class _Worker:
+    """A worker process and the connection to it."""
+    def __init__(self, process: multiprocessing.Process, connection: Connection) -> None: # noqa: E501
+        self.process = process
+        self.connection = connection
+        # `sys.path` when the worker started, or was last sent to it.
+        self.path = list(sys.path)
+
+    def send(
+            self,
+            mod: SourceModule,
+            engine: str,
+            trace_memory: bool,
+            generation: int
+        ) -> None:
+        # Roots added since the worker started are sent along.
+        path = None if sys.path == self.path else list(sys.path)
+        self.path = list(sys.path)
+        self.connection.send((mod, engine, trace_memory, generation, path))
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.connection.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def _serve(connection: Connection) -> None:
+    """Collects the modules sent to a worker process until told to stop."""
+    # Profiles are sent to the parent, which records and logs them.
+    logging.getLogger(ImportProfiler.__module__).disabled = True
+    generation = 0
+    # The modules imported in an earlier collection, imported again if sent.
+    stale = set()
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        mod, engine, trace_memory, task_generation, path = task
+        if path is not None:
+            sys.path[:] = path
+            importlib.invalidate_caches()
+        if task_generation != generation:
+            generation = task_generation
+            stale = set(sys.modules)
+        if mod.name in stale:
+            stale.discard(mod.name)
+            sys.modules.pop(mod.name, None)
+        connection.send(collect_chunk([mod], engine, trace_memory))
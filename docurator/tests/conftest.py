@@ -0,0 +1,79 @@
+"""Shared fixtures for the docurator tests.
+
+Importing this module makes the flat docurator modules importable, as the
+command line interface and the benchmarks do. The helpers of the benchmarks
+are importable after them, so tests generate the same sources.
+"""
+import importlib
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator
+
+import pytest
+
+PACKAGE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'docurator')
+)
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+BENCHMARKS_DIR = os.path.join(os.path.dirname(PACKAGE_DIR), 'benchmarks')
+if BENCHMARKS_DIR not in sys.path:
+    sys.path.append(BENCHMARKS_DIR)
+
+from docurator import docurator  # noqa: E402
+from worker_pool import WorkerPool  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def empty_registry() -> Iterator[None]:
+    """Runs every test against an empty docurator registry."""
+    docurator.clear()
+    yield
+    docurator.clear()
+
+
+@pytest.fixture
+def isolated_path(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Restores `sys.path` and removes modules imported from the sources."""
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    modules = set(sys.modules)
+    yield
+    for name in set(sys.modules) - modules:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def import_source(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> Iterator[Callable[[str, str], ModuleType]]:
+    """Writes modules to a temporary directory and imports them.
+
+    The modules are removed from `sys.modules` after the test.
+    """
+    monkeypatch.syspath_prepend(str(tmp_path))
+    names = []
+
+    def import_source(name: str, source: str) -> ModuleType:
+        (tmp_path / f'{name}.py').write_text(source)
+        importlib.invalidate_caches()
+        names.append(name)
+        return importlib.import_module(name)
+
+    yield import_source
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[WorkerPool]:
+    """A pool of one isolated worker.
+
+    Spawned workers start with the `sys.path` of the test, the flat modules
+    are put first so they import like under the command line interface.
+    """
+    monkeypatch.syspath_prepend(PACKAGE_DIR)
+    with WorkerPool(1, 30) as pool:
+        yield pool
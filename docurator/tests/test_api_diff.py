@@ -0,0 +1,47 @@
+"""Tests for comparing the documented API of two registries."""
+import hashlib
+
+import pytest
+
+import doc_containers
+from api_diff import CHANGED, ApiChange, diff_docs
+from doc_containers import ClassDocs, ModuleDocs, ObjectDocs
+
+
+def registry(run_docstring: str) -> dict[str, ModuleDocs]:
+    """A module documenting a class with two methods."""
+    module_docs = ModuleDocs('diffed', 'A module.')
+    class_docs = ClassDocs('Job', 'A job.', 'Job', 'type')
+    class_docs.update([
+        ObjectDocs('run', run_docstring, 'Job.run', 'function'),
+        ObjectDocs('stop', 'Stops.', 'Job.stop', 'function'),
+    ])
+    module_docs.add(class_docs)
+    return {module_docs.name: module_docs}
+
+
+def test_reports_nested_change() -> None:
+    """A change within a class is reported for the entry, not its containers."""
+    assert diff_docs(registry('Runs.'), registry('Runs now.')) == [
+        ApiChange('diffed.Job.run', CHANGED, 'object', ('docstring',))
+    ]
+    assert diff_docs(registry('Runs.'), registry('Runs.')) == []
+
+
+def test_hashes_every_subtree_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Containers are hashed once per diff, not again for every ancestor."""
+    old, new = registry('Runs.'), registry('Runs now.')
+    for docs in (old, new):
+        # Own hashes are computed once and kept.
+        docs['diffed'].content_hash
+    digests = []
+    new_digest = hashlib.blake2b
+
+    def blake2b(*args: object, **kwargs: object) -> 'hashlib.blake2b':
+        digests.append(args)
+        return new_digest(*args, **kwargs)
+    monkeypatch.setattr(doc_containers.hashlib, 'blake2b', blake2b)
+    diff_docs(old, new)
+
+    # The module and the class of both registries.
+    assert len(digests) == 4
@@ -0,0 +1,112 @@
+"""Stress importing decorated modules from many threads at once.
+
+Every round writes a package of decorated modules and imports them from a
+thread pool, switching threads as often as possible. The documentation tree
+must be complete, every method attached to its class, and identical to the
+tree parsed from the source, whichever threads imported the modules.
+Another thread finalizes the tree over and over while the modules import.
+"""
+import importlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from ast_collector import collect_module
+from docurator import docurator
+
+ROUNDS = 3
+MODULES = 100
+THREADS = 16
+FUNCTIONS, CLASSES, METHODS = 10, 5, 6
+
+
+def module_source() -> str:
+    """The source of a module with decorated functions, classes and methods."""
+    lines = ['"""Imported concurrently."""', 'from docurator import document_me']
+    for i in range(FUNCTIONS):
+        lines.extend([
+            '@document_me',
+            f'def function_{i}(a: int) -> int:',
+            f'    """Function {i}."""',
+            '    return a',
+        ])
+    for i in range(CLASSES):
+        lines.extend(['@document_me', f'class Class{i}:', f'    """Class {i}."""'])
+        for j in range(METHODS):
+            lines.extend([
+                '    @document_me',
+                f'    def method_{j}(self, x: int) -> int:',
+                f'        """Method {j}."""',
+                '        return x',
+            ])
+    return '\n'.join(lines) + '\n'
+
+
+def tree(doc: object) -> tuple:
+    """The names of documentation and its contents, in a canonical order."""
+    contents = getattr(doc, 'contents', ())
+    return (
+        getattr(doc, 'qualname', None),
+        type(doc).__name__,
+        tuple(sorted(tree(child) for child in contents)),
+    )
+
+
+def finalize_until(done: threading.Event) -> None:
+    """Builds the tree from the captures so far until done is set."""
+    while not done.is_set():
+        docurator.finalize()
+
+
+@pytest.fixture
+def switch_often() -> Iterator[None]:
+    """Switches threads as often as possible."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize('round_', range(ROUNDS))
+def test_concurrent_imports(
+        round_: int,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        switch_often: None
+    ) -> None:
+    """The tree is complete whichever threads imported the modules."""
+    package = f'concurrent_{round_}'
+    os.makedirs(tmp_path / package)
+    (tmp_path / package / '__init__.py').write_text('"""Concurrent package."""\n')
+    source = module_source()
+    for i in range(MODULES):
+        (tmp_path / package / f'module_{i}.py').write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    expected = tree(collect_module(package, str(tmp_path / package / 'module_0.py')))
+    names = [f'{package}.module_{i}' for i in range(MODULES)]
+    members = MODULES * (FUNCTIONS + CLASSES * (METHODS + 1))
+    captures = docurator.capture_count
+
+    done = threading.Event()
+    finalizer = threading.Thread(target=finalize_until, args=(done,))
+    finalizer.start()
+    try:
+        with ThreadPoolExecutor(THREADS) as executor:
+            list(executor.map(importlib.import_module, names))
+    finally:
+        done.set()
+        finalizer.join()
+        for name in [package, *names]:
+            sys.modules.pop(name, None)
+
+    docs = docurator.docs
+    assert docurator.capture_count - captures == members
+    assert not docurator.unattached_methods
+    assert sorted(docs) == sorted(names)
+    for name in names:
+        assert tree(docs[name]) == expected, name
@@ -0,0 +1,50 @@
+"""Tests for writing the Markdown files of modules."""
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import content_parser
+from content_parser import module_path, write_docs, write_module
+from doc_containers import ModuleDocs, ObjectDocs
+
+
+def module_docs() -> ModuleDocs:
+    """A module documenting one function."""
+    docs = ModuleDocs('pkg.module', 'A module.')
+    docs.add(ObjectDocs('run', 'Runs.', 'run', 'function'))
+    return docs
+
+
+def test_writes_only_changed_files(tmp_path: Path) -> None:
+    """A file is written when its contents change, and left alone otherwise."""
+    target = str(tmp_path)
+    docs = module_docs()
+
+    assert write_docs({docs.name: docs}, target) == [module_path(docs.name, target)]
+    assert write_docs({docs.name: docs}, target) == []
+    assert os.listdir(target) == [os.path.basename(module_path(docs.name, target))]
+
+
+def test_failed_rendering_leaves_no_temporary_file(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """A module which fails to render leaves the directory as it was."""
+    target = str(tmp_path)
+    docs = module_docs()
+    write_module(docs, target)
+    with open(module_path(docs.name, target)) as file:
+        written = file.read()
+
+    def render_module(*args: object) -> Iterator[str]:
+        yield '# Partial\n'
+        raise RuntimeError('rendering failed')
+    monkeypatch.setattr(content_parser, 'render_module', render_module)
+
+    with pytest.raises(RuntimeError):
+        write_module(docs, target)
+    assert os.listdir(target) == [os.path.basename(module_path(docs.name, target))]
+    with open(module_path(docs.name, target)) as file:
+        assert file.read() == written
@@ -0,0 +1,88 @@
+"""Per-decoration checks of `document_me`.
+
+The members and stages are those of `benchmarks/bench_decoration.py`,
+which reports their cost and holds it to per-object budgets.
+"""
+import sys
+from typing import Callable, Iterator
+
+import pytest
+from bench_decoration import identity, materialize, members_by_kind
+from common import load_module, module_source
+
+from doc_containers import ClassDocs, ObjectDocs
+from docurator import decorator_factory, docurator
+
+FUNCTIONS = 1_000
+CLASSES = 100
+METHODS = 10
+
+
+@pytest.fixture(scope='module')
+def members() -> Iterator[dict[str, list[Callable]]]:
+    """The members of a generated module by the kind of object decorated."""
+    module = load_module(
+        'decoration_members', module_source(FUNCTIONS, CLASSES, METHODS)
+    )
+    yield members_by_kind(module)
+    del sys.modules[module.__name__]
+
+
+def documented() -> list[ObjectDocs]:
+    """The documentation of all objects in the registry, attached or not."""
+    docs = [
+        doc for module_docs in docurator.docs.values() for doc in module_docs.contents
+    ]
+    docs.extend(
+        doc for methods in docurator.unattached_methods.values() for doc in methods
+    )
+    return docs
+
+
+@pytest.mark.parametrize('kind, expected', [
+    ('function', ObjectDocs),
+    ('classmethod', ObjectDocs),
+    ('class', ClassDocs),
+    ('method', ObjectDocs),
+])
+def test_documents_every_kind(
+        members: dict[str, list[Callable]],
+        kind: str,
+        expected: type
+    ) -> None:
+    """Every decorated object of a kind is returned and documented."""
+    document_me = decorator_factory('doc')
+    assert all(document_me(member) is member for member in members[kind])
+    materialize(document_me, members[kind])
+    docs = documented()
+
+    assert docurator.capture_count >= len(members[kind])
+    assert len(docs) == len(members[kind])
+    assert all(type(doc) is expected for doc in docs)
+    if kind == 'class':
+        assert all(str(doc.f_signature) == '()' for doc in docs)
+        assert all(doc.parents is None for doc in docs)
+    else:
+        assert all(doc.f_signature.return_annotation is int for doc in docs)
+
+
+def test_production_returns_objects_unchanged(
+        members: dict[str, list[Callable]]
+    ) -> None:
+    """Production mode returns every object as is and documents nothing."""
+    document_me = decorator_factory('production')
+    for kind_members in members.values():
+        for member in kind_members:
+            assert document_me(member) is member
+            assert document_me('users', 'maintainers')(member) is member
+    assert document_me()(identity) is identity
+    assert not docurator.docs
+
+
+def test_production_rejects_invalid_tags() -> None:
+    """Production mode checks tags like doc mode does."""
+    document_me = decorator_factory('production')
+    with pytest.raises(ValueError):
+        document_me('users', 1)
+    with pytest.raises(ValueError):
+        document_me(identity, 'users')
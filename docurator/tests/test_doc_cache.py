@@ -0,0 +1,201 @@
+"""Tests for the on disk documentation cache."""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import doc_cache
+from ast_collector import collect_module
+from doc_cache import CACHE_FORMAT, DocCache, source_state
+from docurator import __version__, docurator
+from module_traverser import invoke_modules
+from serialization import docs_to_dict
+
+SOURCE = '''"""A cached module."""
+from docurator import document_me
+
+
+@document_me
+def greet(name: str) -> str:
+    """Greets someone."""
+    return name
+'''
+
+
+@pytest.fixture
+def module_path(tmp_path: Path) -> str:
+    """Writes a module to cache."""
+    path = tmp_path / 'cached.py'
+    path.write_text(SOURCE)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DocCache:
+    """A cache for the 'ast' engine."""
+    return DocCache(str(tmp_path / 'cache'), 'ast')
+
+
+def store(cache: DocCache, path: str) -> None:
+    """Collects the module at path and stores its documentation."""
+    state = source_state(path)
+    cache.store('cached', path, collect_module('cached', path), state)
+
+
+def test_entry_layout(cache: DocCache, module_path: str) -> None:
+    """An entry holds the documented keys, with the state of the source."""
+    store(cache, module_path)
+    with open(cache.entry_path('cached', module_path), encoding='utf-8') as file:
+        entry = json.load(file)
+    stat = os.stat(module_path)
+
+    assert entry == {
+        'format': CACHE_FORMAT,
+        'version': __version__,
+        'engine': 'ast',
+        'module': 'cached',
+        'path': os.path.abspath(module_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': source_state(module_path).sha256,
+        'docs': docs_to_dict(collect_module('cached', module_path)),
+    }
+    assert os.path.dirname(cache.entry_path('cached', module_path)) == cache.directory
+    assert os.listdir(cache.directory) == [
+        os.path.basename(cache.entry_path('cached', module_path))
+    ]
+
+
+def test_load_unchanged(cache: DocCache, module_path: str) -> None:
+    """An unchanged module is loaded from its entry."""
+    store(cache, module_path)
+    entry = cache.load('cached', module_path)
+
+    assert entry is not None
+    assert entry.module_docs.name == 'cached'
+    assert [doc.name for doc in entry.module_docs.contents] == ['greet']
+
+
+def test_load_missing(cache: DocCache, module_path: str) -> None:
+    """A module without an entry is not loaded."""
+    assert cache.load('cached', module_path) is None
+
+
+def test_touch_keeps_entry(
+        cache: DocCache,
+        module_path: str,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """A touched module with unchanged contents is hashed once, then refreshed."""
+    store(cache, module_path)
+    stat = os.stat(module_path)
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.load('cached', module_path) is not None
+    with open(cache.entry_path('cached', module_path), encoding='utf-8') as file:
+        assert json.load(file)['mtime_ns'] == stat.st_mtime_ns + 10**9
+
+    # The refreshed entry matches without hashing the source again.
+    def fail(path: str) -> str:
+        raise AssertionError('The source was hashed.')
+    monkeypatch.setattr(doc_cache, '_hash_file', fail)
+    assert cache.load('cached', module_path) is not None
+
+
+def test_content_change_invalidates(cache: DocCache, module_path: str) -> None:
+    """A module whose contents changed is collected again."""
+    store(cache, module_path)
+    stat = os.stat(module_path)
+    with open(module_path, 'w') as file:
+        file.write(SOURCE.replace('Greets', 'Thanks'))
+    # The same size, the hash tells the contents apart.
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert os.stat(module_path).st_size == stat.st_size
+
+    assert cache.load('cached', module_path) is None
+
+
+def test_size_change_invalidates(cache: DocCache, module_path: str) -> None:
+    """A module which grew is collected again."""
+    store(cache, module_path)
+    with open(module_path, 'a') as file:
+        file.write('\nVALUE = 1\n')
+
+    assert cache.load('cached', module_path) is None
+
+
+@pytest.mark.parametrize('key, value', [
+    ('format', CACHE_FORMAT + 1),
+    ('version', '0.0.0'),
+    ('engine', 'import'),
+    ('module', 'other'),
+    ('path', '/elsewhere/cached.py'),
+])
+def test_mismatch_invalidates(
+        cache: DocCache,
+        module_path: str,
+        key: str,
+        value: object
+    ) -> None:
+    """An entry from another format, version, engine or source is not loaded."""
+    store(cache, module_path)
+    entry_path = cache.entry_path('cached', module_path)
+    with open(entry_path, encoding='utf-8') as file:
+        entry = json.load(file)
+    entry[key] = value
+    with open(entry_path, 'w', encoding='utf-8') as file:
+        json.dump(entry, file)
+
+    assert cache.load('cached', module_path) is None
+
+
+def test_engines_have_separate_entries(module_path: str, tmp_path: Path) -> None:
+    """Entries of one engine are never loaded by another."""
+    directory = str(tmp_path / 'cache')
+    store(DocCache(directory, 'ast'), module_path)
+
+    assert DocCache(directory, 'import').load('cached', module_path) is None
+    assert DocCache(directory, 'ast').load('cached', module_path) is not None
+
+
+def test_corrupt_entry_is_ignored(cache: DocCache, module_path: str) -> None:
+    """An unreadable entry is treated as missing."""
+    store(cache, module_path)
+    with open(cache.entry_path('cached', module_path), 'w') as file:
+        file.write('{not json')
+
+    assert cache.load('cached', module_path) is None
+
+
+def test_edit_during_collection(
+        module_path: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """A source edited while it is collected is not cached as up to date."""
+    directory = str(tmp_path / 'cache')
+    store = DocCache.store
+
+    def edit_then_store(self: DocCache, *args: object) -> None:
+        # The module was collected, and is edited before it is stored.
+        with open(module_path, 'a') as file:
+            file.write('\nEDITED = True\n')
+        store(self, *args)
+    monkeypatch.setattr(DocCache, 'store', edit_then_store)
+    invoke_modules(str(tmp_path), 'ast', cache_dir=directory)
+    monkeypatch.undo()
+
+    assert 'cached' in docurator.docs
+    assert DocCache(directory, 'ast').load('cached', module_path) is None
+
+
+def test_invoke_modules_uses_cache(module_path: str, tmp_path: Path) -> None:
+    """A second collection loads unchanged modules from the cache."""
+    directory = str(tmp_path / 'cache')
+    invoke_modules(str(tmp_path), 'ast', cache_dir=directory)
+    first = docs_to_dict(docurator.docs['cached'])
+    docurator.clear()
+
+    invoke_modules(str(tmp_path), 'ast', cache_dir=directory)
+    assert docs_to_dict(docurator.docs['cached']) == first
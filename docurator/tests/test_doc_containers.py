@@ -0,0 +1,64 @@
+"""Tests for the contents of documentation containers."""
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from doc_containers import ClassDocs, DocsContents, ModuleDocs, ObjectDocs
+from views import View
+
+
+def function(name: str, docstring: str|None = None) -> ObjectDocs:
+    """The documentation of a module level function."""
+    return ObjectDocs(name, docstring, name, 'function')
+
+
+@pytest.fixture
+def module_docs() -> ModuleDocs:
+    """A module documenting two functions and a class."""
+    module_docs = ModuleDocs('contained', 'A module.')
+    module_docs.update([function('first'), function('second')])
+    module_docs.add(ClassDocs('Job', 'A job.', 'Job', 'type'))
+    return module_docs
+
+
+def test_contents_are_a_set(module_docs: ModuleDocs) -> None:
+    """Contents support membership, length, equality and set operations."""
+    contents = module_docs.contents
+    first, second = function('first'), function('second')
+
+    assert isinstance(contents, DocsContents)
+    assert len(contents) == 3
+    assert first in contents
+    assert function('missing') not in contents
+    assert contents == {first, second, ClassDocs('Job', None, 'Job', 'type')}
+    assert contents - {first} == {second, module_docs.get('Job')}
+    assert contents & {second} == {second}
+    assert isinstance(contents | set(), set)
+    assert [doc.name for doc in contents] == ['first', 'second', 'Job']
+
+
+def test_contents_change_the_container(module_docs: ModuleDocs) -> None:
+    """Adding and removing through the contents changes the container."""
+    contents = module_docs.contents
+    contents.add(function('third'))
+    # Like a set, adding an equal documentation keeps the first one.
+    contents.add(function('first', 'Replaced.'))
+    contents.discard(function('second'))
+    contents.remove(module_docs.get('Job'))
+
+    assert [doc.name for doc in module_docs.contents] == ['first', 'third']
+    assert module_docs.get('first').docstring is None
+    assert 'second' not in module_docs
+    with pytest.raises(KeyError):
+        contents.remove(function('second'))
+
+
+def test_view_contents_are_read_only(module_docs: ModuleDocs) -> None:
+    """The contents of a projection can not be changed."""
+    view = View('users').project({'contained': module_docs})['contained']
+
+    assert [doc.name for doc in view.contents] == ['first', 'second', 'Job']
+    with pytest.raises(FrozenInstanceError):
+        view.contents.add(function('third'))
+    with pytest.raises(FrozenInstanceError):
+        view.contents.discard(function('first'))
@@ -0,0 +1,118 @@
+"""Check the import cost of `docurator` in production mode against a budget.
+
+Imports `docurator` in fresh interpreters with `-X importtime`. In production
+mode the import must not load any other module, and the best cumulative import
+time must stay within `BUDGET_US`. The collection machinery is still imported
+on first use.
+
+Bytecode is compiled to a temporary cache first, the source is not compiled
+on every run.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'docurator')
+)
+BUDGET_US = 1_000
+RUNS = 7
+
+
+def run_python(mode: str, cache_dir: str, code: str) -> subprocess.CompletedProcess:
+    """Runs code in a fresh interpreter importing with `-X importtime`.
+
+    Args:
+        mode (str): The value of `DOCURATOR_MODE`.
+        cache_dir (str): The directory to cache the bytecode in.
+        code (str): The code to run.
+
+    Returns:
+        subprocess.CompletedProcess: The finished interpreter.
+    """
+    env = dict(
+        os.environ,
+        DOCURATOR_MODE=mode,
+        PYTHONPATH=PACKAGE_DIR,
+        PYTHONPYCACHEPREFIX=cache_dir,
+    )
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PACKAGE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def import_times(mode: str, cache_dir: str) -> dict[str, tuple[int, int]]:
+    """Imports `docurator` in a fresh interpreter with `-X importtime`.
+
+    Args:
+        mode (str): The value of `DOCURATOR_MODE`.
+        cache_dir (str): The directory to cache the bytecode in.
+
+    Returns:
+        dict[str, tuple[int, int]]: The self and cumulative microseconds of
+            `docurator` and the modules it imported, by module name.
+    """
+    result = run_python(mode, cache_dir, 'import docurator')
+    # Nested imports are listed before the module importing them,
+    # everything after the interpreter startup is due to `docurator`.
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if name == 'site':
+            times.clear()
+            continue
+        times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.fixture(scope='module')
+def cache_dir(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """A bytecode cache, filled by importing in doc mode once."""
+    cache_dir = str(tmp_path_factory.mktemp('pycache'))
+    import_times('doc', cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(scope='module')
+def production(cache_dir: str) -> dict[str, tuple[int, int]]:
+    """The import times of the fastest production mode import."""
+    runs = [import_times('production', cache_dir) for _ in range(RUNS)]
+    return min(runs, key=lambda times: times['docurator'][1])
+
+
+def test_production_imports_nothing_else(
+        production: dict[str, tuple[int, int]]
+    ) -> None:
+    """Importing in production mode loads no other module."""
+    assert sorted(name for name in production if name != 'docurator') == []
+
+
+def test_production_within_budget(production: dict[str, tuple[int, int]]) -> None:
+    """Importing in production mode stays within the budget."""
+    assert production['docurator'][1] <= BUDGET_US, (
+        f'production mode import takes {production["docurator"][1]} us, '
+        f'over the budget of {BUDGET_US} us'
+    )
+
+
+def test_doc_mode_imports_registry(cache_dir: str) -> None:
+    """Importing in doc mode loads the collection machinery."""
+    assert 'registry' in import_times('doc', cache_dir)
+
+
+def test_registry_imported_on_first_use(cache_dir: str) -> None:
+    """The registry is still available in production mode, imported on use."""
+    code = (
+        'import sys, docurator\n'
+        'assert "registry" not in sys.modules\n'
+        'assert docurator.docurator.docs == {}\n'
+        'assert "registry" in sys.modules\n'
+    )
+    run_python('production', cache_dir, code)
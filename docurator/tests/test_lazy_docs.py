@@ -0,0 +1,120 @@
+"""Tests for the documentation computed lazily from decorated objects."""
+import gc
+import importlib
+import inspect
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+from content_parser import write_docs
+from doc_containers import Lazy
+from docurator import docurator
+from module_traverser import invoke_modules
+from search_index import SearchIndex
+from serialization import docs_from_dict, docs_to_dict
+from symbol_index import SymbolIndex
+
+SOURCE = '''"""A documented module."""
+from docurator import document_me
+
+
+class Base:
+    """Not documented."""
+
+
+@document_me
+def greet(name: str, punctuation: str = '!') -> str:
+    """Greets someone."""
+    return name + punctuation
+
+
+@document_me
+class Greeter(Base):
+    """Greets many."""
+'''
+BUILTIN_SUBCLASSES_SOURCE = '''"""Classes without a signature."""
+from docurator import document_me
+
+
+@document_me
+class LookupFailed(Exception):
+    """Raised when a lookup fails."""
+
+
+@document_me
+class Registry(dict):
+    """Maps names to values."""
+'''
+
+
+def test_values_are_lazy(import_source: Callable[[str, str], ModuleType]) -> None:
+    """Signatures and parents are computed on first access."""
+    module = import_source('lazy_module', SOURCE)
+    greeter = docurator.docs['lazy_module'].get_class('Greeter')
+
+    for slot in ('_parents', '_f_signature'):
+        assert isinstance(object.__getattribute__(greeter, slot), Lazy)
+    assert greeter.parents == [module.Base]
+    assert str(greeter.f_signature) == '()'
+    # Resolved values replace the lazy ones.
+    assert object.__getattribute__(greeter, '_parents') == [module.Base]
+    assert isinstance(
+        object.__getattribute__(greeter, '_f_signature'), inspect.Signature
+    )
+
+
+def test_deleted_object(
+        import_source: Callable[[str, str], ModuleType],
+        tmp_path: Path
+    ) -> None:
+    """The documentation of an object deleted before it is used is complete."""
+    module = import_source('deleted_module', SOURCE)
+    docurator.finalize()
+    del module.greet, module.Greeter
+    sys.modules.pop('deleted_module')
+    del module
+    gc.collect()
+
+    written = write_docs(docurator.docs, str(tmp_path / 'docs'))
+    greet = docurator.docs['deleted_module'].get('greet')
+    assert written
+    assert str(greet.f_signature) == "(name: str, punctuation: str = '!') -> str"
+    assert docs_to_dict(docurator.docs['deleted_module'])
+
+
+def test_reloaded_module(
+        import_source: Callable[[str, str], ModuleType],
+        tmp_path: Path
+    ) -> None:
+    """The documentation of a reloaded module can still be rendered."""
+    module = import_source('reloaded_module', SOURCE)
+    docurator.finalize()
+    importlib.reload(module)
+    gc.collect()
+
+    assert write_docs(docurator.docs, str(tmp_path / 'docs'))
+    greeter = docurator.docs['reloaded_module'].get_class('Greeter')
+    assert [parent.__name__ for parent in greeter.parents] == ['Base']
+    assert not list((tmp_path / 'docs').glob('*.tmp'))
+
+
+def test_builtin_subclasses(isolated_path: None, tmp_path: Path) -> None:
+    """Classes without a signature, e.g. exceptions, are documented without one."""
+    root = tmp_path / 'src'
+    root.mkdir()
+    (root / 'builtin_subclasses.py').write_text(BUILTIN_SUBCLASSES_SOURCE)
+    invoke_modules(str(root), 'import', cache_dir=str(tmp_path / 'cache'))
+
+    docs = docurator.docs
+    module_docs = docs['builtin_subclasses']
+    for name in ('LookupFailed', 'Registry'):
+        assert module_docs.get_class(name).f_signature is None
+    assert module_docs.content_hash
+    assert write_docs(docs, str(tmp_path / 'docs'))
+    assert SymbolIndex(docs).resolve('LookupFailed') is not None
+    assert SearchIndex().update(docs.values())
+
+    loaded = docs_from_dict(docs_to_dict(module_docs))
+    assert loaded.get_class('LookupFailed').f_signature is None
+    assert loaded.content_hash == module_docs.content_hash
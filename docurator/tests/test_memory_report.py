@@ -0,0 +1,108 @@
+"""Tests for the memory report of the documentation containers."""
+import sys
+from types import ModuleType
+from typing import Callable
+
+from doc_containers import (
+    NO_TAGS,
+    ClassDocs,
+    Lazy,
+    ModuleDocs,
+    ObjectDocs,
+    memory_report,
+)
+from docurator import docurator
+
+size = sys.getsizeof
+
+
+def build_modules() -> tuple[ModuleDocs, ModuleDocs]:
+    """Two modules with a function, a class with a method, and a function."""
+    first = ModuleDocs('pkg.first', 'The first module.')
+    first.add(ObjectDocs('run', 'Runs.', 'run', 'function'))
+    job = ClassDocs('Job', 'A job.', 'Job', 'type', parents=[int])
+    job.add(ObjectDocs('run', 'Runs a job.', 'Job.run', 'function'))
+    first.add(job)
+    second = ModuleDocs('pkg.second', None)
+    second.add(ObjectDocs('run', 'Runs the second.', 'run', 'function'))
+    return first, second
+
+
+def test_sizes_per_kind_and_module() -> None:
+    """Every container and string is counted once, for its first holder."""
+    first, second = build_modules()
+    run = first.get('run')
+    job = first.get_class('Job')
+    method = job.get('run')
+    other_run = second.get('run')
+
+    first_own = (
+        size(first) + size(first.name) + size(first.docstring)
+        + size(first._contents)
+    )
+    # The qualname of a module level object is its interned name.
+    run_own = (
+        size(run) + size(run.name) + size(run.docstring) + size(run.type)
+        + size(NO_TAGS)
+    )
+    job_own = (
+        size(job) + size(job.name) + size(job.docstring) + size(job.type)
+        + size(job.parents) + size(job._contents)
+    )
+    # The name and type are shared with the first function.
+    method_own = size(method) + size(method.docstring) + size(method.qualname)
+    second_own = size(second) + size(second.name) + size(second._contents)
+    other_run_own = size(other_run) + size(other_run.docstring)
+
+    report = memory_report([first, second])
+
+    assert report.kinds == {
+        'module': first_own + second_own,
+        'class': job_own,
+        'object': run_own + method_own + other_run_own,
+    }
+    assert report.modules == {
+        'pkg.first': first_own + run_own + job_own + method_own,
+        'pkg.second': second_own + other_run_own,
+    }
+    assert report.total == sum(report.modules.values()) == sum(report.kinds.values())
+
+
+def test_lazy_parents_are_not_counted() -> None:
+    """Parents are counted once resolved, not while lazy."""
+    job = ClassDocs('Job', 'A job.', 'Job', 'type', parents=Lazy(list, (int,)))
+    module_docs = ModuleDocs('pkg.lazy', None)
+    module_docs.add(job)
+
+    lazy = memory_report([module_docs]).kinds['class']
+    parents = job.parents
+
+    assert parents == [int]
+    assert memory_report([module_docs]).kinds['class'] == lazy + size(parents)
+
+
+def test_registry_report(import_source: Callable[[str, str], ModuleType]) -> None:
+    """The registry reports every collected module, adding up to the total."""
+    import_source('reported_module', '''"""Reported."""
+from docurator import document_me
+
+
+@document_me
+def run() -> None:
+    """Runs."""
+
+
+@document_me
+class Job:
+    """A job."""
+
+    @document_me
+    def run(self) -> None:
+        """Runs a job."""
+''')
+    report = docurator.memory_report()
+
+    assert set(report.modules) == {'reported_module'}
+    assert report.modules['reported_module'] == report.total
+    assert all(report.kinds[kind] > 0 for kind in ('module', 'class', 'object'))
+    assert report.total == sum(report.kinds.values())
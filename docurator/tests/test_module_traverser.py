@@ -0,0 +1,96 @@
+"""Tests for putting source roots on the import path and importing from them."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from docurator import docurator
+from instrumentation import ImportProfiler
+from module_traverser import DOCURATOR_DIR, add_import_roots, invoke_modules
+
+DECORATED = '''"""A source module."""
+from docurator import document_me
+
+
+@document_me
+def {name}_function() -> None:
+    """Documented."""
+'''
+
+
+@pytest.fixture
+def source_root(tmp_path: Path) -> Path:
+    """A root with modules named like docurator's own modules, and another."""
+    root = tmp_path / 'src'
+    root.mkdir()
+    for name in ('serialization', 'snapshot', 'plain_module'):
+        (root / f'{name}.py').write_text(DECORATED.format(name=name))
+    return root
+
+
+def test_roots_follow_docurator_modules(
+        isolated_path: None,
+        tmp_path: Path
+    ) -> None:
+    """Roots are inserted after docurator's own modules, in the given order."""
+    first, second = str(tmp_path / 'first'), str(tmp_path / 'second')
+    sys.path[:] = ['/elsewhere', DOCURATOR_DIR, '/later']
+
+    assert add_import_roots([first, second]) == [first, second]
+    assert sys.path == ['/elsewhere', DOCURATOR_DIR, first, second, '/later']
+    assert add_import_roots(first) == []
+
+
+def test_roots_first_without_docurator_modules(
+        isolated_path: None,
+        tmp_path: Path
+    ) -> None:
+    """Roots go first if docurator's modules are not on the path by directory."""
+    sys.path[:] = ['/elsewhere']
+
+    add_import_roots(str(tmp_path))
+    assert sys.path == [str(tmp_path), '/elsewhere']
+
+
+def test_module_named_like_docurator_module(
+        isolated_path: None,
+        source_root: Path
+    ) -> None:
+    """A source module shadowed by a docurator module fails to collect."""
+    profiler = ImportProfiler(trace_memory=False)
+    invoke_modules(str(source_root), 'import', profiler=profiler)
+
+    errors = {profile.name: profile.error for profile in profiler.profiles}
+    assert errors['plain_module'] is None
+    assert 'resolves to' in errors['serialization']
+    assert 'resolves to' in errors['snapshot']
+    assert set(docurator.docs) == {'plain_module'}
+
+
+def test_module_named_like_docurator_module_parsed(source_root: Path) -> None:
+    """The 'ast' engine documents modules named like docurator's modules."""
+    invoke_modules(str(source_root), 'ast')
+
+    assert set(docurator.docs) == {'serialization', 'snapshot', 'plain_module'}
+
+
+def test_build_snapshot_with_shadowing_source(
+        source_root: Path,
+        tmp_path: Path
+    ) -> None:
+    """Building from sources with a `snapshot` module writes the snapshot."""
+    snapshot_path = tmp_path / 'docs.snapshot'
+    env = dict(os.environ)
+    env.pop('DOCURATOR_MODE', None)
+    result = subprocess.run(
+        [
+            sys.executable, 'cli.py', 'build', str(source_root),
+            str(tmp_path / 'docs'), '--snapshot', str(snapshot_path),
+        ],
+        cwd=DOCURATOR_DIR, env=env, capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert snapshot_path.exists()
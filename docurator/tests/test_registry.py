@@ -0,0 +1,85 @@
+"""Tests for capturing decorated objects and building the documentation tree."""
+import functools
+import sys
+import threading
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+from docurator import Docurator, docurator
+from registry import _resolve_module
+
+THREADS = 50
+SOURCE = '''"""A module whose import fails."""
+from docurator import document_me
+
+
+@document_me
+class Job:
+    """A job."""
+
+    @document_me
+    def run(self) -> None:
+        """Runs."""
+
+
+raise RuntimeError('import failed')
+'''
+
+
+def run() -> None:
+    """Runs."""
+
+
+def test_module_resolved_at_capture(
+        import_source: Callable[[str, str], ModuleType]
+    ) -> None:
+    """Objects of a module removed from `sys.modules` are still documented."""
+    with pytest.raises(RuntimeError):
+        import_source('failed_module', SOURCE)
+    assert 'failed_module' not in sys.modules
+
+    module_docs = docurator.docs['failed_module']
+    assert module_docs.docstring == 'A module whose import fails.'
+    assert module_docs.get_class('Job').get('run') is not None
+
+
+def test_failed_build_keeps_captures(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Captures drained by a finalize which fails are built by the next one."""
+    docurator.add(run)
+
+    def fail(f: Callable, tags: tuple) -> None:
+        raise RuntimeError('build failed')
+    monkeypatch.setattr(Docurator, '_Docurator__create_doc', staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        docurator.finalize()
+    monkeypatch.undo()
+
+    assert docurator.docs[__name__].get('run') is not None
+
+
+def test_rejects_objects_which_can_not_be_built() -> None:
+    """Callables without a qualified name or module raise when decorated."""
+    with pytest.raises(ValueError):
+        docurator.add(functools.partial(print))
+    anonymous = type('Anonymous', (), {'__module__': None})
+    assert _resolve_module(anonymous) is None
+    with pytest.raises(ValueError):
+        docurator.add(anonymous)
+    assert not docurator.docs
+
+
+def test_ended_threads_drop_their_buffers() -> None:
+    """Capture buffers of ended threads are dropped, keeping their count."""
+    registry = Docurator()
+    captures = registry.capture_count
+    for _ in range(THREADS):
+        # Like the doc server refreshing modules, a thread per request.
+        thread = threading.Thread(target=registry.add, args=(run,))
+        thread.start()
+        thread.join()
+        assert registry.docs[__name__].get('run') is not None
+
+    assert len(registry._Docurator__buffers) <= 1
+    assert registry.capture_count - captures == THREADS
@@ -0,0 +1,244 @@
+"""Tests for the doc server, over HTTP on localhost."""
+import http.client
+import json
+import socket
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from module_traverser import invoke_modules
+from server import DocServer, DocService
+
+CLIENTS = 8
+QUERIES = 50
+REFRESHES = 6
+OLD_TEXT = 'Starts describing'
+NEW_TEXT = 'Starts now describing'
+
+
+def module_source(i: int) -> str:
+    """The source of a module with a documented function and class."""
+    return f'''"""Served module {i}."""
+from docurator import document_me
+
+
+@document_me
+def start_{i}(delay: int = 0) -> None:
+    """{OLD_TEXT} the job {i}."""
+
+
+@document_me
+class Job{i}:
+    """A job to serve."""
+
+    @document_me
+    def run(self) -> None:
+        """Runs the job."""
+'''
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Path:
+    """A package of served modules, collected with the 'ast' engine."""
+    package = tmp_path / 'served'
+    package.mkdir()
+    (package / '__init__.py').write_text('"""Served package."""\n')
+    for i in range(5):
+        (package / f'module_{i}.py').write_text(module_source(i))
+    invoke_modules(str(tmp_path), 'ast')
+    return package
+
+
+@pytest.fixture
+def server(package: Path) -> Iterator[DocServer]:
+    """A doc server on a free port, serving from a thread."""
+    service = DocService(str(package.parent), 'ast')
+    service.load()
+    with DocServer(service, port=0) as server:
+        serving = threading.Thread(target=server.serve_forever, args=(0.05,))
+        serving.start()
+        yield server
+        server.shutdown()
+        serving.join()
+
+
+class Client:
+    """A client keeping one connection to the server."""
+    def __init__(self, server: DocServer) -> None:
+        """Connects to the server."""
+        host, port = server.server_address[:2]
+        self.connection = http.client.HTTPConnection(host, port, timeout=30)
+
+    def request(
+            self,
+            method: str,
+            path: str,
+            body: bytes|None = None
+        ) -> tuple[int, bytes]:
+        """Sends a request and reads the whole response."""
+        self.connection.request(method, path, body)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def json(self, method: str, path: str, body: bytes|None = None) -> object:
+        """Sends a request which must succeed, and decodes its JSON answer."""
+        status, body = self.request(method, path, body)
+        assert status == 200, (path, status, body)
+        return json.loads(body)
+
+
+def test_endpoints(server: DocServer) -> None:
+    """Every endpoint answers from the collected documentation."""
+    client = Client(server)
+
+    assert client.json('GET', '/modules') == [
+        f'served.module_{i}' for i in range(5)
+    ]
+    docs = client.json('GET', '/docs/start_2')
+    assert docs['name'] == 'served.module_2.start_2'
+    assert OLD_TEXT in docs['docs']['docstring']
+    assert [member['name'] for member in client.json('GET', '/members/Job1')] == [
+        'served.module_1.Job1.run'
+    ]
+    results = client.json('GET', '/search?q=job+2&limit=3')
+    assert results and len(results) <= 3
+    status, markdown = client.request('GET', '/render/served.module_0')
+    assert status == 200 and b'start_0' in markdown
+
+
+def test_not_found(server: DocServer) -> None:
+    """Unknown names and endpoints are answered with status 404."""
+    client = Client(server)
+
+    status, body = client.request('GET', '/docs/run')
+    assert status == 404
+    assert len(json.loads(body)['candidates']) == 5
+    assert client.request('GET', '/nothing')[0] == 404
+    assert client.request('POST', '/nothing')[0] == 404
+    for limit in ('x', '0', '-2'):
+        assert client.request('GET', f'/search?q=job&limit={limit}')[0] == 400
+
+
+def test_failure_answers_500(
+        server: DocServer,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """A failing request is answered with status 500 on the same connection."""
+    def fail(name: str) -> None:
+        raise ValueError('no signature found')
+    monkeypatch.setattr(server.service, 'lookup', fail)
+    client = Client(server)
+
+    status, body = client.request('GET', '/docs/start_0')
+    assert status == 500
+    assert json.loads(body) == {'error': 'ValueError: no signature found'}
+    assert client.json('GET', '/modules')
+
+
+def test_refresh(server: DocServer, package: Path) -> None:
+    """A refresh collects the changed modules."""
+    client = Client(server)
+    path = package / 'module_3.py'
+    path.write_text(path.read_text().replace(OLD_TEXT, NEW_TEXT))
+
+    assert client.json('POST', '/refresh') == {'changed': ['served.module_3']}
+    assert NEW_TEXT in client.json('GET', '/docs/start_3')['docs']['docstring']
+    assert client.json('POST', '/refresh') == {'changed': []}
+
+
+def exchange(server: DocServer, data: bytes) -> bytes:
+    """Sends raw bytes to the server, reading until it closes the connection."""
+    with socket.create_connection(server.server_address[:2], timeout=30) as sock:
+        sock.sendall(data)
+        response = b''
+        while chunk := sock.recv(65536):
+            response += chunk
+    return response
+
+
+def test_request_bodies_are_consumed(server: DocServer) -> None:
+    """A body sent with a request is not read as the next request."""
+    body = b'GET /modules HTTP/1.1\r\nHost: x\r\n\r\n'
+    response = exchange(
+        server,
+        b'POST /refresh HTTP/1.1\r\nHost: x\r\n'
+        + f'Content-Length: {len(body)}\r\n\r\n'.encode() + body
+        + b'GET /docs/start_0 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n'
+    )
+
+    assert response.count(b'HTTP/1.1 200') == 2
+    assert b'"changed": []' in response
+    assert b'served.module_0.start_0' in response
+
+
+def test_unreadable_body_closes_connection(server: DocServer) -> None:
+    """A body without a valid length is rejected, closing the connection."""
+    response = exchange(
+        server,
+        b'POST /refresh HTTP/1.1\r\nHost: x\r\nContent-Length: many\r\n\r\n'
+        b'GET /modules HTTP/1.1\r\nHost: x\r\n\r\n'
+    )
+
+    assert response.startswith(b'HTTP/1.1 400')
+    assert response.count(b'HTTP/1.1') == 1
+
+
+def query(server: DocServer, errors: list[BaseException]) -> None:
+    """Runs every kind of query against the server, checking the answers."""
+    try:
+        client = Client(server)
+        paths = (
+            '/modules',
+            '/docs/served.module_0.start_0',
+            '/members/served.module_0',
+            '/render/served.module_0.start_0',
+            '/search?q=job&limit=5',
+        )
+        for i in range(QUERIES):
+            path = paths[i % len(paths)]
+            status, body = client.request('GET', path)
+            assert status == 200, (path, status, body)
+            if path.startswith('/docs/'):
+                docstring = json.loads(body)['docs']['docstring']
+                assert OLD_TEXT in docstring or NEW_TEXT in docstring, docstring
+            elif path.startswith('/members/'):
+                names = {member['name'] for member in json.loads(body)}
+                assert 'served.module_0.start_0' in names
+            elif path.startswith('/search'):
+                assert len(json.loads(body)) == 5
+    except BaseException as e:
+        errors.append(e)
+
+
+def refresh(server: DocServer, path: Path, refreshed: list[list[str]]) -> None:
+    """Edits a module back and forth, refreshing the server after every edit."""
+    client = Client(server)
+    for i in range(REFRESHES):
+        old, new = (OLD_TEXT, NEW_TEXT) if i % 2 == 0 else (NEW_TEXT, OLD_TEXT)
+        path.write_text(path.read_text().replace(old, new, 1))
+        # Modification times may be coarse, the size changes with every edit.
+        refreshed.append(client.json('POST', '/refresh')['changed'])
+
+
+def test_concurrent_clients(server: DocServer, package: Path) -> None:
+    """Clients querying while another refreshes get consistent answers."""
+    errors = []
+    refreshed = []
+    threads = [
+        threading.Thread(target=query, args=(server, errors)) for _ in range(CLIENTS)
+    ]
+    threads.append(threading.Thread(
+        target=refresh, args=(server, package / 'module_0.py', refreshed)
+    ))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    assert refreshed == [['served.module_0']] * REFRESHES
+    # An even number of edits restores the original source.
+    docs = server.service.lookup('served.module_0.start_0')
+    assert OLD_TEXT in docs['docs']['docstring']
@@ -0,0 +1,158 @@
+"""Tests for writing and loading snapshot files."""
+import inspect
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from doc_containers import ClassDocs, ModuleDocs, ObjectDocs
+from docurator import __version__, docurator
+from serialization import docs_to_dict
+from snapshot import MAGIC, SNAPSHOT_FORMAT, Snapshot, load_snapshot, write_snapshot
+
+
+def signature(x: int, y: str = 'y') -> bool:
+    """A function to take the signature of."""
+
+
+SIGNATURE = inspect.signature(signature)
+
+
+def build_modules() -> list[ModuleDocs]:
+    """Two modules with a function, a class with a method, and tags."""
+    first = ModuleDocs('pkg.first', 'The first module.')
+    first.add(ObjectDocs('run', 'Runs.', 'run', 'function', SIGNATURE, ['users']))
+    job = ClassDocs('Job', 'A job.', 'Job', 'type', SIGNATURE, ['Base'])
+    job.add(ObjectDocs('start', None, 'Job.start', 'function', SIGNATURE))
+    first.add(job)
+    second = ModuleDocs('pkg.second', None)
+    second.add(ObjectDocs('stop', 'Stops.', 'stop', 'function', SIGNATURE))
+    return [first, second]
+
+
+def write_raw(path: Path, header: bytes, body: bytes = b'') -> None:
+    """Writes a file with a snapshot preamble and the given header and body."""
+    preamble = struct.pack(f'<{len(MAGIC)}sI', MAGIC, len(header))
+    path.write_bytes(preamble + header + body)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: Path) -> str:
+    """A snapshot of `build_modules`."""
+    path = str(tmp_path / 'docs.snapshot')
+    write_snapshot(path, build_modules())
+    return path
+
+
+def test_round_trip(snapshot_path: str) -> None:
+    """Every module loads back equal to the one written, hashes included."""
+    loaded = load_snapshot(snapshot_path)
+
+    assert list(loaded) == ['pkg.first', 'pkg.second']
+    for module_docs in build_modules():
+        assert docs_to_dict(loaded[module_docs.name]) == docs_to_dict(module_docs)
+        assert loaded[module_docs.name].content_hash == module_docs.content_hash
+
+
+def test_load_single_module(snapshot_path: str) -> None:
+    """Modules can be loaded by name, without loading the others."""
+    assert list(load_snapshot(snapshot_path, ['pkg.second'])) == ['pkg.second']
+    with Snapshot(snapshot_path) as snapshot:
+        assert snapshot.modules == ['pkg.first', 'pkg.second']
+        assert snapshot.version == __version__
+        assert 'pkg.first' in snapshot
+        assert snapshot.load('pkg.first').get_class('Job').get('start') is not None
+        assert snapshot.content_hash('pkg.first') == build_modules()[0].content_hash
+
+
+def test_missing_module(snapshot_path: str) -> None:
+    """Loading a module which is not in the snapshot raises KeyError."""
+    with pytest.raises(KeyError):
+        load_snapshot(snapshot_path, ['pkg.missing'])
+    with Snapshot(snapshot_path) as snapshot, pytest.raises(KeyError):
+        snapshot.content_hash('pkg.missing')
+
+
+def test_registry_round_trip(snapshot_path: str, tmp_path: Path) -> None:
+    """The registry loads a snapshot and exports the same documentation."""
+    docurator.load_snapshot(snapshot_path)
+    exported = str(tmp_path / 'exported.snapshot')
+    docurator.export_snapshot(exported)
+
+    assert {
+        name: docs_to_dict(module_docs)
+        for name, module_docs in load_snapshot(exported).items()
+    } == {
+        module_docs.name: docs_to_dict(module_docs) for module_docs in build_modules()
+    }
+
+
+def test_format_1(tmp_path: Path) -> None:
+    """Snapshots without content hashes are read, with no hashes."""
+    module_docs = build_modules()[1]
+    body = json.dumps(docs_to_dict(module_docs)).encode('utf-8')
+    header = json.dumps({
+        'format': 1,
+        'version': '0.0.1',
+        'modules': {module_docs.name: [0, len(body)]},
+    }).encode('utf-8')
+    path = tmp_path / 'old.snapshot'
+    write_raw(path, header, body)
+
+    with Snapshot(str(path)) as snapshot:
+        assert snapshot.version == '0.0.1'
+        assert snapshot.content_hash(module_docs.name) is None
+        loaded = snapshot.load(module_docs.name)
+        assert docs_to_dict(loaded) == docs_to_dict(module_docs)
+
+
+@pytest.mark.parametrize('contents', [
+    b'',
+    b'DOCSNAP',
+    b'NOTSNAP\n\x00\x00\x00\x00{}',
+    struct.pack(f'<{len(MAGIC)}sI', MAGIC, 1000) + b'{}',
+    struct.pack(f'<{len(MAGIC)}sI', MAGIC, 5) + b'{not}',
+    struct.pack(f'<{len(MAGIC)}sI', MAGIC, 2) + b'[]',
+    struct.pack(f'<{len(MAGIC)}sI', MAGIC, 12) + b'{"format":2}',
+], ids=['empty', 'short', 'magic', 'truncated', 'json', 'list', 'no modules'])
+def test_not_a_snapshot(tmp_path: Path, contents: bytes) -> None:
+    """Files which are not readable snapshots raise ValueError."""
+    path = tmp_path / 'corrupt.snapshot'
+    path.write_bytes(contents)
+
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+
+def test_unknown_format(tmp_path: Path) -> None:
+    """Snapshots of a format this version can not read raise ValueError."""
+    path = tmp_path / 'new.snapshot'
+    header = {'format': SNAPSHOT_FORMAT + 1, 'version': '9.0.0', 'modules': {}}
+    write_raw(path, json.dumps(header).encode('utf-8'))
+
+    with pytest.raises(ValueError, match='format'):
+        load_snapshot(str(path))
+
+
+def test_corrupt_module(snapshot_path: str) -> None:
+    """A module whose documentation is cut off raises ValueError on load."""
+    with open(snapshot_path, 'rb') as file:
+        contents = file.read()
+    with open(snapshot_path, 'wb') as file:
+        file.write(contents[:-10])
+
+    with Snapshot(snapshot_path) as snapshot:
+        assert docs_to_dict(snapshot.load('pkg.first')) == docs_to_dict(
+            build_modules()[0]
+        )
+        with pytest.raises(ValueError):
+            snapshot.load('pkg.second')
+
+
+def test_write_is_atomic(snapshot_path: str, tmp_path: Path) -> None:
+    """Writing replaces the file, leaving no temporary file behind."""
+    write_snapshot(snapshot_path, build_modules()[:1])
+
+    assert load_snapshot(snapshot_path).keys() == {'pkg.first'}
+    assert [path.name for path in tmp_path.iterdir()] == ['docs.snapshot']
@@ -0,0 +1,136 @@
+"""Tests for collecting changed modules again while watching or serving."""
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+from cli import open_pool, parser
+from docurator import docurator
+from module_traverser import ModuleFilter, SourceModule
+from watch import SourceTracker, recollect_module
+from worker_pool import WorkerPool
+
+SOURCE = '''"""A watched module."""
+from docurator import document_me
+
+
+@document_me
+def greet(name: str) -> str:
+    """{docstring}"""
+    return name
+'''
+EXIT_SOURCE = 'import sys\nsys.exit(2)\n'
+# The files of a source tree, relative to its root.
+TREE = (
+    'pkg/__init__.py',
+    'pkg/module.py',
+    'pkg/tests.py',
+    'pkg/vendor/__init__.py',
+    'pkg/vendor/library.py',
+    'pkg/deep/__init__.py',
+    'pkg/deep/inner.py',
+)
+
+
+@pytest.fixture
+def watched(
+        import_source: Callable[[str, str], ModuleType],
+        tmp_path: Path
+    ) -> SourceModule:
+    """A module imported with its decorators, to collect again."""
+    import_source('watched', SOURCE.format(docstring='Greets someone.'))
+    return SourceModule('watched', str(tmp_path / 'watched.py'), False)
+
+
+def greet_docstring() -> str:
+    """The docstring of `greet` in the registry."""
+    return docurator.docs['watched'].get('greet').docstring
+
+
+@pytest.mark.parametrize('isolated', [False, True])
+def test_edit_is_collected(
+        watched: SourceModule,
+        pool: WorkerPool,
+        isolated: bool
+    ) -> None:
+    """An edited module replaces its documentation."""
+    Path(watched.path).write_text(SOURCE.format(docstring='Greets someone, politely.'))
+    recollect_module('watched', watched, 'import', pool if isolated else None)
+
+    assert greet_docstring() == 'Greets someone, politely.'
+
+
+@pytest.mark.parametrize('isolated', [False, True])
+def test_exit_keeps_previous_docs(
+        watched: SourceModule,
+        pool: WorkerPool,
+        isolated: bool
+    ) -> None:
+    """A module exiting when collected again keeps its previous documentation."""
+    Path(watched.path).write_text(EXIT_SOURCE)
+    recollect_module('watched', watched, 'import', pool if isolated else None)
+
+    assert greet_docstring() == 'Greets someone.'
+
+
+def test_pool_survives_exit(watched: SourceModule, pool: WorkerPool) -> None:
+    """The pool still collects after a module exited in it."""
+    Path(watched.path).write_text(EXIT_SOURCE)
+    recollect_module('watched', watched, 'import', pool)
+    Path(watched.path).write_text(SOURCE.format(docstring='Greets again.'))
+    recollect_module('watched', watched, 'import', pool)
+
+    assert greet_docstring() == 'Greets again.'
+
+
+@pytest.mark.parametrize('command', [
+    ['watch', 'src', 'docs'],
+    ['serve', 'src'],
+])
+def test_refreshes_share_the_pool(command: list[str]) -> None:
+    """Watch and serve collect in a pool only when isolated or timed out."""
+    with open_pool(parser().parse_args(command)) as pool:
+        assert pool is None
+    with open_pool(parser().parse_args([*command, '--timeout', '5'])) as pool:
+        assert isinstance(pool, WorkerPool)
+        assert pool.timeout == 5
+    with open_pool(parser().parse_args([*command, '--isolated'])) as pool:
+        assert isinstance(pool, WorkerPool)
+
+
+def test_tracker_skips_filtered_modules(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """Excluded packages and modules, or those too deep, are not polled."""
+    for file in TREE:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text('"""A module."""\n')
+    tracker = SourceTracker(
+        str(tmp_path), ModuleFilter(exclude=('*.vendor', '*.tests'), max_depth=1)
+    )
+    tracker.snapshot()
+    assert set(tracker.modules) == {'pkg', 'pkg.module', 'pkg.deep'}
+
+    polled = set()
+
+    def record(function: Callable) -> Callable:
+        def recorded(path: str, *args: object, **kwargs: object) -> object:
+            polled.add(Path(os.path.relpath(path, tmp_path)).as_posix())
+            return function(path, *args, **kwargs)
+        return recorded
+    monkeypatch.setattr(os, 'stat', record(os.stat))
+    monkeypatch.setattr(os, 'scandir', record(os.scandir))
+    for file in ('pkg/tests.py', 'pkg/vendor/library.py', 'pkg/deep/inner.py'):
+        with open(tmp_path / file, 'a') as source:
+            source.write('EDITED = True\n')
+    assert tracker.poll() == set()
+    (tmp_path / 'pkg/module.py').write_text('"""Edited."""\n')
+    assert tracker.poll() == {'pkg.module'}
+
+    # The inits of packages are checked, but filtered trees are not listed.
+    assert polled - {'pkg/vendor/__init__.py'} == {
+        '.', 'pkg', 'pkg/__init__.py', 'pkg/module.py', 'pkg/deep/__init__.py',
+    }
@@ -0,0 +1,55 @@
+"""Tests for collecting modules in isolated worker processes."""
+from pathlib import Path
+
+import pytest
+
+from docurator import docurator
+from module_traverser import walk_modules
+from worker_pool import WorkerPool
+
+SOURCE = '''"""A pooled module."""
+from docurator import document_me
+
+
+@document_me
+def greet(name: str) -> str:
+    """Greets someone."""
+    return name
+
+
+@document_me
+def wave() -> None:
+    """Waves."""
+'''
+EDITED_SOURCE = '''"""A pooled module."""
+from docurator import document_me
+
+
+@document_me
+def greet(name: str, polite: bool = True) -> str:
+    """Greets someone, politely."""
+    return name
+'''
+
+
+@pytest.mark.parametrize('engine', ['import', 'ast'])
+def test_recollect_replaces_stale_docs(
+        pool: WorkerPool,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        engine: str
+    ) -> None:
+    """Collecting again with a warm pool reflects the current source."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / 'pooled.py'
+    path.write_text(SOURCE)
+    assert pool.collect(walk_modules(str(tmp_path)), engine).collected == ('pooled',)
+
+    path.write_text(EDITED_SOURCE)
+    assert pool.collect(walk_modules(str(tmp_path)), engine).collected == ('pooled',)
+
+    module_docs = docurator.docs['pooled']
+    greet = module_docs.get('greet')
+    assert greet.docstring == 'Greets someone, politely.'
+    assert 'polite' in str(greet.f_signature)
+    assert module_docs.get('wave') is None